@@ -2,7 +2,7 @@
 API v1 Routers
 """
 
-from app.api.v1 import health, orders, users, products, inventory, notifications
+from app.api.v1 import health, orders, users, products, inventory, notifications, reports
 
 __all__ = [
     "health",
@@ -11,5 +11,6 @@ __all__ = [
     "products",
     "inventory",
     "notifications",
+    "reports",
 ]
 
@@ -1,6 +1,15 @@
-"""Health Check Endpoint."""
+"""Health Check Endpoints."""
 
-from fastapi import APIRouter
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import get_async_session
+from app.core.monitoring import db_monitor, metrics
+from app.schemas import DatabaseStatus, PoolStatus, ReadinessResponse
 
 router = APIRouter()
 
@@ -13,3 +22,55 @@ async def health_check() -> dict[str, str]:
         "service": "order-service",
         "version": "1.0.0",
     }
+
+
+@router.get(
+    "/health/ready",
+    response_model=ReadinessResponse,
+    responses={503: {"model": ReadinessResponse}},
+)
+async def readiness_check(
+    response: Response,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> ReadinessResponse:
+    """
+    Readiness check with pool and database health.
+    Only queries the database when no round trip succeeded recently.
+    """
+    await db_monitor.probe(session)
+
+    pool = db_monitor.pool_stats()
+    age = db_monitor.probe_age()
+    reachable = age is not None and age < settings.health_max_probe_age_seconds
+    lock_wait_max, lock_wait_total = db_monitor.lock_wait_ms()
+
+    ready = reachable and not pool.exhausted
+    if not ready:
+        response.status_code = 503
+
+    return ReadinessResponse(
+        status="ready" if ready else "unavailable",
+        service="order-service",
+        pool=PoolStatus(
+            size=pool.size,
+            checked_out=pool.checked_out,
+            overflow=pool.overflow,
+            max_overflow=pool.max_overflow,
+            exhausted=pool.exhausted,
+        ),
+        database=DatabaseStatus(
+            reachable=reachable,
+            last_latency_ms=db_monitor.last_latency_ms,
+            last_success_age_seconds=round(age, 3) if age is not None else None,
+            writer_queue_depth=db_monitor.writer_queue_depth,
+            lock_wait_max_ms=lock_wait_max,
+            lock_wait_total_ms=lock_wait_total,
+            last_error=db_monitor.last_error,
+        ),
+    )
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics_export() -> str:
+    """Process metrics in Prometheus text format."""
+    return metrics.render()
@@ -1,43 +1,105 @@
 """Inventory API Endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_async_session
-from app.core.exceptions import ProductNotFoundError
+from app.core.exceptions import (
+    InsufficientStockError,
+    InvalidCursorError,
+    ProductNotFoundError,
+    StockHoldNotFoundError,
+)
+from app.repositories.hold_repository import StockHoldRepository
 from app.repositories.product_repository import ProductRepository
-from app.services.product_service import ProductService
 from app.schemas import (
-    ProductResponse,
-    ProductStockUpdate,
-    LowStockItem,
     BulkRestockRequest,
     BulkRestockResponse,
     ErrorResponse,
+    InventoryHistoryResponse,
+    LowStockItem,
+    ProductResponse,
+    ProductStockUpdate,
+    StockHoldCreate,
+    StockHoldResponse,
+    StockShardsUpdate,
 )
+from app.services.hold_service import HoldService
+from app.services.product_service import ProductService
 
 router = APIRouter()
 
 
-def get_product_service(session: AsyncSession = Depends(get_async_session)) -> ProductService:
+SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
+
+def get_product_service(session: SessionDep) -> ProductService:
     """Dependency to get ProductService instance."""
     repository = ProductRepository(session)
     return ProductService(repository)
 
 
+def get_hold_service(session: SessionDep) -> HoldService:
+    """Dependency to get HoldService instance."""
+    return HoldService(StockHoldRepository(session))
+
+
+ProductServiceDep = Annotated[ProductService, Depends(get_product_service)]
+HoldServiceDep = Annotated[HoldService, Depends(get_hold_service)]
+
+
 @router.get(
     "/inventory/low-stock",
     response_model=list[LowStockItem],
+    responses={400: {"model": ErrorResponse}},
 )
 async def get_low_stock_items(
-    threshold: int = Query(10, ge=1, description="Stock threshold"),
-    service: ProductService = Depends(get_product_service),
+    response: Response,
+    service: ProductServiceDep,
+    threshold: Annotated[int, Query(ge=1, description="Stock threshold")] = 10,
+    limit: Annotated[int, Query(ge=1, le=1000, description="Items per page")] = 100,
+    cursor: Annotated[
+        str | None, Query(description="X-Next-Cursor from the previous page")
+    ] = None,
 ) -> list[LowStockItem]:
-    """Get products with low stock (below threshold)."""
-    products = await service.get_low_stock_items(threshold)
+    """
+    Get products with low stock (below threshold), lowest first.
+    When more rows remain, the X-Next-Cursor header holds the next page's cursor.
+    """
+    try:
+        products, next_cursor = await service.get_low_stock_items(threshold, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return products
 
 
+@router.get(
+    "/inventory/{product_id}/history",
+    response_model=InventoryHistoryResponse,
+    responses={400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+)
+async def get_stock_history(
+    product_id: int,
+    service: ProductServiceDep,
+    limit: Annotated[int, Query(ge=1, le=1000, description="Items per page")] = 100,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+) -> InventoryHistoryResponse:
+    """Get a product's stock movements, newest first."""
+    try:
+        movements, next_cursor = await service.get_stock_history(product_id, limit, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return InventoryHistoryResponse(items=movements, next_cursor=next_cursor)
+
+
 @router.put(
     "/inventory/{product_id}",
     response_model=ProductResponse,
@@ -46,7 +108,7 @@ async def get_low_stock_items(
 async def update_stock(
     product_id: int,
     data: ProductStockUpdate,
-    service: ProductService = Depends(get_product_service),
+    service: ProductServiceDep,
 ) -> ProductResponse:
     """Update product stock level."""
     try:
@@ -56,6 +118,58 @@ async def update_stock(
         raise HTTPException(status_code=404, detail=str(e))
 
 
+@router.put(
+    "/inventory/{product_id}/shards",
+    response_model=ProductResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def set_stock_shards(
+    product_id: int,
+    data: StockShardsUpdate,
+    service: ProductServiceDep,
+) -> ProductResponse:
+    """Split a hot product's stock across shard counters (0 turns sharding off)."""
+    try:
+        return await service.set_stock_shards(product_id, data.shards)
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+@router.post(
+    "/inventory/holds",
+    response_model=StockHoldResponse,
+    status_code=201,
+    responses={404: {"model": ErrorResponse}, 409: {"model": ErrorResponse}},
+)
+async def create_stock_hold(
+    data: StockHoldCreate,
+    service: HoldServiceDep,
+) -> StockHoldResponse:
+    """Hold stock for a checkout; pass the hold id to POST /orders to keep it."""
+    try:
+        return await service.create_hold(data.product_id, data.quantity, data.ttl_seconds)
+    except ProductNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except InsufficientStockError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.delete(
+    "/inventory/holds/{hold_id}",
+    response_model=StockHoldResponse,
+    responses={404: {"model": ErrorResponse}},
+)
+async def release_stock_hold(
+    hold_id: int,
+    service: HoldServiceDep,
+) -> StockHoldResponse:
+    """Release an active hold, returning its stock."""
+    try:
+        return await service.release_hold(hold_id)
+    except StockHoldNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
 @router.post(
     "/inventory/restock",
     response_model=BulkRestockResponse,
@@ -63,7 +177,7 @@ async def update_stock(
 )
 async def bulk_restock(
     data: BulkRestockRequest,
-    service: ProductService = Depends(get_product_service),
+    service: ProductServiceDep,
 ) -> BulkRestockResponse:
     """Bulk restock multiple products."""
     try:
@@ -1,42 +1,114 @@
 """Notifications API Endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Annotated
 
-from app.core.database import get_async_session
-from app.core.exceptions import NotificationNotFoundError
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.database import async_session, get_async_session
+from app.core.exceptions import InvalidCursorError, NotificationNotFoundError
+from app.models import NotificationLane
 from app.repositories.notification_repository import NotificationRepository
-from app.services.notification_service import NotificationService
 from app.schemas import (
-    NotificationResponse,
+    ErrorResponse,
+    NotificationBulkMarkSent,
+    NotificationBulkMarkSentResponse,
     NotificationMarkSent,
+    NotificationResponse,
     PendingNotificationsResponse,
-    ErrorResponse,
 )
+from app.services.notification_service import NotificationService
+from app.services.notification_stream import NotificationStream
 
 router = APIRouter()
 
 
 def get_notification_service(
-    session: AsyncSession = Depends(get_async_session),
+    session: Annotated[AsyncSession, Depends(get_async_session)],
 ) -> NotificationService:
     """Dependency to get NotificationService instance."""
     repository = NotificationRepository(session)
     return NotificationService(repository)
 
 
+NotificationServiceDep = Annotated[NotificationService, Depends(get_notification_service)]
+
+
 @router.get(
     "/notifications/pending",
     response_model=PendingNotificationsResponse,
+    responses={400: {"model": ErrorResponse}},
 )
 async def get_pending_notifications(
-    service: NotificationService = Depends(get_notification_service),
+    service: NotificationServiceDep,
+    limit: Annotated[int, Query(ge=1, le=1000, description="Items per page")] = 100,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+    lane: Annotated[
+        NotificationLane | None, Query(description="Only this delivery lane")
+    ] = None,
 ) -> PendingNotificationsResponse:
-    """Get all pending notifications."""
-    notifications = await service.get_pending_notifications()
+    """Get a page of pending notifications, most urgent lane first, then oldest first."""
+    try:
+        notifications, total, next_cursor = await service.get_pending_notifications(
+            limit=limit,
+            cursor=cursor,
+            lane=lane,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return PendingNotificationsResponse(
         items=notifications,
-        total=len(notifications),
+        total=total,
+        next_cursor=next_cursor,
+    )
+
+
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    """Session factory for long-lived streams, which open short sessions as needed."""
+    return async_session
+
+
+@router.get(
+    "/notifications/stream",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_notifications(
+    session_factory: Annotated[
+        async_sessionmaker[AsyncSession], Depends(get_session_factory)
+    ],
+    last_event_id: Annotated[int | None, Header(alias="Last-Event-ID")] = None,
+) -> StreamingResponse:
+    """
+    Server-sent events for newly created pending notifications.
+    Reconnecting clients resume after their Last-Event-ID.
+    """
+    stream = NotificationStream(session_factory)
+    return StreamingResponse(
+        stream.events(last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.put(
+    "/notifications/sent",
+    response_model=NotificationBulkMarkSentResponse,
+)
+async def mark_notifications_sent(
+    data: NotificationBulkMarkSent,
+    service: NotificationServiceDep,
+) -> NotificationBulkMarkSentResponse:
+    """Mark many notifications as sent in one transaction."""
+    updated_count, not_found_ids = await service.mark_many_as_sent(
+        [(item.id, item.sent_at) for item in data.items]
+    )
+    return NotificationBulkMarkSentResponse(
+        updated_count=updated_count,
+        not_found_ids=not_found_ids,
     )
 
 
@@ -47,8 +119,8 @@ async def get_pending_notifications(
 )
 async def mark_notification_sent(
     notification_id: int,
+    service: NotificationServiceDep,
     data: NotificationMarkSent | None = None,
-    service: NotificationService = Depends(get_notification_service),
 ) -> NotificationResponse:
     """Mark a notification as sent."""
     try:
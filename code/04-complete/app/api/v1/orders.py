@@ -8,6 +8,9 @@ from app.core.exceptions import (
     OrderNotFoundError,
     InvalidStatusTransitionError,
     OrderCancellationError,
+    StockHoldQuantityError,
+    StockHoldUnavailableError,
+    UserNotFoundError,
 )
 from app.repositories.order_repository import OrderRepository
 from app.services.order_service import OrderService
@@ -33,14 +36,19 @@ def get_order_service(session: AsyncSession = Depends(get_async_session)) -> Ord
     "/orders",
     response_model=OrderResponse,
     status_code=201,
-    responses={400: {"model": ErrorResponse}},
+    responses={400: {"model": ErrorResponse}, 409: {"model": ErrorResponse}},
 )
 async def create_order(
     data: OrderCreate,
     service: OrderService = Depends(get_order_service),
 ) -> OrderResponse:
-    """Create a new order with items."""
-    order = await service.create_order(data)
+    """Create a new order with items, consuming any stock holds given."""
+    try:
+        order = await service.create_order(data)
+    except UserNotFoundError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except (StockHoldUnavailableError, StockHoldQuantityError) as e:
+        raise HTTPException(status_code=409, detail=str(e))
     return order
 
 
@@ -1,44 +1,149 @@
 """Products API Endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.database import get_async_session
-from app.core.exceptions import ProductNotFoundError
+from app.core.exceptions import (
+    InvalidCursorError,
+    ProductAlreadyExistsError,
+    ProductNotFoundError,
+)
+from app.core.product_import import iter_csv_records, iter_ndjson_records
 from app.repositories.product_repository import ProductRepository
-from app.services.product_service import ProductService
 from app.schemas import (
+    ErrorResponse,
     ProductCreate,
+    ProductFacets,
+    ProductImportResult,
+    ProductPage,
     ProductResponse,
-    ErrorResponse,
 )
+from app.services.product_import_service import ProductImportService
+from app.services.product_service import ProductService
 
 router = APIRouter()
 
+IMPORT_PARSERS = {
+    "text/csv": iter_csv_records,
+    "application/x-ndjson": iter_ndjson_records,
+    "application/ndjson": iter_ndjson_records,
+    "application/jsonl": iter_ndjson_records,
+}
+
+
+SessionDep = Annotated[AsyncSession, Depends(get_async_session)]
+
 
-def get_product_service(session: AsyncSession = Depends(get_async_session)) -> ProductService:
+def get_product_service(session: SessionDep) -> ProductService:
     """Dependency to get ProductService instance."""
     repository = ProductRepository(session)
     return ProductService(repository)
 
 
+def get_product_import_service(session: SessionDep) -> ProductImportService:
+    """Dependency to get ProductImportService instance."""
+    return ProductImportService(ProductRepository(session))
+
+
+ProductServiceDep = Annotated[ProductService, Depends(get_product_service)]
+ProductImportServiceDep = Annotated[
+    ProductImportService, Depends(get_product_import_service)
+]
+
+
 @router.get(
     "/products",
-    response_model=list[ProductResponse],
+    response_model=ProductPage,
+    responses={400: {"model": ErrorResponse}},
 )
 async def list_products(
-    category: str | None = Query(None, description="Filter by category"),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    service: ProductService = Depends(get_product_service),
+    service: ProductServiceDep,
+    category: Annotated[str | None, Query(description="Filter by category")] = None,
+    limit: Annotated[int, Query(ge=1, le=100, description="Items per page")] = 20,
+    cursor: Annotated[
+        str | None, Query(description="next_cursor from the previous page")
+    ] = None,
+) -> Response:
+    """
+    List products in name order with optional filtering (served pre-serialized).
+    Follow next_cursor to fetch the next page.
+    """
+    try:
+        content = await service.list_products_json(
+            category=category,
+            limit=limit,
+            cursor=cursor,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=content, media_type="application/json")
+
+
+@router.get(
+    "/products/facets",
+    response_model=ProductFacets,
+)
+async def get_product_facets(
+    service: ProductServiceDep,
+) -> ProductFacets:
+    """Product counts per category with in-stock / low-stock / out-of-stock buckets."""
+    return await service.get_facets()
+
+
+@router.get(
+    "/products/search",
+    response_model=list[ProductResponse],
+)
+async def search_products(
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Search text")],
+    service: ProductServiceDep,
+    limit: Annotated[int, Query(ge=1, le=settings.product_search_max_results)] = 20,
 ) -> list[ProductResponse]:
-    """List all products with optional filtering."""
-    products, _ = await service.list_products(
-        category=category,
-        page=page,
-        page_size=page_size,
-    )
-    return products
+    """Search product names and descriptions, best match (bm25) first."""
+    return await service.search_products(q, limit)
+
+
+@router.get(
+    "/products/autocomplete",
+    response_model=list[str],
+)
+async def autocomplete_products(
+    prefix: Annotated[
+        str, Query(min_length=1, max_length=100, description="Typed prefix")
+    ],
+    service: ProductServiceDep,
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[str]:
+    """Product names starting with a prefix (case-insensitive), for typeahead."""
+    return await service.autocomplete(prefix, limit)
+
+
+@router.post(
+    "/products/import",
+    response_model=ProductImportResult,
+    responses={415: {"model": ErrorResponse}},
+)
+async def import_products(
+    request: Request,
+    service: ProductImportServiceDep,
+) -> ProductImportResult:
+    """
+    Bulk create or update products by SKU from a CSV (text/csv, header row
+    required) or NDJSON (application/x-ndjson) body. The body is parsed as
+    it streams in and upserted in chunks; invalid rows are reported by line.
+    """
+    media_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    parser = IMPORT_PARSERS.get(media_type)
+    if parser is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported import type '{media_type}'; use text/csv or application/x-ndjson",
+        )
+    return await service.import_products(parser(request.stream()))
 
 
 @router.get(
@@ -48,7 +153,7 @@ async def list_products(
 )
 async def get_product(
     product_id: int,
-    service: ProductService = Depends(get_product_service),
+    service: ProductServiceDep,
 ) -> ProductResponse:
     """Get product details by ID."""
     try:
@@ -62,11 +167,15 @@ async def get_product(
     "/products",
     response_model=ProductResponse,
     status_code=201,
+    responses={409: {"model": ErrorResponse}},
 )
 async def create_product(
     data: ProductCreate,
-    service: ProductService = Depends(get_product_service),
+    service: ProductServiceDep,
 ) -> ProductResponse:
     """Create a new product."""
-    product = await service.create_product(data)
-    return product
+    try:
+        product = await service.create_product(data)
+        return product
+    except ProductAlreadyExistsError as e:
+        raise HTTPException(status_code=409, detail=str(e))
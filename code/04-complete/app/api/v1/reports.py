@@ -0,0 +1,74 @@
+"""Reports API Endpoints."""
+
+from datetime import date
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.database import get_async_session
+from app.core.exceptions import InvalidReportRangeError
+from app.repositories.report_repository import ReportRepository
+from app.schemas import (
+    ErrorResponse,
+    ReportGranularity,
+    SalesReport,
+    SalesRollupRebuildResponse,
+)
+from app.services.report_service import ReportService
+
+router = APIRouter()
+
+
+def get_report_service(
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> ReportService:
+    """Dependency to get ReportService instance."""
+    repository = ReportRepository(session)
+    return ReportService(repository)
+
+
+ReportServiceDep = Annotated[ReportService, Depends(get_report_service)]
+
+
+@router.get(
+    "/reports/sales",
+    response_model=SalesReport,
+    responses={400: {"model": ErrorResponse}},
+)
+async def get_sales_report(
+    date_from: Annotated[date, Query(alias="from", description="First day (inclusive)")],
+    date_to: Annotated[date, Query(alias="to", description="Last day (inclusive)")],
+    service: ReportServiceDep,
+    granularity: Annotated[
+        ReportGranularity, Query(description="Period size")
+    ] = ReportGranularity.DAY,
+    top_products: Annotated[
+        int, Query(ge=0, le=100, description="Number of top products")
+    ] = 10,
+) -> SalesReport:
+    """Get revenue, order count and units per period from the daily rollups."""
+    try:
+        return await service.get_sales_report(
+            date_from,
+            date_to,
+            granularity=granularity,
+            top_products=top_products,
+        )
+    except InvalidReportRangeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post(
+    "/reports/sales/rebuild",
+    response_model=SalesRollupRebuildResponse,
+)
+async def rebuild_sales_rollups(
+    service: ReportServiceDep,
+) -> SalesRollupRebuildResponse:
+    """Recompute sales rollups from the order tables (backfill)."""
+    status_rows, product_rows = await service.rebuild_rollups()
+    return SalesRollupRebuildResponse(
+        status_rows=status_rows,
+        product_rows=product_rows,
+    )
@@ -0,0 +1,66 @@
+"""
+Broadcast - in-process fan-out of events to async subscribers.
+
+Every subscriber gets its own bounded queue. Publishing never blocks: when
+a subscriber's queue is full it is marked as lagging and receives nothing
+more until it catches up from the database itself, so one slow client can
+neither stall writers nor grow memory without bound.
+"""
+
+import asyncio
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from app.core.config import settings
+
+
+class Subscription:
+    """One subscriber's bounded event queue."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize)
+        self.lagged = False
+
+    def offer(self, event: dict[str, Any]) -> None:
+        """Enqueue without blocking; mark lagging instead of overflowing."""
+        if self.lagged:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.lagged = True
+
+    def reset(self) -> None:
+        """Drop queued events and resume delivery after a resync."""
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.lagged = False
+
+
+class Broadcaster:
+    """Fans published events out to every current subscription."""
+
+    def __init__(self, queue_size: int = 1000) -> None:
+        self.queue_size = queue_size
+        self._subscriptions: set[Subscription] = set()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def publish(self, event: dict[str, Any]) -> None:
+        for subscription in self._subscriptions:
+            subscription.offer(event)
+
+    @contextmanager
+    def subscribe(self) -> Iterator[Subscription]:
+        subscription = Subscription(self.queue_size)
+        self._subscriptions.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscriptions.discard(subscription)
+
+
+notification_broadcaster = Broadcaster(settings.notification_stream_queue_size)
@@ -0,0 +1,367 @@
+"""
+Catalog Snapshot - product catalog shared across worker processes.
+
+The snapshot lives in POSIX shared memory in a columnar layout:
+
+    header    magic, count, blob size
+    ids       int64[count], sorted ascending
+    price     int64[count], integer cents
+    created   int64[count], epoch microseconds (UTC)
+    flags     uint8[count], padded to 8 bytes (null description/category)
+    offsets   uint64[3 * count + 1] into blob (name, description, category)
+    blob      utf-8 strings
+
+A small control segment holds the current generation. Data segments are
+named "<name>_<generation>" and replaced wholesale on refresh; readers map
+them zero-copy and remap when the generation changes.
+
+Stock is not part of the snapshot: orders, holds and their expiry change it
+on every request, so readers take it from the database.
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+from app.core.config import settings
+from app.models import Product
+
+MAGIC = b"SFC2"
+_HEADER = struct.Struct("<4sIQQ")  # magic, reserved, count, blob size
+_HEADER_SIZE = 32
+_CONTROL = struct.Struct("<4sIQd")  # magic, reserved, generation, published_at
+_GENERATION_OFFSET = 8
+FLAG_NO_DESCRIPTION = 1
+FLAG_NO_CATEGORY = 2
+_EPOCH = datetime(1970, 1, 1)
+_ATTACH_RETRY_SECONDS = 1.0
+
+
+def _open_segment(name: str, create: bool = False, size: int = 0) -> SharedMemory:
+    """Open a segment without handing its lifetime to the resource tracker."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, create=create, size=size, track=False)
+    shm = SharedMemory(name=name, create=create, size=size)
+    if os.name == "posix":
+        # Otherwise the first worker to exit would unlink the shared catalog
+        resource_tracker.unregister(f"/{shm.name}", "shared_memory")
+    return shm
+
+
+def _unlink_segment(name: str) -> None:
+    """Unlink a segment by name, ignoring missing ones."""
+    try:
+        if sys.version_info >= (3, 13):
+            shm = SharedMemory(name=name, track=False)
+        else:
+            # Attaching registers with the tracker; unlink() unregisters again
+            shm = SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _lock_file(lock_file) -> None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+    def _unlock_file(lock_file) -> None:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(lock_file) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+    def _unlock_file(lock_file) -> None:
+        fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _pad8(size: int) -> int:
+    return (size + 7) & ~7
+
+
+def _to_micros(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(UTC).replace(tzinfo=None)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+class SnapshotColumns:
+    """Column buffers accumulated while streaming products ordered by id."""
+
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.price = array("q")
+        self.created = array("q")
+        self.flags = bytearray()
+        self.offsets = array("Q", [0])
+        self.blob = bytearray()
+
+    def add(self, product: Product) -> None:
+        """Append one product (ids must arrive in ascending order)."""
+        self.ids.append(product.id)
+        self.price.append(product.price_cents)
+        self.created.append(_to_micros(product.created_at))
+        self.flags.append(
+            (FLAG_NO_DESCRIPTION if product.description is None else 0)
+            | (FLAG_NO_CATEGORY if product.category is None else 0)
+        )
+        for value in (product.name, product.description, product.category):
+            self.blob += (value or "").encode()
+            self.offsets.append(len(self.blob))
+
+
+@dataclass
+class _Mapping:
+    """Zero-copy column views over one mapped data segment."""
+    generation: int
+    shm: SharedMemory
+    ids: memoryview
+    price: memoryview
+    created: memoryview
+    flags: memoryview
+    offsets: memoryview
+    blob: memoryview
+
+    def release(self) -> None:
+        for view in (
+            self.ids, self.price, self.created,
+            self.flags, self.offsets, self.blob,
+        ):
+            view.release()
+        self.shm.close()
+
+    def index_of(self, product_id: int) -> int | None:
+        i = bisect_left(self.ids, product_id)
+        if i < len(self.ids) and self.ids[i] == product_id:
+            return i
+        return None
+
+    def text(self, i: int, field: int) -> str:
+        k = 3 * i + field
+        return bytes(self.blob[self.offsets[k]:self.offsets[k + 1]]).decode()
+
+
+class CatalogSnapshot:
+    """Product catalog snapshot in shared memory, keyed by product id."""
+
+    def __init__(self, name: str, enabled: bool = True) -> None:
+        self.name = name
+        self.enabled = enabled
+        self._control: SharedMemory | None = None
+        self._mapping: _Mapping | None = None
+        self._next_attach_at = 0.0
+
+    # ---- Publishing ----
+
+    def publish(self, products: Iterable[Product] | SnapshotColumns) -> int:
+        """
+        Build a new snapshot from products ordered by id and make it current.
+        Returns the new generation.
+        """
+        if isinstance(products, SnapshotColumns):
+            columns = products
+        else:
+            columns = SnapshotColumns()
+            for product in products:
+                columns.add(product)
+        ids, price, created = columns.ids, columns.price, columns.created
+        flags, offsets, blob = columns.flags, columns.offsets, columns.blob
+
+        count = len(ids)
+        flags_size = _pad8(count)
+        size = (
+            _HEADER_SIZE + 3 * 8 * count + flags_size
+            + offsets.itemsize * len(offsets) + len(blob)
+        )
+
+        with self._publish_lock():
+            control = self._open_control(create=True)
+            generation = struct.unpack_from("<Q", control.buf, _GENERATION_OFFSET)[0] + 1
+            segment_name = f"{self.name}_{generation}"
+            _unlink_segment(segment_name)  # leftover from a crashed publisher
+
+            shm = _open_segment(segment_name, create=True, size=max(size, _HEADER_SIZE))
+            buf = shm.buf
+            _HEADER.pack_into(buf, 0, MAGIC, 0, count, len(blob))
+            pos = _HEADER_SIZE
+            for column in (ids, price, created):
+                data = column.tobytes()
+                buf[pos:pos + len(data)] = data
+                pos += len(data)
+            buf[pos:pos + count] = bytes(flags)
+            pos += flags_size
+            data = offsets.tobytes()
+            buf[pos:pos + len(data)] = data
+            pos += len(data)
+            buf[pos:pos + len(blob)] = bytes(blob)
+            shm.close()
+
+            _CONTROL.pack_into(control.buf, 0, MAGIC, 0, generation, time.time())
+            # Processes that already mapped the previous generation keep it
+            # until they notice the new generation and remap
+            _unlink_segment(f"{self.name}_{generation - 1}")
+        return generation
+
+    def unlink(self) -> None:
+        """Remove the shared segments (called by the owning process on exit)."""
+        generation = self.generation
+        self.close()
+        _unlink_segment(self.name)
+        _unlink_segment(f"{self.name}_{generation}")
+
+    def close(self) -> None:
+        """Drop this process's mappings."""
+        if self._mapping is not None:
+            self._mapping.release()
+            self._mapping = None
+        if self._control is not None:
+            self._control.close()
+            self._control = None
+
+    # ---- Reading ----
+
+    @property
+    def generation(self) -> int:
+        """Current published generation (0 when nothing is published)."""
+        control = self._attach_control()
+        if control is None:
+            return 0
+        return struct.unpack_from("<Q", control.buf, _GENERATION_OFFSET)[0]
+
+    def age(self) -> float | None:
+        """Seconds since the current generation was published."""
+        control = self._attach_control()
+        if control is None or self.generation == 0:
+            return None
+        published_at = _CONTROL.unpack_from(control.buf, 0)[3]
+        return time.time() - published_at
+
+    def get(self, product_id: int) -> Product | None:
+        """
+        Build a detached Product from the snapshot, or None if absent. Its
+        stock is not set; the caller reads it from the database.
+        """
+        mapping = self._current()
+        if mapping is None:
+            return None
+        i = mapping.index_of(product_id)
+        if i is None:
+            return None
+        flags = mapping.flags[i]
+        return Product(
+            id=product_id,
+            name=mapping.text(i, 0),
+            description=None if flags & FLAG_NO_DESCRIPTION else mapping.text(i, 1),
+            price_cents=mapping.price[i],
+            category=None if flags & FLAG_NO_CATEGORY else mapping.text(i, 2),
+            created_at=_EPOCH + timedelta(microseconds=mapping.created[i]),
+        )
+
+    def price_of(self, product_id: int) -> tuple[str, int] | None:
+        """(name, price in cents) for order pricing, or None if absent."""
+        mapping = self._current()
+        if mapping is None:
+            return None
+        i = mapping.index_of(product_id)
+        if i is None:
+            return None
+        return mapping.text(i, 0), mapping.price[i]
+
+    # ---- Internals ----
+
+    @contextmanager
+    def _publish_lock(self) -> Iterator[None]:
+        """Serialize publishers across processes."""
+        lock_path = Path(tempfile.gettempdir()) / f"{self.name}.lock"
+        with open(lock_path, "a+") as lock_file:
+            _lock_file(lock_file)
+            try:
+                yield
+            finally:
+                _unlock_file(lock_file)
+
+    def _open_control(self, create: bool) -> SharedMemory:
+        if self._control is not None:
+            return self._control
+        try:
+            self._control = _open_segment(self.name)
+        except FileNotFoundError:
+            if not create:
+                raise
+            self._control = _open_segment(self.name, create=True, size=_CONTROL.size)
+            _CONTROL.pack_into(self._control.buf, 0, MAGIC, 0, 0, 0.0)
+        return self._control
+
+    def _attach_control(self) -> SharedMemory | None:
+        if not self.enabled:
+            return None
+        if self._control is not None:
+            return self._control
+        now = time.monotonic()
+        if now < self._next_attach_at:
+            return None
+        try:
+            return self._open_control(create=False)
+        except FileNotFoundError:
+            self._next_attach_at = now + _ATTACH_RETRY_SECONDS
+            return None
+
+    def _current(self) -> _Mapping | None:
+        generation = self.generation
+        if generation == 0:
+            return None
+        if self._mapping is not None and self._mapping.generation == generation:
+            return self._mapping
+        if self._mapping is not None:
+            self._mapping.release()
+            self._mapping = None
+        try:
+            shm = _open_segment(f"{self.name}_{generation}")
+        except FileNotFoundError:
+            # Replaced between reading the generation and attaching
+            return None
+        self._mapping = self._map(generation, shm)
+        return self._mapping
+
+    @staticmethod
+    def _map(generation: int, shm: SharedMemory) -> _Mapping:
+        magic, _, count, blob_size = _HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError("Catalog snapshot segment has an unknown layout")
+        pos = _HEADER_SIZE
+        columns = []
+        for _ in range(3):
+            columns.append(shm.buf[pos:pos + 8 * count].cast("q"))
+            pos += 8 * count
+        flags = shm.buf[pos:pos + count]
+        pos += _pad8(count)
+        offsets_size = 8 * (3 * count + 1)
+        offsets = shm.buf[pos:pos + offsets_size].cast("Q")
+        pos += offsets_size
+        blob = shm.buf[pos:pos + blob_size]
+        return _Mapping(generation, shm, *columns, flags, offsets, blob)
+
+
+catalog_snapshot = CatalogSnapshot(
+    settings.catalog_shm_name,
+    enabled=settings.catalog_snapshot_enabled,
+)
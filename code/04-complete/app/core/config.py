@@ -0,0 +1,105 @@
+"""
+Application Settings - environment driven configuration.
+"""
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class Settings(BaseSettings):
+    """Runtime settings read from environment variables (case-insensitive)."""
+    model_config = SettingsConfigDict(extra="ignore")
+
+    environment: str = "development"
+    database_url: str = "sqlite+aiosqlite:///./orders.db"
+
+    # Serving (python -m app.serve)
+    host: str = "0.0.0.0"
+    port: int = 8000
+    web_concurrency: int | None = None
+    max_workers: int = 16
+    keep_alive_seconds: int = 75
+    backlog: int = 2048
+    # Set by app.serve once the parent process has created the schema
+    skip_schema_init: bool = False
+
+    # Shared-memory product catalog snapshot
+    catalog_snapshot_enabled: bool = False
+    catalog_shm_name: str = "shopfast_catalog"
+    catalog_snapshot_refresh_seconds: float = 300.0
+
+    # In-process product listing cache (GET /products), invalidated by catalog_version
+    product_listing_cache_enabled: bool = True
+    product_listing_cache_max_items: int = 200_000  # larger catalogs are listed from the DB
+    product_listing_version_ttl_seconds: float = 1.0
+
+    # Cached category / stock-bucket counts (GET /products/facets)
+    product_facets_version_ttl_seconds: float = 1.0
+    product_facets_stock_ttl_seconds: float = 5.0  # stock moves without a version bump
+
+    # Bulk product import (POST /products/import)
+    product_import_chunk_size: int = 2000  # rows per transaction
+    product_import_max_errors: int = 1000  # row errors reported in the response
+
+    # Checkout stock holds
+    stock_hold_ttl_seconds: int = 900
+    stock_hold_sweep_interval_seconds: float = 5.0  # 0 disables the expiry sweeper
+    stock_hold_sweep_batch_size: int = 500
+
+    # Product search (FTS5) and typeahead
+    product_search_max_results: int = 50
+    product_autocomplete_sync_seconds: float = 1.0
+
+    # Background notification dispatcher
+    notification_dispatcher_enabled: bool = False
+    notification_sender: str = "stdout"  # "stdout" or "file:<path>"
+    notification_batch_size: int = 100
+    notification_concurrency: int = 10
+    notification_max_attempts: int = 5
+    notification_backoff_base_seconds: float = 2.0
+    notification_backoff_max_seconds: float = 300.0
+    notification_poll_interval_seconds: float = 1.0
+    notification_claim_timeout_seconds: float = 300.0
+    # Weighted fair queuing across lanes (JSON objects keyed by lane name);
+    # rate limits are messages per second, lanes without one are unlimited
+    notification_lane_weights: dict[str, float] = {
+        "transactional": 6.0,
+        "customer": 3.0,
+        "admin": 1.0,
+    }
+    notification_lane_rate_limits: dict[str, float] = {}
+    # Digest mode: merge a recipient's same-type notifications per window
+    notification_digest_enabled: bool = False
+    notification_digest_window_seconds: float = 3600.0
+
+    # Notification templates
+    notification_default_locale: str = "en"
+    # Resolved (type, locale) lookups, including fallbacks to the default
+    notification_template_cache_size: int = 256
+
+    # Retention: move old sent notifications into notifications_archive
+    notification_retention_enabled: bool = False
+    notification_retention_days: int = 30
+    notification_retention_batch_size: int = 500
+    notification_retention_interval_seconds: float = 3600.0
+
+    # Server-sent notification stream
+    notification_stream_queue_size: int = 1000  # events buffered per client
+    notification_stream_heartbeat_seconds: float = 15.0
+    notification_stream_replay_limit: int = 500
+    # Shared per-process poll for rows committed by other workers (0 disables)
+    notification_stream_poll_seconds: float = 2.0
+
+    # Inventory ledger compaction (0 disables the background task)
+    inventory_compaction_interval_seconds: float = 60.0
+    inventory_compaction_batch_size: int = 5000
+
+    # Low-stock alerts: one pending alert per product per window
+    low_stock_alert_window_seconds: int = 3600
+
+    # Health / readiness
+    health_probe_ttl_seconds: float = 5.0
+    health_lock_wait_window_seconds: float = 60.0
+    health_max_probe_age_seconds: float = 30.0
+
+
+settings = Settings()
@@ -3,14 +3,35 @@ Database Configuration - Async SQLAlchemy 2.0 Setup
 Lab 2 Complete: Project scaffolding with database ready.
 """
 
-import os
 from typing import AsyncGenerator
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 
-DATABASE_URL = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./orders.db")
+from app.core.config import settings
+from app.core.monitoring import db_monitor
+
+DATABASE_URL = settings.database_url
 
 engine = create_async_engine(DATABASE_URL, echo=True)
+db_monitor.instrument(engine)
+
+
+def is_sqlite(url: str = DATABASE_URL) -> bool:
+    """Check whether a database URL points at SQLite."""
+    return url.startswith("sqlite")
+
+
+if is_sqlite():
+    @event.listens_for(engine.sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        """WAL lets readers in every worker proceed while one writer commits."""
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
 
 async_session = async_sessionmaker(
     engine, 
@@ -24,6 +45,16 @@ class Base(DeclarativeBase):
     pass
 
 
+async def init_models() -> None:
+    """Create all tables and upgrade older schemas in place (idempotent)."""
+    async with engine.begin() as conn:
+        # Imported here: migrations needs the models, which import this module
+        from app.core.migrations import run_migrations
+
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """FastAPI dependency for database sessions."""
     async with async_session() as session:
@@ -3,12 +3,21 @@ Custom Exceptions for ShopFast API
 Full API: Business logic exceptions for all services.
 """
 
+from datetime import date
+
 
 class ShopFastError(Exception):
     """Base exception for ShopFast API."""
     pass
 
 
+class InvalidCursorError(ShopFastError):
+    """Raised when a pagination cursor cannot be decoded."""
+    def __init__(self, cursor: str):
+        self.cursor = cursor
+        super().__init__(f"Invalid pagination cursor '{cursor}'")
+
+
 # Order Exceptions
 class OrderServiceError(ShopFastError):
     """Base exception for order service."""
@@ -75,6 +84,13 @@ class ProductNotFoundError(ProductServiceError):
         super().__init__(f"Product with ID {product_id} not found")
 
 
+class ProductAlreadyExistsError(ProductServiceError):
+    """Raised when product SKU already exists."""
+    def __init__(self, sku: str):
+        self.sku = sku
+        super().__init__(f"Product with SKU '{sku}' already exists")
+
+
 class InsufficientStockError(ProductServiceError):
     """Raised when product has insufficient stock."""
     def __init__(self, product_id: int, requested: int, available: int):
@@ -87,6 +103,35 @@ class InsufficientStockError(ProductServiceError):
         )
 
 
+class StockHoldNotFoundError(ProductServiceError):
+    """Raised when a stock hold is not found or no longer active."""
+    def __init__(self, hold_id: int):
+        self.hold_id = hold_id
+        super().__init__(f"Active stock hold with ID {hold_id} not found")
+
+
+class StockHoldUnavailableError(ProductServiceError):
+    """Raised when an order names holds that are missing, expired or used."""
+    def __init__(self, hold_ids: list[int]):
+        self.hold_ids = hold_ids
+        super().__init__(
+            "Stock holds not active or not for this order's products: "
+            + ", ".join(str(hold_id) for hold_id in hold_ids)
+        )
+
+
+class StockHoldQuantityError(ProductServiceError):
+    """Raised when an order's holds for a product do not match its ordered quantity."""
+    def __init__(self, product_id: int, held: int, ordered: int):
+        self.product_id = product_id
+        self.held = held
+        self.ordered = ordered
+        super().__init__(
+            f"Stock holds for product {product_id} cover {held} units "
+            f"but the order has {ordered}"
+        )
+
+
 # Notification Exceptions
 class NotificationServiceError(ShopFastError):
     """Base exception for notification service."""
@@ -98,3 +143,22 @@ class NotificationNotFoundError(NotificationServiceError):
     def __init__(self, notification_id: int):
         self.notification_id = notification_id
         super().__init__(f"Notification with ID {notification_id} not found")
+
+
+class NotificationDeliveryError(NotificationServiceError):
+    """Raised by a notification sender when a message could not be delivered."""
+
+
+# Report Exceptions
+class ReportServiceError(ShopFastError):
+    """Base exception for report service."""
+
+
+class InvalidReportRangeError(ReportServiceError):
+    """Raised when a report date range is invalid."""
+    def __init__(self, date_from: date, date_to: date):
+        self.date_from = date_from
+        self.date_to = date_to
+        super().__init__(
+            f"Invalid report range: 'from' ({date_from}) is after 'to' ({date_to})"
+        )
@@ -0,0 +1,140 @@
+"""
+Schema Migrations - in-place upgrades for databases created by older versions.
+
+Base.metadata.create_all only creates missing tables, so columns added to
+or changed in existing tables are upgraded here, along with their indexes.
+Each migration inspects the live schema and is a no-op once applied (and
+on a fresh database), so init_models can run them on every startup.
+"""
+
+import logging
+from collections.abc import Callable
+
+from sqlalchemy import Connection, Table, case, inspect, text, update
+
+from app.models import Notification, NotificationLane, Product
+from app.models.notification import COUNTER_TRIGGERS, LANE_PRIORITY, NOTIFICATION_LANES
+
+logger = logging.getLogger(__name__)
+
+# Columns added to tables that older databases already have: (name, DDL)
+PRODUCT_COLUMNS = (
+    ("sku", "VARCHAR(64)"),
+    ("stock_applied_id", "INTEGER NOT NULL DEFAULT 0"),
+    ("stock_shards", "INTEGER NOT NULL DEFAULT 0"),
+)
+NOTIFICATION_COLUMNS = (
+    ("priority", "INTEGER NOT NULL DEFAULT 0"),
+    ("claim_token", "VARCHAR(32)"),
+    ("claimed_at", "DATETIME"),
+    ("attempts", "INTEGER NOT NULL DEFAULT 0"),
+    ("next_attempt_at", "DATETIME"),
+    ("last_error", "VARCHAR(500)"),
+    ("dedupe_key", "VARCHAR(100)"),
+    ("occurrences", "INTEGER NOT NULL DEFAULT 1"),
+)
+
+# (table, old Numeric(10, 2) column, new integer-cents column)
+MONEY_COLUMNS = (
+    ("products", "price", "price_cents"),
+    ("order_items", "unit_price", "unit_price_cents"),
+    ("orders", "total", "total_cents"),
+)
+
+
+def _add_columns(
+    connection: Connection, table: Table, columns: tuple[tuple[str, str], ...]
+) -> set[str]:
+    """Add the missing columns and the table's indexes; returns the columns added."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table.name)}
+    added = set()
+    for name, ddl in columns:
+        if name not in existing:
+            connection.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {name} {ddl}"))
+            logger.info("Added %s.%s", table.name, name)
+            added.add(name)
+    existing |= added
+    for index in table.indexes:
+        # Indexes on columns a later migration adds are created by that one
+        if all(column.name in existing for column in index.columns):
+            index.create(connection, checkfirst=True)
+    return added
+
+
+def product_columns(connection: Connection) -> None:
+    """SKU, ledger and shard columns on products, plus their indexes."""
+    if inspect(connection).has_table(Product.__tablename__):
+        _add_columns(connection, Product.__table__, PRODUCT_COLUMNS)
+
+
+def notification_columns(connection: Connection) -> None:
+    """Priority, dispatcher and coalescing columns on notifications, plus indexes."""
+    if not inspect(connection).has_table(Notification.__tablename__):
+        return
+    added = _add_columns(connection, Notification.__table__, NOTIFICATION_COLUMNS)
+    if "priority" in added:
+        # Existing rows get the lane rank new rows derive from their type
+        table = Notification.__table__
+        connection.execute(update(table).values(priority=case(
+            {kind.value: LANE_PRIORITY[lane] for kind, lane in NOTIFICATION_LANES.items()},
+            value=table.c.type,
+            else_=LANE_PRIORITY[NotificationLane.CUSTOMER],
+        )))
+
+
+def notification_counters(connection: Connection) -> None:
+    """Status counter triggers, with counters rebuilt from the existing rows."""
+    # The triggers are only created along with a new notifications table
+    if connection.dialect.name != "sqlite" or not inspect(connection).has_table(
+        Notification.__tablename__
+    ):
+        return
+    existing = connection.execute(text(
+        "SELECT COUNT(*) FROM sqlite_master "
+        "WHERE type = 'trigger' AND name LIKE 'notifications_count_%'"
+    )).scalar_one()
+    if existing == len(COUNTER_TRIGGERS):
+        return
+    for trigger in COUNTER_TRIGGERS:
+        connection.execute(text(trigger))
+    # Writes made without the triggers left the counters behind; recount
+    connection.execute(text("DELETE FROM notification_counters"))
+    connection.execute(text(
+        "INSERT INTO notification_counters (status, count) "
+        "SELECT status, COUNT(*) FROM notifications GROUP BY status"
+    ))
+    logger.info("Created notification counter triggers and backfilled counters")
+
+
+def money_to_cents(connection: Connection) -> None:
+    """Replace Numeric(10, 2) money columns with integer cents."""
+    inspector = inspect(connection)
+    for table, old, new in MONEY_COLUMNS:
+        if not inspector.has_table(table):
+            continue
+        columns = {column["name"] for column in inspector.get_columns(table)}
+        if old not in columns or new in columns:
+            continue
+        connection.execute(text(
+            f"ALTER TABLE {table} ADD COLUMN {new} INTEGER NOT NULL DEFAULT 0"
+        ))
+        # Round half away from zero, as to_cents does for non-negative amounts
+        connection.execute(text(
+            f"UPDATE {table} SET {new} = CAST(ROUND({old} * 100) AS INTEGER)"
+        ))
+        connection.execute(text(f"ALTER TABLE {table} DROP COLUMN {old}"))
+        logger.info("Migrated %s.%s to integer cents (%s)", table, old, new)
+
+
+MIGRATIONS: tuple[Callable[[Connection], None], ...] = (
+    product_columns,
+    notification_columns,
+    notification_counters,
+    money_to_cents,
+)
+
+
+def run_migrations(connection: Connection) -> None:
+    """Apply every migration (each skips itself when already applied)."""
+    for migration in MIGRATIONS:
+        migration(connection)
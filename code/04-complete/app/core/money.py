@@ -0,0 +1,32 @@
+"""
+Money helpers - conversions between Decimal amounts and integer cents.
+
+Models store and add up money as integer cents; Decimal appears only at
+the API schema boundary (CentsDecimal on response fields).
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Annotated, Any
+
+from pydantic import BeforeValidator
+
+
+def to_cents(amount: Decimal) -> int:
+    """Convert a Decimal amount to integer cents (half-up rounding)."""
+    return int((Decimal(amount) * 100).to_integral_value(rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: int) -> Decimal:
+    """Convert integer cents to a two-place Decimal amount."""
+    return Decimal(cents).scaleb(-2)
+
+
+def _cents_to_decimal(value: Any) -> Any:
+    # Integer cents come from a model; anything else is already an amount
+    if isinstance(value, int) and not isinstance(value, bool):
+        return from_cents(value)
+    return value
+
+
+# Response field read from an integer-cents model attribute
+CentsDecimal = Annotated[Decimal, BeforeValidator(_cents_to_decimal)]
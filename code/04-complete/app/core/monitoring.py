@@ -0,0 +1,184 @@
+"""
+Database Monitoring - pool, latency and write-contention instrumentation.
+
+Statement timings are collected from SQLAlchemy engine events, so real
+traffic keeps the numbers fresh and the readiness probe only touches the
+database when the process has been idle for longer than the probe TTL.
+
+Background jobs report counters and gauges through the process-wide
+metrics registry, exposed in Prometheus text format.
+"""
+
+import time
+from collections import deque
+from dataclasses import dataclass
+
+from sqlalchemy import event, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+
+WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Point-in-time connection pool counters (None when not supported)."""
+    size: int | None
+    checked_out: int | None
+    overflow: int | None
+    max_overflow: int | None
+
+    @property
+    def exhausted(self) -> bool:
+        """True when every pooled and overflow connection is checked out."""
+        if self.size is None or self.checked_out is None or self.max_overflow is None:
+            return False
+        if self.max_overflow < 0:
+            return False
+        return self.checked_out >= self.size + self.max_overflow
+
+
+class DatabaseMonitor:
+    """Collects database health signals for the readiness endpoint."""
+
+    def __init__(
+        self,
+        probe_ttl: float = settings.health_probe_ttl_seconds,
+        lock_wait_window: float = settings.health_lock_wait_window_seconds,
+    ) -> None:
+        self.probe_ttl = probe_ttl
+        self.lock_wait_window = lock_wait_window
+        self.writer_queue_depth = 0
+        self.last_ok_at: float | None = None
+        self.last_latency_ms: float | None = None
+        self.last_error: str | None = None
+        self.last_error_at: float | None = None
+        self._write_waits: deque[tuple[float, float]] = deque(maxlen=1024)
+        self._probing = False
+        self._engine: AsyncEngine | None = None
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        """Attach statement timing listeners to an engine."""
+        self._engine = engine
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+        event.listen(sync_engine, "handle_error", self._on_error)
+
+    def _before_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        is_write = statement.lstrip()[:7].upper().startswith(WRITE_PREFIXES)
+        if is_write:
+            self.writer_queue_depth += 1
+        conn.info.setdefault("monitor_starts", []).append((time.perf_counter(), is_write))
+
+    def _after_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        started, is_write = conn.info["monitor_starts"].pop()
+        elapsed = time.perf_counter() - started
+        if is_write:
+            self.writer_queue_depth -= 1
+            # Write statements block on the database write lock, so their
+            # duration is our best proxy for lock wait
+            self._write_waits.append((time.monotonic(), elapsed))
+        self.record_round_trip(elapsed)
+
+    def _on_error(self, context) -> None:
+        conn = context.connection
+        starts = conn.info.get("monitor_starts") if conn is not None else None
+        if starts:
+            _, is_write = starts.pop()
+            if is_write:
+                self.writer_queue_depth -= 1
+        self.last_error = str(context.original_exception)
+        self.last_error_at = time.monotonic()
+
+    def record_round_trip(self, elapsed: float) -> None:
+        """Record a successful database round trip."""
+        self.last_ok_at = time.monotonic()
+        self.last_latency_ms = round(elapsed * 1000, 3)
+
+    def probe_age(self) -> float | None:
+        """Seconds since the last successful round trip."""
+        if self.last_ok_at is None:
+            return None
+        return time.monotonic() - self.last_ok_at
+
+    async def probe(self, session: AsyncSession) -> None:
+        """Run SELECT 1 unless a round trip succeeded within the probe TTL."""
+        age = self.probe_age()
+        if (age is not None and age < self.probe_ttl) or self._probing:
+            return
+        self._probing = True
+        try:
+            started = time.perf_counter()
+            await session.execute(text("SELECT 1"))
+            self.record_round_trip(time.perf_counter() - started)
+        except SQLAlchemyError as e:
+            self.last_error = str(e)
+            self.last_error_at = time.monotonic()
+        finally:
+            self._probing = False
+
+    def lock_wait_ms(self) -> tuple[float, float]:
+        """(max, total) write wait in milliseconds over the recent window."""
+        cutoff = time.monotonic() - self.lock_wait_window
+        waits = [elapsed for at, elapsed in self._write_waits if at >= cutoff]
+        if not waits:
+            return 0.0, 0.0
+        return round(max(waits) * 1000, 3), round(sum(waits) * 1000, 3)
+
+    def pool_stats(self) -> PoolStats:
+        """Read connection pool counters from the instrumented engine."""
+        pool = self._engine.pool if self._engine is not None else None
+
+        def read(name: str) -> int | None:
+            method = getattr(pool, name, None)
+            return method() if callable(method) else None
+
+        return PoolStats(
+            size=read("size"),
+            checked_out=read("checkedout"),
+            overflow=read("overflow"),
+            max_overflow=getattr(pool, "_max_overflow", None),
+        )
+
+
+db_monitor = DatabaseMonitor()
+
+
+class Metrics:
+    """Process-local counters and gauges."""
+
+    def __init__(self) -> None:
+        self._values: dict[str, float] = {}
+        self._help: dict[str, tuple[str, str]] = {}
+
+    def describe(self, name: str, kind: str, help_text: str) -> None:
+        """Register a metric ("counter" or "gauge") so it renders before use."""
+        self._help[name] = (kind, help_text)
+        self._values.setdefault(name, 0)
+
+    def inc(self, name: str, value: float = 1) -> None:
+        self._values[name] = self._values.get(name, 0) + value
+
+    def set(self, name: str, value: float) -> None:
+        self._values[name] = value
+
+    def get(self, name: str) -> float:
+        return self._values.get(name, 0)
+
+    def render(self) -> str:
+        """Prometheus text exposition of every metric."""
+        lines = []
+        for name in sorted(self._values):
+            kind, help_text = self._help.get(name, ("untyped", ""))
+            if help_text:
+                lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            value = self._values[name]
+            lines.append(f"{name} {int(value) if float(value).is_integer() else value}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,30 @@
+"""
+Keyset Pagination - opaque cursor encoding.
+
+Cursors carry the sort key of the last row of a page, so the next page
+starts with an index seek instead of an OFFSET scan.
+"""
+
+import base64
+import json
+from typing import Any
+
+from app.core.exceptions import InvalidCursorError
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode sort-key values into an opaque URL-safe cursor."""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Decode a cursor produced by encode_cursor with `size` values."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError):
+        raise InvalidCursorError(cursor)
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError(cursor)
+    return values
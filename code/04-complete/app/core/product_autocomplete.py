@@ -0,0 +1,118 @@
+"""
+Product Autocomplete - in-process sorted name index for typeahead.
+
+Names are kept case-folded in one sorted list; a prefix lookup is a bisect
+plus a short forward walk, so it never touches the database. Products are
+not deleted, so the index is kept current incrementally: local writes
+insert (or, for a bulk import, rename) directly, and every `sync_interval`
+seconds rows with ids above the highest id seen are pulled in to pick up
+products created by other workers. Batches (imports, syncs) are merged in
+one sort rather than inserted one by one. Renames made by another worker are not
+seen until this one restarts.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from typing import Protocol
+
+from app.core.config import settings
+
+
+class NameSource(Protocol):
+    """What a sync needs from the product repository."""
+
+    async def get_names_after(self, after_id: int, limit: int) -> list[tuple[int, str]]: ...
+
+
+class ProductNameIndex:
+    """Case-insensitive prefix index over product names."""
+
+    def __init__(self, sync_interval: float = 1.0, batch_size: int = 10_000) -> None:
+        self.sync_interval = sync_interval
+        self.batch_size = batch_size
+        self._entries: list[tuple[str, str, int]] = []  # (folded name, name, id)
+        self._names: dict[int, str] = {}
+        self._last_id = 0
+        self._synced_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, product_id: int, name: str) -> None:
+        """Insert one product, replacing its entry if the name changed (idempotent)."""
+        old = self._names.get(product_id)
+        if old == name:
+            return
+        if old is not None:
+            del self._entries[bisect_left(self._entries, (old.casefold(), old, product_id))]
+        self._names[product_id] = name
+        insort(self._entries, (name.casefold(), name, product_id))
+
+    def add_many(self, products: Iterable[tuple[int, str]]) -> None:
+        """
+        Insert or rename many (id, name) pairs with one merge: O(n + k log k)
+        instead of an O(n) list insert per product.
+        """
+        added: dict[int, tuple[str, str, int]] = {}
+        stale: set[tuple[str, str, int]] = set()
+        for product_id, name in products:
+            if product_id not in added:
+                old = self._names.get(product_id)
+                if old == name:
+                    continue
+                if old is not None:
+                    stale.add((old.casefold(), old, product_id))
+            self._names[product_id] = name
+            added[product_id] = (name.casefold(), name, product_id)
+        if not added:
+            return
+        entries = self._entries
+        if stale:
+            entries = [entry for entry in entries if entry not in stale]
+        # Both runs are sorted, so Timsort merges them in linear time
+        entries.extend(sorted(added.values()))
+        entries.sort()
+        self._entries = entries
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._names.clear()
+        self._last_id = 0
+        self._synced_at = float("-inf")
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """Up to `limit` distinct names starting with `prefix`, alphabetically."""
+        folded = prefix.casefold()
+        entries = self._entries
+        names: list[str] = []
+        i = bisect_left(entries, (folded,))
+        while i < len(entries) and len(names) < limit:
+            key, name, _ = entries[i]
+            if not key.startswith(folded):
+                break
+            if not names or names[-1] != name:
+                names.append(name)
+            i += 1
+        return names
+
+    async def sync(self, source: NameSource) -> None:
+        """Pull in products created since the last sync (at most every interval)."""
+        if time.monotonic() - self._synced_at < self.sync_interval:
+            return
+        async with self._lock:
+            if time.monotonic() - self._synced_at < self.sync_interval:
+                return
+            while True:
+                rows = await source.get_names_after(self._last_id, self.batch_size)
+                self.add_many(rows)
+                if rows:
+                    self._last_id = rows[-1][0]
+                if len(rows) < self.batch_size:
+                    break
+            self._synced_at = time.monotonic()
+
+
+product_names = ProductNameIndex(settings.product_autocomplete_sync_seconds)
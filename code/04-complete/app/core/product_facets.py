@@ -0,0 +1,121 @@
+"""
+Product Facets - cached per-category and stock-bucket counts.
+
+Counts are loaded with one grouped aggregate that also reads the catalog
+version, so the two are consistent. A local write reports the version its
+transaction produced along with the stock transitions it made; when that
+version directly follows the cached one, the counts are adjusted in place.
+Any other gap (a write by another worker) means the next read reloads.
+
+Orders, holds and hold expiry move stock without bumping the version, so
+the stock buckets can drift; the counts are reloaded at least every
+`stock_ttl` seconds to bound that.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Protocol
+
+from app.core.config import settings
+
+# (category, stock before or None for a new product, stock after)
+StockChange = tuple[str | None, int | None, int]
+
+
+class FacetSource(Protocol):
+    """What a reload needs from the product repository."""
+
+    async def get_catalog_version(self) -> int: ...
+
+    async def get_facet_counts(
+        self, low_stock_threshold: int
+    ) -> tuple[int, list[tuple[str | None, int, int, int]]]: ...
+
+
+@dataclass
+class FacetCounts:
+    """Counts for one category, or for the whole catalog."""
+    count: int = 0
+    in_stock: int = 0
+    low_stock: int = 0
+
+
+class FacetCache:
+    """Category and stock-bucket counts for this process."""
+
+    def __init__(
+        self,
+        low_stock_threshold: int = 10,
+        version_ttl: float = 1.0,
+        stock_ttl: float = 5.0,
+    ) -> None:
+        self.low_stock_threshold = low_stock_threshold
+        self.version_ttl = version_ttl
+        self.stock_ttl = stock_ttl
+        self._version: int | None = None
+        self._categories: dict[str | None, FacetCounts] = {}
+        self._checked_at = float("-inf")
+        self._loaded_at = float("-inf")
+        self._lock = asyncio.Lock()
+
+    def clear(self) -> None:
+        self._version = None
+        self._categories = {}
+        self._checked_at = float("-inf")
+        self._loaded_at = float("-inf")
+
+    async def get(self, source: FacetSource) -> dict[str | None, FacetCounts]:
+        """
+        Counts per category, reloaded if another worker changed the catalog
+        or the stock buckets are older than stock_ttl.
+        """
+        now = time.monotonic()
+        if self._version is not None and now - self._loaded_at < self.stock_ttl:
+            if now - self._checked_at < self.version_ttl:
+                return self._categories
+            if await source.get_catalog_version() == self._version:
+                self._checked_at = now
+                return self._categories
+        async with self._lock:
+            # Another reader may have reloaded while this one waited
+            if self._version is None or self._loaded_at < now:
+                await self._load(source)
+        return self._categories
+
+    def apply(self, version: int, changes: Iterable[StockChange]) -> None:
+        """Fold a committed local write (that produced `version`) into the counts."""
+        if self._version is None or version != self._version + 1:
+            self._version = None
+            return
+        for category, before, after in changes:
+            counts = self._categories.setdefault(category, FacetCounts())
+            if before is None:
+                counts.count += 1
+            else:
+                self._add(counts, before, -1)
+            self._add(counts, after, 1)
+        self._version = version
+
+    def _add(self, counts: FacetCounts, stock: int, sign: int) -> None:
+        if stock > 0:
+            counts.in_stock += sign
+            if stock < self.low_stock_threshold:
+                counts.low_stock += sign
+
+    async def _load(self, source: FacetSource) -> None:
+        started = time.monotonic()
+        version, rows = await source.get_facet_counts(self.low_stock_threshold)
+        self._categories = {
+            category: FacetCounts(count, in_stock, low_stock)
+            for category, count, in_stock, low_stock in rows
+        }
+        self._version = version
+        self._checked_at = self._loaded_at = started
+
+
+product_facets = FacetCache(
+    version_ttl=settings.product_facets_version_ttl_seconds,
+    stock_ttl=settings.product_facets_stock_ttl_seconds,
+)
@@ -0,0 +1,93 @@
+"""
+Product Import - incremental CSV / NDJSON record parsing.
+
+Both parsers consume the request body chunk by chunk and yield one record
+at a time as (line number, fields), or (line number, error message) for a
+record that cannot be parsed. Only the current record is ever buffered, so
+memory stays bounded by MAX_RECORD_CHARS whatever the size of the upload.
+"""
+
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterable, AsyncIterator
+
+# Longest record accepted; a longer one ends the import with an error
+MAX_RECORD_CHARS = 64 * 1024
+
+Record = tuple[int, dict | str]
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[tuple[int, str]]:
+    """Decoded lines (with their line endings) and their 1-based line numbers."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    line_no = 0
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            line_no += 1
+            yield line_no, line + "\n"
+        if len(pending) > MAX_RECORD_CHARS:
+            yield line_no + 1, pending
+            return
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield line_no + 1, pending
+
+
+async def iter_csv_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Record]:
+    """
+    Records of a CSV upload with a header row. Blank values are left out,
+    so the schema's defaults apply. A quoted value may span lines: a record
+    is complete once it holds an even number of quote characters.
+    """
+    header: list[str] | None = None
+    record = ""
+    start = 0
+    async for line_no, line in _iter_lines(chunks):
+        if not record:
+            start = line_no
+        record += line
+        if len(record) > MAX_RECORD_CHARS:
+            yield start, f"record longer than {MAX_RECORD_CHARS} characters"
+            return
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        try:
+            values = next(csv.reader([text.rstrip("\r\n")]))
+        except csv.Error as e:
+            yield start, f"invalid CSV: {e}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield start, f"expected {len(header)} fields, got {len(values)}"
+            continue
+        yield start, {name: value for name, value in zip(header, values) if value != ""}
+    if record:
+        yield start, "unterminated quoted value"
+
+
+async def iter_ndjson_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[Record]:
+    """Records of a newline-delimited JSON upload, one object per line."""
+    async for line_no, line in _iter_lines(chunks):
+        if len(line) > MAX_RECORD_CHARS:
+            yield line_no, f"record longer than {MAX_RECORD_CHARS} characters"
+            return
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as e:
+            yield line_no, f"invalid JSON: {e}"
+            continue
+        if not isinstance(value, dict):
+            yield line_no, "expected a JSON object"
+            continue
+        yield line_no, value
@@ -0,0 +1,215 @@
+"""
+Product Listing - in-process cache for GET /products.
+
+The whole catalog is held sorted by (name, id) with each product already
+serialized to JSON, plus per-category lists of positions into that order.
+A page is a bisect on the (name, id) cursor key and a slice, so listing
+costs O(log n + page) with no COUNT or sort.
+
+Stock is left out of the cached JSON: orders, holds and their expiry
+change it without bumping the catalog version, so the caller reads the
+page's current stock (one primary-key lookup) and completes each item
+with with_stock().
+
+Writes bump the catalog_version row in the same transaction. Readers
+compare their view's version with the database at most once per
+`version_ttl` seconds (immediately after a write in this process) and
+rebuild when it moved. Catalogs over `max_items` are not cached and the
+caller falls back to the database, with totals memoized per version.
+"""
+
+import asyncio
+import json
+import time
+from bisect import bisect_right
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Protocol
+
+from app.core.config import settings
+from app.models import Product
+from app.schemas import ProductResponse
+
+
+class ListingSource(Protocol):
+    """What a rebuild needs from the product repository."""
+
+    async def get_catalog_version(self) -> int: ...
+
+    async def get_stocks(self, product_ids: list[int]) -> dict[int, int]: ...
+
+    async def count(self, category: str | None = None) -> int: ...
+
+    def stream_by_name(self) -> AsyncIterator[Product]: ...
+
+
+# Fields that depend on stock, appended per request by with_stock()
+STOCK_FIELDS = {"stock", "is_low_stock"}
+
+
+def serialize_listed(product: Product) -> bytes:
+    """ProductResponse JSON for one product without the stock fields or closing brace."""
+    response = ProductResponse.model_validate(product)
+    return response.model_dump_json(exclude=STOCK_FIELDS).encode()[:-1]
+
+
+def with_stock(item: bytes, stock: int) -> bytes:
+    """Complete a serialize_listed() item with its current stock."""
+    # is_low_stock mirrors ProductResponse.is_low_stock
+    return b'%s,"stock":%d,"is_low_stock":%s}' % (
+        item, stock, b"true" if stock < 10 else b"false",
+    )
+
+
+def serialize_product(product: Product) -> bytes:
+    """ProductResponse JSON for one product (same bytes as a cached item)."""
+    return with_stock(serialize_listed(product), product.stock)
+
+
+def json_array(items: list[bytes]) -> bytes:
+    """Join pre-serialized items into a JSON array."""
+    return b"[" + b",".join(items) + b"]"
+
+
+def page_envelope(items: list[bytes], total: int, next_cursor: str | None) -> bytes:
+    """ProductPage JSON from pre-serialized items."""
+    return b'{"items":%s,"total":%d,"next_cursor":%s}' % (
+        json_array(items), total, json.dumps(next_cursor).encode(),
+    )
+
+
+@dataclass
+class ListingView:
+    """One immutable build of the listing at a catalog version."""
+    version: int
+    keys: list[tuple[str, int]] = field(default_factory=list)
+    items: list[bytes] = field(default_factory=list)  # serialize_listed() output
+    by_category: dict[str, list[int]] = field(default_factory=dict)
+
+    def add(self, product: Product) -> None:
+        """Append one product (products must arrive in (name, id) order)."""
+        if product.category is not None:
+            self.by_category.setdefault(product.category, []).append(len(self.items))
+        self.keys.append((product.name, product.id))
+        self.items.append(serialize_listed(product))
+
+    def page(
+        self,
+        category: str | None,
+        limit: int,
+        after: tuple[str, int] | None = None,
+    ) -> tuple[list[tuple[int, bytes]], int, tuple[str, int] | None]:
+        """
+        ((product id, item without stock) pairs, total matching, key of the
+        last item when more follow) for the page after the `after` key.
+        """
+        keys = self.keys
+        if category is None:
+            start = 0 if after is None else bisect_right(keys, after)
+            end = start + limit
+            more = end < len(keys)
+            selected = range(start, min(end, len(keys)))
+            total = len(keys)
+        else:
+            positions = self.by_category.get(category, [])
+            start = 0 if after is None else bisect_right(positions, after, key=keys.__getitem__)
+            selected = positions[start:start + limit]
+            more = start + limit < len(positions)
+            total = len(positions)
+        items = self.items
+        return (
+            [(keys[i][1], items[i]) for i in selected],
+            total,
+            keys[selected[-1]] if more else None,
+        )
+
+
+class ProductListing:
+    """Versioned, pre-sorted product listing for this process."""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_items: int = 200_000,
+        version_ttl: float = 1.0,
+    ) -> None:
+        self.enabled = enabled
+        self.max_items = max_items
+        self.version_ttl = version_ttl
+        self._view: ListingView | None = None
+        self._oversize_version: int | None = None
+        self._version: int | None = None
+        self._totals: dict[str | None, int] = {}
+        self._checked_at = float("-inf")
+        self._writes = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        """Force a version check on the next read (after a local write)."""
+        self._checked_at = float("-inf")
+        self._writes += 1
+
+    def clear(self) -> None:
+        """Drop the cached view."""
+        self._view = None
+        self._oversize_version = None
+        self._version = None
+        self._totals.clear()
+        self.invalidate()
+
+    async def view(self, source: ListingSource) -> ListingView | None:
+        """Current view, rebuilt if the catalog version moved; None to use the DB."""
+        if not self.enabled:
+            return None
+        now = time.monotonic()
+        view = self._view
+        if view is not None and now - self._checked_at < self.version_ttl:
+            return view
+
+        writes = self._writes
+        version = await source.get_catalog_version()
+        if version != self._version:
+            self._version = version
+            self._totals.clear()
+        if self._oversize_version == version:
+            return None
+        if view is None or view.version != version:
+            async with self._lock:
+                view = self._view
+                if view is None or view.version != version:
+                    view = await self._build(source, version)
+        if writes == self._writes:
+            # A local write during the check must still be seen next read
+            self._checked_at = now
+        return view
+
+    async def total(self, source: ListingSource, category: str | None = None) -> int:
+        """
+        Product count for the database fallback, memoized until the catalog
+        version seen by the last view() call changes.
+        """
+        total = self._totals.get(category)
+        if total is None:
+            total = await source.count(category)
+            if self._version is not None:
+                self._totals[category] = total
+        return total
+
+    async def _build(self, source: ListingSource, version: int) -> ListingView | None:
+        if await source.count() > self.max_items:
+            self._view = None
+            self._oversize_version = version
+            return None
+        view = ListingView(version)
+        async for product in source.stream_by_name():
+            view.add(product)
+        self._view = view
+        self._oversize_version = None
+        return view
+
+
+product_listing = ProductListing(
+    enabled=settings.product_listing_cache_enabled,
+    max_items=settings.product_listing_cache_max_items,
+    version_ttl=settings.product_listing_version_ttl_seconds,
+)
@@ -0,0 +1,57 @@
+"""
+User IDs - in-process membership set for existence checks.
+
+User ids are dense autoincrement integers, so the set is a bitmap: one bit
+per id up to the highest one seen (about 125 KB per million users). Users
+are never deleted, so a set bit stays true; ids are added when this
+process creates a user or a database check confirms one. An id that is
+not in the bitmap may still have been created by another worker, so a
+miss is always confirmed with one query rather than trusted.
+"""
+
+from collections.abc import Iterable
+from typing import Protocol
+
+
+class UserIdSource(Protocol):
+    """What a membership check needs from the user repository."""
+
+    async def has_users(self, user_ids: list[int]) -> set[int]: ...
+
+
+class UserIdSet:
+    """Bitmap of user ids known to exist."""
+
+    def __init__(self) -> None:
+        self._bits = bytearray()
+
+    def __contains__(self, user_id: int) -> bool:
+        byte = user_id >> 3
+        return 0 < user_id and byte < len(self._bits) and bool(
+            self._bits[byte] & (1 << (user_id & 7))
+        )
+
+    def add(self, user_id: int) -> None:
+        byte = user_id >> 3
+        if byte >= len(self._bits):
+            # Grow geometrically so a run of new users is amortized O(1)
+            self._bits.extend(bytes(max(byte + 1, 2 * len(self._bits)) - len(self._bits)))
+        self._bits[byte] |= 1 << (user_id & 7)
+
+    def clear(self) -> None:
+        self._bits = bytearray()
+
+    async def existing(self, source: UserIdSource, user_ids: Iterable[int]) -> set[int]:
+        """The given ids that belong to users; only ids not yet known are queried."""
+        user_ids = set(user_ids)
+        found = {user_id for user_id in user_ids if user_id in self}
+        missing = user_ids - found
+        if missing:
+            confirmed = await source.has_users(sorted(missing))
+            for user_id in confirmed:
+                self.add(user_id)
+            found |= confirmed
+        return found
+
+
+known_users = UserIdSet()
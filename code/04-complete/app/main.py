@@ -6,23 +6,71 @@ Run: uvicorn app.main:app --reload
 Docs: http://localhost:8000/docs
 """
 
+import asyncio
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
-from app.core.database import engine, Base
-from app.api.v1 import health, orders, users, products, inventory, notifications
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.config import settings
+from app.core.database import async_session, engine, init_models
+from app.services.hold_service import run_hold_sweeper
+from app.services.inventory_compaction import run_inventory_compactor
+from app.services.notification_dispatcher import NotificationDispatcher, build_sender
+from app.services.notification_retention import NotificationRetention
+from app.services.notification_stream import NotificationPoller
+from app.services.product_service import refresh_catalog_snapshot, run_catalog_refresher
+from app.api.v1 import health, orders, users, products, inventory, notifications, reports
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan - startup and shutdown."""
-    # Startup: Create database tables
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    # Startup: Create database tables (app.serve does this once, before forking)
+    if not settings.skip_schema_init:
+        await init_models()
+
+    tasks: list[asyncio.Task] = []
+    if settings.catalog_snapshot_enabled:
+        # Under app.serve the parent publishes the snapshot and owns it
+        if not settings.skip_schema_init:
+            await refresh_catalog_snapshot(async_session)
+        tasks.append(asyncio.create_task(
+            run_catalog_refresher(async_session, settings.catalog_snapshot_refresh_seconds)
+        ))
+    if settings.inventory_compaction_interval_seconds > 0:
+        tasks.append(asyncio.create_task(run_inventory_compactor(
+            async_session,
+            settings.inventory_compaction_interval_seconds,
+            settings.inventory_compaction_batch_size,
+        )))
+    if settings.stock_hold_sweep_interval_seconds > 0:
+        tasks.append(asyncio.create_task(run_hold_sweeper(
+            async_session,
+            settings.stock_hold_sweep_interval_seconds,
+            settings.stock_hold_sweep_batch_size,
+        )))
+    if settings.notification_dispatcher_enabled:
+        dispatcher = NotificationDispatcher(
+            async_session, build_sender(settings.notification_sender)
+        )
+        tasks.append(asyncio.create_task(dispatcher.run()))
+    if settings.notification_retention_enabled:
+        retention = NotificationRetention(async_session)
+        tasks.append(asyncio.create_task(retention.run()))
+    if settings.notification_stream_poll_seconds > 0:
+        poller = NotificationPoller(async_session)
+        tasks.append(asyncio.create_task(poller.run()))
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: stop background tasks and release resources
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    if settings.catalog_snapshot_enabled and not settings.skip_schema_init:
+        catalog_snapshot.unlink()
+    else:
+        catalog_snapshot.close()
     await engine.dispose()
 
 
@@ -44,6 +92,7 @@ def create_app() -> FastAPI:
     app.include_router(orders.router, prefix="/api/v1", tags=["Orders"])
     app.include_router(inventory.router, prefix="/api/v1", tags=["Inventory"])
     app.include_router(notifications.router, prefix="/api/v1", tags=["Notifications"])
+    app.include_router(reports.router, prefix="/api/v1", tags=["Reports"])
 
     @app.get("/", tags=["Root"])
     async def root() -> dict[str, str]:
@@ -1,17 +1,47 @@
 """Models package."""
 from app.models.user import User
-from app.models.product import Product
+from app.models.product import CatalogVersion, Product
+from app.models.product_search import match_query, products_fts
+from app.models.inventory_movement import (
+    InventoryCompaction,
+    InventoryMovement,
+    MovementReason,
+)
+from app.models.stock_shard import ProductStockShard
+from app.models.stock_hold import HoldStatus, StockHold
 from app.models.order import Order, OrderStatus
 from app.models.order_item import OrderItem
-from app.models.notification import Notification, NotificationType, NotificationStatus
+from app.models.notification import (
+    Notification,
+    NotificationArchive,
+    NotificationCounter,
+    NotificationLane,
+    NotificationType,
+    NotificationStatus,
+)
+from app.models.sales_rollup import SalesDailyStatus, SalesDailyProduct
 
 __all__ = [
     "User",
     "Product",
+    "CatalogVersion",
+    "products_fts",
+    "match_query",
+    "InventoryMovement",
+    "InventoryCompaction",
+    "MovementReason",
+    "ProductStockShard",
+    "StockHold",
+    "HoldStatus",
     "Order",
     "OrderStatus",
     "OrderItem",
     "Notification",
+    "NotificationArchive",
+    "NotificationCounter",
+    "NotificationLane",
     "NotificationType",
     "NotificationStatus",
+    "SalesDailyStatus",
+    "SalesDailyProduct",
 ]
@@ -0,0 +1,61 @@
+"""
+Inventory Movement Model - SQLAlchemy 2.0 Mapped Syntax
+
+Append-only stock ledger. Writers only ever INSERT movements, so stock
+changes never read-modify-write the product row.
+"""
+
+from datetime import UTC, datetime
+from enum import Enum
+
+from sqlalchemy import ForeignKey, Index, String, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column
+
+from app.core.database import Base
+from app.models.product import Product
+
+
+class MovementReason(str, Enum):
+    """Why stock moved."""
+    INITIAL = "initial"
+    ADJUSTMENT = "adjustment"
+    RESTOCK = "restock"
+    ORDER = "order"
+    HOLD = "hold"
+    HOLD_RELEASE = "hold_release"
+
+
+class InventoryMovement(Base):
+    """One stock change for one product."""
+    __tablename__ = "inventory_movements"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    delta: Mapped[int]
+    reason: Mapped[str] = mapped_column(String(20))
+    reference_id: Mapped[int | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+
+    __table_args__ = (
+        # Pending-delta sums and history pages seek by (product_id, id)
+        Index("idx_movement_product_id", "product_id", "id"),
+    )
+
+
+class InventoryCompaction(Base):
+    """Single-row high-water mark of movements folded into product snapshots."""
+    __tablename__ = "inventory_compaction"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    last_movement_id: Mapped[int] = mapped_column(default=0)
+
+
+Product.pending_delta = column_property(
+    select(func.coalesce(func.sum(InventoryMovement.delta), 0))
+    .where(
+        InventoryMovement.product_id == Product.id,
+        InventoryMovement.id > Product.stock_applied_id,
+    )
+    .correlate_except(InventoryMovement)
+    .scalar_subquery()
+)
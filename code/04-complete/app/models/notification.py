@@ -2,10 +2,11 @@
 Notification Model - SQLAlchemy 2.0 Mapped Syntax
 """
 
+import zlib
 from datetime import UTC, datetime
 from enum import Enum
 
-from sqlalchemy import String, Text, Index
+from sqlalchemy import DDL, LargeBinary, String, Text, Index, event, text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -28,6 +29,40 @@ class NotificationStatus(str, Enum):
     FAILED = "failed"
 
 
+class NotificationLane(str, Enum):
+    """Delivery lanes, highest priority first."""
+    TRANSACTIONAL = "transactional"  # order placed / shipped
+    CUSTOMER = "customer"            # other customer-facing order updates
+    ADMIN = "admin"                  # internal stock alerts
+
+
+LANE_PRIORITY = {lane: rank for rank, lane in enumerate(NotificationLane)}
+
+NOTIFICATION_LANES = {
+    NotificationType.ORDER_CREATED: NotificationLane.TRANSACTIONAL,
+    NotificationType.ORDER_SHIPPED: NotificationLane.TRANSACTIONAL,
+    NotificationType.ORDER_DELIVERED: NotificationLane.CUSTOMER,
+    NotificationType.ORDER_CANCELLED: NotificationLane.CUSTOMER,
+    NotificationType.LOW_STOCK: NotificationLane.ADMIN,
+    NotificationType.RESTOCK: NotificationLane.ADMIN,
+}
+
+
+def lane_for(notification_type: str) -> NotificationLane:
+    """Delivery lane of a notification type (unknown types go to customer)."""
+    try:
+        return NOTIFICATION_LANES[NotificationType(notification_type)]
+    except ValueError:
+        return NotificationLane.CUSTOMER
+
+
+def _default_priority(context) -> int:
+    return LANE_PRIORITY[lane_for(context.get_current_parameters()["type"])]
+
+
+PENDING_DEDUPE_WHERE = "status = 'pending' AND dedupe_key IS NOT NULL"
+
+
 class Notification(Base):
     """Notification model for tracking messages."""
     __tablename__ = "notifications"
@@ -45,7 +80,101 @@ class Notification(Base):
     reference_id: Mapped[int | None] = mapped_column(nullable=True)
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
     sent_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    # Lane rank derived from type (0 = most urgent)
+    priority: Mapped[int] = mapped_column(default=_default_priority)
+
+    # Delivery bookkeeping for the background dispatcher
+    claim_token: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    claimed_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    attempts: Mapped[int] = mapped_column(default=0)
+    next_attempt_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+
+    # Coalescing: at most one pending notification per dedupe key; repeats
+    # update the pending row in place and bump occurrences
+    dedupe_key: Mapped[str | None] = mapped_column(String(100), nullable=True)
+    occurrences: Mapped[int] = mapped_column(default=1)
 
     __table_args__ = (
         Index("idx_notification_status_created", "status", "created_at"),
+        Index(
+            "idx_notification_status_priority_created",
+            "status", "priority", "created_at", "id",
+        ),
+        Index(
+            "uq_notification_pending_dedupe",
+            "dedupe_key",
+            unique=True,
+            sqlite_where=text(PENDING_DEDUPE_WHERE),
+        ),
+    )
+
+    @property
+    def lane(self) -> NotificationLane:
+        return lane_for(self.type)
+
+
+class NotificationArchive(Base):
+    """Compact copy of a sent notification moved out by the retention job."""
+    __tablename__ = "notifications_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True)  # original notification id
+    type: Mapped[str] = mapped_column(String(50))
+    recipient_id: Mapped[int] = mapped_column(index=True)
+    subject: Mapped[str] = mapped_column(String(200))
+    message_z: Mapped[bytes] = mapped_column(LargeBinary)  # zlib-compressed utf-8
+    reference_id: Mapped[int | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column()
+    sent_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+
+    @property
+    def message(self) -> str:
+        """Decompressed message body."""
+        return zlib.decompress(self.message_z).decode()
+
+
+class NotificationCounter(Base):
+    """Row count per notification status, maintained by triggers."""
+    __tablename__ = "notification_counters"
+
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    count: Mapped[int] = mapped_column(default=0)
+
+
+# Keep notification_counters in step with every write path (ORM, bulk and
+# raw SQL alike) so pending totals never need a COUNT over the table.
+COUNTER_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS notifications_count_insert
+    AFTER INSERT ON notifications
+    BEGIN
+        INSERT INTO notification_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notifications_count_update
+    AFTER UPDATE OF status ON notifications
+    WHEN OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE notification_counters SET count = count - 1 WHERE status = OLD.status;
+        INSERT INTO notification_counters (status, count) VALUES (NEW.status, 1)
+        ON CONFLICT (status) DO UPDATE SET count = count + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notifications_count_delete
+    AFTER DELETE ON notifications
+    BEGIN
+        UPDATE notification_counters SET count = count - 1 WHERE status = OLD.status;
+    END
+    """,
+)
+
+for _trigger in COUNTER_TRIGGERS:
+    event.listen(
+        Notification.__table__,
+        "after_create",
+        DDL(_trigger).execute_if(dialect="sqlite"),
     )
@@ -3,8 +3,7 @@ OrderItem Model - SQLAlchemy 2.0 Mapped Syntax
 Lab 2 Complete: Order line items.
 """
 
-from decimal import Decimal
-from sqlalchemy import String, Numeric, ForeignKey
+from sqlalchemy import String, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
@@ -20,14 +19,14 @@ class OrderItem(Base):
     product_id: Mapped[int] = mapped_column(index=True)
     product_name: Mapped[str] = mapped_column(String(200))
     quantity: Mapped[int]
-    unit_price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
+    unit_price_cents: Mapped[int]
     
     order: Mapped["Order"] = relationship("Order", back_populates="items")
     
     @property
-    def subtotal(self) -> Decimal:
-        """Calculate line item subtotal."""
-        return Decimal(str(self.unit_price)) * self.quantity
+    def subtotal_cents(self) -> int:
+        """Calculate line item subtotal in cents."""
+        return self.unit_price_cents * self.quantity
 
 
 from app.models.order import Order  # noqa: E402
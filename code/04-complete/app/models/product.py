@@ -1,11 +1,22 @@
 """
 Product Model - SQLAlchemy 2.0 Mapped Syntax
+
+Stock is derived from the inventory ledger: the stock column is a snapshot
+that already includes every movement up to stock_applied_id, and
+Product.stock adds the movements appended since (pending_delta, mapped in
+app.models.inventory_movement). Periodic compaction folds pending
+movements into the snapshot.
+
+Products flagged with stock_shards > 0 read stock as the sum of their
+shards (shard_stock, mapped in app.models.stock_shard) instead.
+
+Prices are stored as integer cents; schemas convert to Decimal.
 """
 
 from datetime import UTC, datetime
-from decimal import Decimal
 
-from sqlalchemy import String, Numeric, Text
+from sqlalchemy import Index, String, Text, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.core.database import Base
@@ -16,14 +27,57 @@ class Product(Base):
     __tablename__ = "products"
 
     id: Mapped[int] = mapped_column(primary_key=True)
+    # Supplier SKU: the upsert key for bulk imports
+    sku: Mapped[str | None] = mapped_column(String(64), nullable=True)
     name: Mapped[str] = mapped_column(String(200))
     description: Mapped[str | None] = mapped_column(Text, nullable=True)
-    price: Mapped[Decimal] = mapped_column(Numeric(10, 2))
-    stock: Mapped[int] = mapped_column(default=0)
+    price_cents: Mapped[int]
+    stock_snapshot: Mapped[int] = mapped_column("stock", default=0)
+    stock_applied_id: Mapped[int] = mapped_column(default=0)
+    stock_shards: Mapped[int] = mapped_column(default=0)
     category: Mapped[str | None] = mapped_column(String(50), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
 
+    __table_args__ = (
+        # Low-stock dashboard: range scan in (stock, id) order
+        Index("idx_product_stock_id", "stock", "id"),
+        # Product listing: keyset pages in (name, id) order, overall and per category
+        Index("idx_product_category_name_id", "category", "name", "id"),
+        Index("idx_product_name_id", "name", "id"),
+        # Upsert key for bulk imports (an index, so migrations can add it)
+        Index("uq_product_sku", "sku", unique=True),
+    )
+
+    @hybrid_property
+    def stock(self) -> int:
+        """Shard sum for sharded products, else snapshot plus uncompacted movements."""
+        # Read the column properties only if they were loaded; never lazy-load here
+        if self.stock_shards:
+            return self.__dict__.get("shard_stock") or 0
+        return self.stock_snapshot + (self.__dict__.get("pending_delta") or 0)
+
+    @stock.inplace.setter
+    def _stock_setter(self, value: int) -> None:
+        # Only for building rows directly; services record ledger movements
+        self.stock_snapshot = value - (self.__dict__.get("pending_delta") or 0)
+
+    @stock.inplace.expression
+    @classmethod
+    def _stock_expression(cls):
+        return case(
+            (cls.stock_shards > 0, cls.shard_stock),
+            else_=cls.stock_snapshot + cls.pending_delta,
+        )
+
     @property
     def is_low_stock(self) -> bool:
         """Check if product is low on stock (threshold: 10)."""
         return self.stock < 10
+
+
+class CatalogVersion(Base):
+    """Single-row counter bumped in every transaction that changes listings."""
+    __tablename__ = "catalog_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[int] = mapped_column(default=0)
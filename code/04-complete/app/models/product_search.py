@@ -0,0 +1,85 @@
+"""
+Product Search - FTS5 full-text index over product name and description.
+
+products_fts is an external-content FTS5 table: it stores only the index
+and reads text back from products by rowid. Triggers keep it in step with
+product inserts, deletes and name/description updates; ledger compaction
+only touches stock columns, so it never reindexes.
+
+The table is created after Base.metadata.create_all on SQLite, including
+databases whose products table predates it (those are indexed once with
+the FTS5 'rebuild' command).
+"""
+
+import re
+
+from sqlalchemy import column, event, table, text
+
+from app.core.database import Base
+
+products_fts = table("products_fts", column("rowid"), column("name"), column("description"))
+
+# bm25 column weights: a hit in the name outranks one in the description
+NAME_WEIGHT = 10.0
+DESCRIPTION_WEIGHT = 1.0
+
+_CREATE_STATEMENTS = (
+    (
+        "CREATE VIRTUAL TABLE products_fts USING fts5("
+        "name, description, content='products', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    (
+        "CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+    (
+        "CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); END"
+    ),
+    (
+        "CREATE TRIGGER products_fts_au AFTER UPDATE OF name, description ON products BEGIN "
+        "INSERT INTO products_fts(products_fts, rowid, name, description) "
+        "VALUES ('delete', old.id, old.name, old.description); "
+        "INSERT INTO products_fts(rowid, name, description) "
+        "VALUES (new.id, new.name, new.description); END"
+    ),
+)
+
+_TOKEN = re.compile(r"\w+")
+
+
+def match_query(search: str) -> str | None:
+    """
+    FTS5 MATCH expression for free text: every word must appear, the last
+    one as a prefix (so "wire mou" finds "Wireless Mouse"). Words are
+    quoted, so user input cannot inject FTS5 syntax. None if no words.
+    """
+    tokens = _TOKEN.findall(search)
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_product_search(target, connection, **kw) -> None:
+    if connection.dialect.name != "sqlite":
+        return
+    exists = connection.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'products_fts'"
+    )).first()
+    if exists:
+        return
+    for statement in _CREATE_STATEMENTS:
+        connection.execute(text(statement))
+    connection.execute(text("INSERT INTO products_fts(products_fts) VALUES ('rebuild')"))
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _drop_product_search(target, connection, **kw) -> None:
+    if connection.dialect.name == "sqlite":
+        connection.execute(text("DROP TABLE IF EXISTS products_fts"))
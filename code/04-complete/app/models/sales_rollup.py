@@ -0,0 +1,35 @@
+"""
+Sales Rollup Models - SQLAlchemy 2.0 Mapped Syntax
+
+Pre-aggregated daily sales, maintained incrementally by OrderService so
+reports never scan orders/order_items.
+"""
+
+from datetime import date
+
+from sqlalchemy import String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class SalesDailyStatus(Base):
+    """Revenue, order count and units per day x order status."""
+    __tablename__ = "sales_daily_status"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    status: Mapped[str] = mapped_column(String(20), primary_key=True)
+    revenue_cents: Mapped[int] = mapped_column(default=0)
+    order_count: Mapped[int] = mapped_column(default=0)
+    units: Mapped[int] = mapped_column(default=0)
+
+
+class SalesDailyProduct(Base):
+    """Revenue, order count and units per day x product (excludes cancelled)."""
+    __tablename__ = "sales_daily_product"
+
+    day: Mapped[date] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(primary_key=True)
+    revenue_cents: Mapped[int] = mapped_column(default=0)
+    order_count: Mapped[int] = mapped_column(default=0)
+    units: Mapped[int] = mapped_column(default=0)
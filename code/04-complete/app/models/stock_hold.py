@@ -0,0 +1,41 @@
+"""
+Stock Hold Model - SQLAlchemy 2.0 Mapped Syntax
+
+A hold takes stock out of the ledger when checkout starts and keeps it for
+a limited time. Placing an order consumes the hold (the stock stays out);
+releasing it or letting it expire puts the stock back.
+"""
+
+from datetime import UTC, datetime
+from enum import Enum
+
+from sqlalchemy import ForeignKey, Index, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.database import Base
+
+
+class HoldStatus(str, Enum):
+    """Lifecycle of a stock hold."""
+    ACTIVE = "active"
+    CONSUMED = "consumed"
+    RELEASED = "released"
+    EXPIRED = "expired"
+
+
+class StockHold(Base):
+    """Stock reserved for one checkout until expires_at."""
+    __tablename__ = "stock_holds"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"))
+    quantity: Mapped[int]
+    status: Mapped[str] = mapped_column(String(20), default=HoldStatus.ACTIVE.value)
+    expires_at: Mapped[datetime]
+    order_id: Mapped[int | None] = mapped_column(nullable=True)
+    created_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
+
+    __table_args__ = (
+        # Expiry sweeps seek the oldest active holds
+        Index("idx_hold_status_expires", "status", "expires_at"),
+    )
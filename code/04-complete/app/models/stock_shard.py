@@ -0,0 +1,33 @@
+"""
+Stock Shard Model - SQLAlchemy 2.0 Mapped Syntax
+
+Hot products (Product.stock_shards > 0) keep their stock split across
+sub-rows so concurrent decrements land on different rows. Shards are the
+admission counter for those products: a decrement succeeds only if a
+conditional shard update does. Every shard change also appends a ledger
+movement in the same transaction, so the ledger stays the history and
+the shards always sum to the ledger stock.
+"""
+
+from sqlalchemy import ForeignKey, func, select
+from sqlalchemy.orm import Mapped, column_property, mapped_column
+
+from app.core.database import Base
+from app.models.product import Product
+
+
+class ProductStockShard(Base):
+    """One slice of a sharded product's stock."""
+    __tablename__ = "product_stock_shards"
+
+    product_id: Mapped[int] = mapped_column(ForeignKey("products.id"), primary_key=True)
+    shard: Mapped[int] = mapped_column(primary_key=True)
+    stock: Mapped[int] = mapped_column(default=0)
+
+
+Product.shard_stock = column_property(
+    select(func.coalesce(func.sum(ProductStockShard.stock), 0))
+    .where(ProductStockShard.product_id == Product.id)
+    .correlate_except(ProductStockShard)
+    .scalar_subquery()
+)
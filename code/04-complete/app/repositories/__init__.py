@@ -3,10 +3,12 @@ from app.repositories.order_repository import OrderRepository
 from app.repositories.user_repository import UserRepository
 from app.repositories.product_repository import ProductRepository
 from app.repositories.notification_repository import NotificationRepository
+from app.repositories.report_repository import ReportRepository
 
 __all__ = [
     "OrderRepository",
     "UserRepository",
     "ProductRepository",
     "NotificationRepository",
+    "ReportRepository",
 ]
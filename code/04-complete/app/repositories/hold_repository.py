@@ -0,0 +1,79 @@
+"""Stock Hold Repository - Data Access Layer for checkout holds."""
+
+from datetime import datetime
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import HoldStatus, StockHold
+
+
+class StockHoldRepository:
+    """Repository for StockHold database operations."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def stage(self, hold: StockHold) -> StockHold:
+        """Add a hold to the current transaction (flushed for its id)."""
+        self.session.add(hold)
+        await self.session.flush()
+        return hold
+
+    async def commit(self) -> None:
+        await self.session.commit()
+
+    async def release(self, hold_id: int) -> StockHold | None:
+        """Stage active -> released for one hold; None if it is not active."""
+        result = await self.session.execute(
+            update(StockHold)
+            .where(StockHold.id == hold_id, StockHold.status == HoldStatus.ACTIVE.value)
+            .values(status=HoldStatus.RELEASED.value)
+            .returning(StockHold)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def consume(
+        self,
+        hold_ids: list[int],
+        order_id: int,
+        now: datetime,
+    ) -> list[tuple[int, int]]:
+        """
+        Stage active -> consumed for unexpired holds; returns the
+        (id, product_id, quantity) of holds that were consumed.
+        """
+        result = await self.session.execute(
+            update(StockHold)
+            .where(
+                StockHold.id.in_(hold_ids),
+                StockHold.status == HoldStatus.ACTIVE.value,
+                StockHold.expires_at > now,
+            )
+            .values(status=HoldStatus.CONSUMED.value, order_id=order_id)
+            .returning(StockHold.id, StockHold.product_id, StockHold.quantity)
+            .execution_options(synchronize_session=False)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def expire_due(self, now: datetime, limit: int) -> list[tuple[int, int, int]]:
+        """
+        Stage active -> expired for up to `limit` holds past expires_at,
+        oldest first (a seek on idx_hold_status_expires). Returns
+        (id, product_id, quantity) of the expired holds.
+        """
+        due = (
+            select(StockHold.id)
+            .where(StockHold.status == HoldStatus.ACTIVE.value, StockHold.expires_at <= now)
+            .order_by(StockHold.expires_at)
+            .limit(limit)
+        )
+        result = await self.session.execute(
+            update(StockHold)
+            .where(StockHold.id.in_(due))
+            .values(status=HoldStatus.EXPIRED.value)
+            .returning(StockHold.id, StockHold.product_id, StockHold.quantity)
+            .execution_options(synchronize_session=False)
+        )
+        return [tuple(row) for row in result.all()]
@@ -0,0 +1,164 @@
+"""Inventory Repository - Data Access Layer for the stock ledger."""
+
+from datetime import UTC, datetime
+
+from sqlalchemy import func, insert, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import InventoryCompaction, InventoryMovement, MovementReason, Product
+
+_COMPACTION_ROW = 1
+
+
+def compacted_through():
+    """SQL expression: id of the last movement folded by compaction."""
+    return func.coalesce(
+        select(InventoryCompaction.last_movement_id)
+        .where(InventoryCompaction.id == _COMPACTION_ROW)
+        .scalar_subquery(),
+        0,
+    )
+
+
+class InventoryRepository:
+    """Repository for InventoryMovement database operations."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def append(
+        self,
+        product_id: int,
+        delta: int,
+        reason: MovementReason,
+        reference_id: int | None = None,
+    ) -> InventoryMovement:
+        """Stage a movement in the current transaction (flushed, not committed)."""
+        movement = InventoryMovement(
+            product_id=product_id,
+            delta=delta,
+            reason=reason.value,
+            reference_id=reference_id,
+        )
+        self.session.add(movement)
+        await self.session.flush()
+        return movement
+
+    async def append_if_available(
+        self,
+        product_id: int,
+        quantity: int,
+        reason: MovementReason,
+        reference_id: int | None = None,
+    ) -> bool:
+        """
+        Stage a -quantity movement only if the product has that much stock.
+        The check and the insert are one INSERT ... SELECT, so concurrent
+        decrements cannot both pass it.
+        """
+        available = (
+            select(Product.stock).where(Product.id == product_id).scalar_subquery()
+        )
+        row = select(
+            literal(product_id),
+            literal(-quantity),
+            literal(reason.value),
+            literal(reference_id),
+            literal(datetime.now(UTC)),
+        ).where(available >= quantity)
+        result = await self.session.execute(
+            insert(InventoryMovement).from_select(
+                ["product_id", "delta", "reason", "reference_id", "created_at"], row
+            )
+        )
+        return result.rowcount == 1
+
+    async def append_many(self, movements: list[dict]) -> None:
+        """Stage many movements with one executemany INSERT."""
+        if movements:
+            await self.session.execute(InventoryMovement.__table__.insert(), movements)
+
+    async def commit(self) -> None:
+        """Commit staged movements."""
+        await self.session.commit()
+
+    async def get_history(
+        self,
+        product_id: int,
+        limit: int = 100,
+        before_id: int | None = None,
+    ) -> list[InventoryMovement]:
+        """A product's movements newest first, seeking idx_movement_product_id."""
+        query = (
+            select(InventoryMovement)
+            .where(InventoryMovement.product_id == product_id)
+            .order_by(InventoryMovement.id.desc())
+            .limit(limit)
+        )
+        if before_id is not None:
+            query = query.where(InventoryMovement.id < before_id)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def compact(self, batch_size: int) -> tuple[int, int]:
+        """
+        Fold the next `batch_size` movements into product snapshots and
+        commit. Returns (movements folded, products updated).
+
+        Each product only adds movements after its own stock_applied_id and
+        the marks only move forward, so concurrent compactors cannot apply
+        a movement twice.
+        """
+        last = (await self.session.execute(select(compacted_through()))).scalar()
+        window = (
+            select(InventoryMovement.id)
+            .where(InventoryMovement.id > last)
+            .order_by(InventoryMovement.id)
+            .limit(batch_size)
+            .subquery()
+        )
+        count, high = (await self.session.execute(
+            select(func.count(), func.max(window.c.id))
+        )).one()
+        if not count:
+            await self.session.rollback()
+            return 0, 0
+
+        touched = (
+            select(InventoryMovement.product_id)
+            .where(InventoryMovement.id > last, InventoryMovement.id <= high)
+            .distinct()
+        )
+        folded = (
+            select(func.coalesce(func.sum(InventoryMovement.delta), 0))
+            .where(
+                InventoryMovement.product_id == Product.id,
+                InventoryMovement.id > Product.stock_applied_id,
+                InventoryMovement.id <= high,
+            )
+            .correlate(Product)
+            .scalar_subquery()
+        )
+        result = await self.session.execute(
+            update(Product)
+            .where(Product.id.in_(touched))
+            .values(
+                stock_snapshot=Product.stock_snapshot + folded,
+                stock_applied_id=func.max(Product.stock_applied_id, high),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        products = result.rowcount
+
+        stmt = sqlite_insert(InventoryCompaction).values(
+            id=_COMPACTION_ROW, last_movement_id=high
+        )
+        await self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[InventoryCompaction.id],
+            set_={"last_movement_id": func.max(
+                InventoryCompaction.last_movement_id, stmt.excluded.last_movement_id
+            )},
+        ))
+        await self.session.commit()
+        return count, products
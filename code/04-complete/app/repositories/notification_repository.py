@@ -1,11 +1,87 @@
-"""Notification Repository - Data Access Layer."""
+"""Notification Repository - Data Access Layer.
 
-from datetime import UTC, datetime
+Notifications inserted through any session are published to the in-process
+notification broadcaster once their transaction commits (and dropped if it
+rolls back), which feeds the server-sent event stream.
+"""
 
-from sqlalchemy import select
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import (
+    Integer,
+    case,
+    cast,
+    delete,
+    event,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    tuple_,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.broadcast import notification_broadcaster
+from app.models import (
+    Notification,
+    NotificationArchive,
+    NotificationCounter,
+    NotificationStatus,
+)
+from app.models.notification import PENDING_DEDUPE_WHERE
+
+_UNPUBLISHED = "unpublished_notifications"
+
+
+def digest_window_index(window: timedelta):
+    """SQL expression: the digest window a notification's created_at falls in."""
+    # Whole seconds since the epoch, as the dispatcher groups claimed rows
+    epoch = cast(func.strftime("%s", Notification.created_at), Integer)
+    return cast(epoch / window.total_seconds(), Integer)
+
+
+def notification_event(notification: Notification) -> dict[str, Any]:
+    """Broadcast payload for a newly created notification."""
+    return {
+        "id": notification.id,
+        "type": notification.type,
+        "recipient_id": notification.recipient_id,
+        "subject": notification.subject,
+        "message": notification.message,
+        "status": notification.status,
+        "reference_id": notification.reference_id,
+        "created_at": notification.created_at.isoformat(),
+        "occurrences": notification.occurrences,
+    }
+
 
-from app.models import Notification, NotificationStatus
+def _queue_event(session: Session, notification: Notification) -> None:
+    session.info.setdefault(_UNPUBLISHED, []).append(notification_event(notification))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_new_notifications(session: Session, flush_context) -> None:
+    # session.new still lists the just-inserted objects, now with ids
+    for obj in session.new:
+        if isinstance(obj, Notification):
+            _queue_event(session, obj)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_notifications(session: Session) -> None:
+    for payload in session.info.pop(_UNPUBLISHED, ()):
+        notification_broadcaster.publish(payload)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_notifications(session: Session) -> None:
+    session.info.pop(_UNPUBLISHED, None)
 
 
 class NotificationRepository:
@@ -21,22 +97,114 @@ class NotificationRepository:
         await self.session.refresh(notification)
         return notification
 
+    def add(self, notification: Notification) -> None:
+        """Stage a notification in the current transaction without committing."""
+        self.session.add(notification)
+
+    async def stage_coalesced(self, notification: Notification) -> Notification:
+        """
+        Insert a notification, or fold it into the pending one with the same
+        dedupe_key (new subject/message, occurrences + 1). A single
+        INSERT ... ON CONFLICT against the unique partial index, no commit.
+        """
+        stmt = sqlite_insert(Notification).values(
+            type=notification.type,
+            recipient_id=notification.recipient_id,
+            subject=notification.subject,
+            message=notification.message,
+            reference_id=notification.reference_id,
+            dedupe_key=notification.dedupe_key,
+            status=NotificationStatus.PENDING.value,
+            created_at=datetime.now(UTC),
+            occurrences=1,
+            attempts=0,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Notification.dedupe_key],
+            index_where=text(PENDING_DEDUPE_WHERE),
+            set_={
+                "subject": stmt.excluded.subject,
+                "message": stmt.excluded.message,
+                "occurrences": Notification.occurrences + 1,
+            },
+        ).returning(Notification)
+        result = await self.session.execute(
+            stmt, execution_options={"populate_existing": True}
+        )
+        notification = result.scalar_one()
+        if notification.occurrences == 1:  # inserted rather than coalesced
+            _queue_event(self.session.sync_session, notification)
+        return notification
+
+    async def create_coalesced(self, notification: Notification) -> Notification:
+        """Insert or coalesce a notification and commit."""
+        notification = await self.stage_coalesced(notification)
+        await self.session.commit()
+        return notification
+
     async def get_by_id(self, notification_id: int) -> Notification | None:
         """Get notification by ID."""
         query = select(Notification).where(Notification.id == notification_id)
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_pending(self) -> list[Notification]:
-        """Get all pending notifications."""
+    async def get_pending(
+        self,
+        limit: int = 100,
+        after: tuple[int, datetime, int] | None = None,
+        priority: int | None = None,
+    ) -> list[Notification]:
+        """
+        Get a page of pending notifications, most urgent lane first, then
+        oldest first. `after` is the (priority, created_at, id) key of the
+        last row of the previous page; the scan seeks into
+        idx_notification_status_priority_created.
+        """
         query = (
             select(Notification)
             .where(Notification.status == NotificationStatus.PENDING.value)
-            .order_by(Notification.created_at)
+            .order_by(Notification.priority, Notification.created_at, Notification.id)
+            .limit(limit)
         )
+        if priority is not None:
+            query = query.where(Notification.priority == priority)
+        if after is not None:
+            query = query.where(
+                tuple_(Notification.priority, Notification.created_at, Notification.id)
+                > tuple_(*after)
+            )
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
+    async def get_pending_after_id(self, after_id: int, limit: int) -> list[Notification]:
+        """Pending notifications with id greater than after_id, in id order."""
+        query = (
+            select(Notification)
+            .where(
+                Notification.id > after_id,
+                Notification.status == NotificationStatus.PENDING.value,
+            )
+            .order_by(Notification.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_max_id(self) -> int:
+        """Highest notification id, or 0 for an empty table."""
+        result = await self.session.execute(select(func.max(Notification.id)))
+        return result.scalar() or 0
+
+    async def count_by_status(self, status: str) -> int:
+        """Count notifications in a status from the trigger-maintained counter."""
+        counter = await self.session.get(NotificationCounter, status, populate_existing=True)
+        if counter is not None:
+            return counter.count
+        # No counter row yet (nothing in that status, or a database created
+        # before the triggers existed): fall back to an index-only count
+        query = select(func.count(Notification.id)).where(Notification.status == status)
+        return (await self.session.execute(query)).scalar() or 0
+
     async def mark_sent(
         self,
         notification_id: int,
@@ -51,6 +219,38 @@ class NotificationRepository:
             await self.session.refresh(notification)
         return notification
 
+    async def mark_sent_bulk(
+        self,
+        sent_at_by_id: dict[int, datetime | None],
+        chunk_size: int = 1000,
+    ) -> list[int]:
+        """
+        Mark many notifications as sent with set-based UPDATEs in one
+        transaction. Ids without an explicit sent_at get the current time.
+        Returns the ids that were updated.
+        """
+        now = datetime.now(UTC)
+        ids = list(sent_at_by_id)
+        updated: list[int] = []
+        for start in range(0, len(ids), chunk_size):
+            chunk = ids[start:start + chunk_size]
+            explicit = {i: sent_at_by_id[i] for i in chunk if sent_at_by_id[i] is not None}
+            sent_at = case(explicit, value=Notification.id, else_=now) if explicit else now
+            result = await self.session.execute(
+                update(Notification)
+                .where(Notification.id.in_(chunk))
+                .values(
+                    status=NotificationStatus.SENT.value,
+                    sent_at=sent_at,
+                    claim_token=None,
+                )
+                .returning(Notification.id)
+                .execution_options(synchronize_session=False)
+            )
+            updated.extend(result.scalars().all())
+        await self.session.commit()
+        return updated
+
     async def create_bulk(self, notifications: list[Notification]) -> list[Notification]:
         """Create multiple notifications."""
         self.session.add_all(notifications)
@@ -58,3 +258,187 @@ class NotificationRepository:
         for notification in notifications:
             await self.session.refresh(notification)
         return notifications
+
+    async def claim_pending(
+        self,
+        claim_token: str,
+        limit: int,
+        claim_timeout: timedelta,
+        lanes: dict[int, tuple[float, int]] | None = None,
+        digest_window: timedelta | None = None,
+    ) -> list[Notification]:
+        """
+        Atomically claim up to `limit` deliverable pending notifications.
+        Claims older than `claim_timeout` are considered abandoned.
+
+        Without `lanes` rows are claimed oldest first. With `lanes`, a map of
+        priority -> (weight, max rows), rows are picked by weighted fair
+        queuing: the k-th oldest row of a lane gets virtual time k / weight
+        and the `limit` smallest virtual times win, so each busy lane gets
+        its weighted share and idle lanes' shares go to the others. Lanes
+        missing from the map are not claimed.
+
+        With `digest_window`, rows are only deliverable once the window
+        their created_at falls in has closed, and every picked row brings
+        the rest of its (recipient, type, window) group with it, so a
+        digest is never split across batches (a batch may exceed `limit`
+        by the size of its last groups).
+        """
+        now = datetime.now(UTC)
+        claimable = (
+            Notification.status == NotificationStatus.PENDING.value,
+            or_(
+                Notification.claim_token.is_(None),
+                Notification.claimed_at < now - claim_timeout,
+            ),
+            or_(
+                Notification.next_attempt_at.is_(None),
+                Notification.next_attempt_at <= now,
+            ),
+        )
+        if digest_window is not None:
+            window = digest_window_index(digest_window)
+            window_seconds = digest_window.total_seconds()
+            claimable += ((window + 1) * window_seconds <= now.timestamp(),)
+        if lanes is None:
+            candidates = (
+                select(Notification.id)
+                .where(*claimable)
+                .order_by(Notification.created_at, Notification.id)
+                .limit(limit)
+                .scalar_subquery()
+            )
+        else:
+            candidates = self._fair_candidates(claimable, limit, lanes)
+            if candidates is None:
+                return []
+        claimed = Notification.id.in_(candidates)
+        if digest_window is not None:
+            group = (Notification.recipient_id, Notification.type, window)
+            claimed = tuple_(*group).in_(select(*group).where(claimed))
+        stmt = (
+            update(Notification)
+            .where(claimed, *claimable)
+            .values(claim_token=claim_token, claimed_at=now)
+            .returning(Notification)
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        notifications = list(result.scalars().all())
+        await self.session.commit()
+        return notifications
+
+    @staticmethod
+    def _fair_candidates(claimable, limit: int, lanes: dict[int, tuple[float, int]]):
+        """Ids chosen by weighted fair queuing; each lane reads at most its cap."""
+        ranked = []
+        for priority, (weight, max_rows) in sorted(lanes.items()):
+            if weight <= 0 or max_rows <= 0:
+                continue
+            # Per-lane LIMIT keeps each arm a short seek into the
+            # status/priority/created_at index, even with a deep backlog
+            lane = (
+                select(Notification.id, Notification.created_at)
+                .where(*claimable, Notification.priority == priority)
+                .order_by(Notification.created_at, Notification.id)
+                .limit(min(limit, max_rows))
+                .subquery()
+            )
+            rank = func.row_number().over(order_by=(lane.c.created_at, lane.c.id))
+            ranked.append(select(
+                lane.c.id,
+                (rank / float(weight)).label("virtual_time"),
+                literal(priority).label("priority"),
+            ))
+        if not ranked:
+            return None
+        merged = union_all(*ranked).subquery()
+        return (
+            select(merged.c.id)
+            .order_by(merged.c.virtual_time, merged.c.priority)
+            .limit(limit)
+            .scalar_subquery()
+        )
+
+    async def complete_claimed(
+        self,
+        claim_token: str,
+        sent_ids: list[int],
+        failures: list[dict],
+        sent_at: datetime | None = None,
+    ) -> None:
+        """
+        Record a delivery batch in one transaction: one UPDATE for every sent
+        id, plus a bulk by-primary-key UPDATE for failed ones. Rows no longer
+        held under `claim_token` are left alone.
+        """
+        if sent_ids:
+            await self.session.execute(
+                update(Notification)
+                .where(
+                    Notification.id.in_(sent_ids),
+                    Notification.claim_token == claim_token,
+                )
+                .values(
+                    status=NotificationStatus.SENT.value,
+                    sent_at=sent_at or datetime.now(UTC),
+                    claim_token=None,
+                    last_error=None,
+                )
+                .execution_options(synchronize_session=False)
+            )
+        if failures:
+            # Match on the token too: a row whose claim expired and was
+            # re-claimed by another dispatcher is no longer ours to settle
+            await self.session.execute(
+                update(Notification)
+                .where(Notification.claim_token == claim_token)
+                .execution_options(synchronize_session=None),
+                [{**failure, "claim_token": None} for failure in failures],
+            )
+        await self.session.commit()
+
+    async def get_sent_before(self, cutoff: datetime, limit: int) -> list[dict]:
+        """
+        Oldest sent notifications created before cutoff, as plain rows
+        (walks the status/created_at index; nothing enters the identity map).
+        """
+        query = (
+            select(
+                Notification.id,
+                Notification.type,
+                Notification.recipient_id,
+                Notification.subject,
+                Notification.message,
+                Notification.reference_id,
+                Notification.created_at,
+                Notification.sent_at,
+            )
+            .where(
+                Notification.status == NotificationStatus.SENT.value,
+                Notification.created_at < cutoff,
+            )
+            .order_by(Notification.created_at, Notification.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return [dict(row) for row in result.mappings()]
+
+    async def archive(self, rows: list[dict]) -> int:
+        """
+        Insert archive rows and delete their originals in one short
+        transaction. Returns the number of notifications deleted.
+        """
+        if not rows:
+            return 0
+        await self.session.execute(
+            sqlite_insert(NotificationArchive).values(rows).on_conflict_do_nothing()
+        )
+        result = await self.session.execute(
+            delete(Notification).where(
+                Notification.id.in_([row["id"] for row in rows]),
+                Notification.status == NotificationStatus.SENT.value,
+            )
+        )
+        await self.session.commit()
+        return result.rowcount
@@ -23,6 +23,12 @@ class OrderRepository:
         await self.session.refresh(order)
         return order
     
+    async def stage(self, order: Order) -> Order:
+        """Add a new order and flush it to get its ID, without committing."""
+        self.session.add(order)
+        await self.session.flush()
+        return order
+    
     async def get_by_id(self, order_id: int) -> Order | None:
         """Get order by ID with items eagerly loaded."""
         query = (
@@ -2,11 +2,15 @@
 Product Repository - Data Access Layer
 """
 
-from typing import List, Optional, Tuple
-from sqlalchemy import select, func
+from collections.abc import AsyncIterator
+
+from sqlalchemy import and_, case, func, literal_column, or_, select, true, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import Product
+from app.models import CatalogVersion, InventoryMovement, Product, products_fts
+from app.models.product_search import DESCRIPTION_WEIGHT, NAME_WEIGHT
+from app.repositories.inventory_repository import compacted_through
 
 
 class ProductRepository:
@@ -22,72 +26,223 @@ class ProductRepository:
         await self.session.refresh(product)
         return product
 
-    async def get_by_id(self, product_id: int) -> Optional[Product]:
-        """Get product by ID."""
-        query = select(Product).where(Product.id == product_id)
+    async def get_by_id(self, product_id: int) -> Product | None:
+        """Get product by ID (reloading current stock if already in the session)."""
+        query = (
+            select(Product)
+            .where(Product.id == product_id)
+            .execution_options(populate_existing=True)
+        )
         result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
-    async def get_all(
+    async def get_by_sku(self, sku: str) -> Product | None:
+        """Get product by SKU."""
+        result = await self.session.execute(select(Product).where(Product.sku == sku))
+        return result.scalar_one_or_none()
+
+    async def get_stock_by_sku(self, skus: list[str]) -> dict[str, tuple[int, int, int]]:
+        """(id, current stock, stock shards) of the products with these SKUs."""
+        result = await self.session.execute(
+            select(Product.sku, Product.id, Product.stock, Product.stock_shards)
+            .where(Product.sku.in_(skus))
+        )
+        return {sku: (product_id, stock, shards) for sku, product_id, stock, shards in result}
+
+    async def upsert_by_sku(self, rows: list[dict]) -> dict[str, int]:
+        """
+        Stage an insert of many products (dicts of name, description,
+        price_cents, category and sku), updating those fields in place for SKUs that
+        already exist. Returns the product id of each SKU.
+        """
+        stmt = sqlite_insert(Product)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={
+                "name": stmt.excluded.name,
+                "description": stmt.excluded.description,
+                "price_cents": stmt.excluded.price_cents,
+                "category": stmt.excluded.category,
+            },
+        ).returning(Product.sku, Product.id)
+        result = await self.session.execute(stmt, rows)
+        return {sku: product_id for sku, product_id in result}
+
+    async def get_page(
         self,
-        category: Optional[str] = None,
-        page: int = 1,
-        page_size: int = 20
-    ) -> Tuple[List[Product], int]:
-        """Get products with optional filtering and pagination."""
-        conditions = []
+        category: str | None = None,
+        limit: int = 20,
+        after: tuple[str, int] | None = None,
+    ) -> list[Product]:
+        """
+        Products in (name, id) order after the `after` key, seeking
+        idx_product_category_name_id (or idx_product_name_id unfiltered).
+        """
+        query = select(Product).order_by(Product.name, Product.id).limit(limit)
         if category:
-            conditions.append(Product.category == category)
+            query = query.where(Product.category == category)
+        if after is not None:
+            query = query.where(tuple_(Product.name, Product.id) > after)
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
 
-        # Count total
-        count_query = select(func.count(Product.id))
-        if conditions:
-            count_query = count_query.where(*conditions)
-        total = await self.session.execute(count_query)
-        total = total.scalar() or 0
+    async def search(self, match: str, limit: int = 20) -> list[Product]:
+        """Products matching an FTS5 MATCH expression, best bm25 rank first."""
+        index = literal_column("products_fts")
+        query = (
+            select(Product)
+            .join(products_fts, products_fts.c.rowid == Product.id)
+            .where(index.op("MATCH")(match))
+            .order_by(func.bm25(index, NAME_WEIGHT, DESCRIPTION_WEIGHT))
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def get_names_after(self, after_id: int, limit: int) -> list[tuple[int, str]]:
+        """(id, name) of products with id above `after_id`, in id order."""
+        result = await self.session.execute(
+            select(Product.id, Product.name)
+            .where(Product.id > after_id)
+            .order_by(Product.id)
+            .limit(limit)
+        )
+        return [tuple(row) for row in result.all()]
 
-        # Get paginated results
-        offset = (page - 1) * page_size
+    async def stream_all(self, batch_size: int = 5000) -> AsyncIterator[Product]:
+        """Stream every product ordered by id without loading them all at once."""
         query = (
             select(Product)
-            .order_by(Product.name)
-            .offset(offset)
-            .limit(page_size)
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
         )
-        if conditions:
-            query = query.where(*conditions)
+        result = await self.session.stream_scalars(query)
+        async for product in result:
+            yield product
 
+    async def count(self, category: str | None = None) -> int:
+        """Number of products, optionally in one category."""
+        query = select(func.count(Product.id))
+        if category:
+            query = query.where(Product.category == category)
         result = await self.session.execute(query)
-        products = list(result.scalars().all())
+        return result.scalar() or 0
 
-        return products, total
+    async def stream_by_name(self, batch_size: int = 5000) -> AsyncIterator[Product]:
+        """Stream every product in (name, id) order."""
+        query = (
+            select(Product)
+            .order_by(Product.name, Product.id)
+            .execution_options(yield_per=batch_size, populate_existing=True)
+        )
+        result = await self.session.stream_scalars(query)
+        async for product in result:
+            yield product
+
+    async def get_catalog_version(self) -> int:
+        """Current catalog version (0 before the first write)."""
+        result = await self.session.execute(
+            select(CatalogVersion.version).where(CatalogVersion.id == 1)
+        )
+        return result.scalar() or 0
+
+    async def bump_catalog_version(self) -> int:
+        """Stage a catalog version increment; returns the version it will commit."""
+        stmt = sqlite_insert(CatalogVersion).values(id=1, version=1)
+        result = await self.session.execute(stmt.on_conflict_do_update(
+            index_elements=[CatalogVersion.id],
+            set_={"version": CatalogVersion.version + 1},
+        ).returning(CatalogVersion.version))
+        return result.scalar_one()
+
+    async def get_facet_counts(
+        self, low_stock_threshold: int
+    ) -> tuple[int, list[tuple[str | None, int, int, int]]]:
+        """
+        Catalog version and (category, count, in stock, low stock) per
+        category, read in one statement so both come from the same snapshot.
+        """
+        version = select(
+            func.coalesce(
+                select(CatalogVersion.version)
+                .where(CatalogVersion.id == 1)
+                .scalar_subquery(),
+                0,
+            ).label("version")
+        ).subquery()
+        stocks = select(
+            Product.id, Product.category, Product.stock.label("stock")
+        ).subquery()
+        in_stock = stocks.c.stock > 0
+        low_stock = and_(in_stock, stocks.c.stock < low_stock_threshold)
+        query = (
+            select(
+                version.c.version,
+                stocks.c.category,
+                func.count(stocks.c.id),
+                func.coalesce(func.sum(case((in_stock, 1), else_=0)), 0),
+                func.coalesce(func.sum(case((low_stock, 1), else_=0)), 0),
+            )
+            # The outer join keeps the version row for an empty catalog
+            .select_from(version.outerjoin(stocks, true()))
+            .group_by(version.c.version, stocks.c.category)
+        )
+        rows = (await self.session.execute(query)).all()
+        return rows[0][0], [tuple(row[1:]) for row in rows if row[2]]
 
-    async def get_low_stock(self, threshold: int = 10) -> list[Product]:
-        """Get products with low stock."""
+    async def get_many(self, product_ids: list[int]) -> list[Product]:
+        """Load products by id with fresh stock (unknown ids are skipped)."""
         query = (
             select(Product)
-            .where(Product.stock < threshold)
-            .order_by(Product.stock)
+            .where(Product.id.in_(product_ids))
+            .execution_options(populate_existing=True)
         )
         result = await self.session.execute(query)
         return list(result.scalars().all())
 
-    async def update_stock(self, product_id: int, new_stock: int) -> Product | None:
-        """Update product stock."""
-        product = await self.get_by_id(product_id)
-        if product:
-            product.stock = new_stock
-            await self.session.commit()
-            await self.session.refresh(product)
-        return product
+    async def get_stocks(self, product_ids: list[int]) -> dict[int, int]:
+        """Current stock by product id, without loading the products."""
+        result = await self.session.execute(
+            select(Product.id, Product.stock).where(Product.id.in_(product_ids))
+        )
+        return {product_id: stock for product_id, stock in result}
 
-    async def add_stock(self, product_id: int, quantity: int) -> Product | None:
-        """Add to product stock."""
-        product = await self.get_by_id(product_id)
-        if product:
-            product.stock += quantity
-            await self.session.commit()
-            await self.session.refresh(product)
+    async def get_low_stock(
+        self,
+        threshold: int = 10,
+        limit: int = 100,
+        after: tuple[int, int] | None = None,
+    ) -> list[Product]:
+        """
+        Get a page of products with stock below threshold in (stock, id)
+        order. `after` is the (stock, id) of the previous page's last row.
+
+        Candidates are products whose snapshot is low (a range scan of
+        idx_product_stock_id) plus products with movements since the last
+        compaction; only those have their current stock computed.
+        """
+        recently_moved = (
+            select(InventoryMovement.product_id)
+            .where(InventoryMovement.id > compacted_through())
+        )
+        query = (
+            select(Product)
+            .where(
+                or_(Product.stock_snapshot < threshold, Product.id.in_(recently_moved)),
+                Product.stock < threshold,
+            )
+            .order_by(Product.stock, Product.id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(tuple_(Product.stock, Product.id) > tuple_(*after))
+        result = await self.session.execute(query)
+        return list(result.scalars().all())
+
+    async def stage(self, product: Product) -> Product:
+        """Add a product to the current transaction and flush it for its id."""
+        self.session.add(product)
+        await self.session.flush()
         return product
 
     async def update(self, product: Product) -> Product:
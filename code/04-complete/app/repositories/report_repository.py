@@ -0,0 +1,190 @@
+"""Report Repository - Data Access Layer for sales rollups."""
+
+from datetime import date
+
+from sqlalchemy import Date, delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import (
+    Order,
+    OrderItem,
+    OrderStatus,
+    SalesDailyProduct,
+    SalesDailyStatus,
+)
+
+
+def _bucket(day_column, granularity: str):
+    """SQL expression mapping a rollup day onto its period start."""
+    if granularity == "week":
+        # Monday of the ISO week containing the day
+        return func.date(day_column, "weekday 0", "-6 days", type_=Date)
+    if granularity == "month":
+        return func.date(day_column, "start of month", type_=Date)
+    return func.date(day_column, type_=Date)
+
+
+class ReportRepository:
+    """Repository for sales rollup tables.
+
+    Delta methods only stage statements on the session; the caller's
+    commit makes them durable together with the order change.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def add_status_delta(
+        self,
+        day: date,
+        status: str,
+        revenue_cents: int,
+        order_count: int,
+        units: int,
+    ) -> None:
+        """Add a delta to the day x status rollup row."""
+        stmt = sqlite_insert(SalesDailyStatus).values(
+            day=day,
+            status=status,
+            revenue_cents=revenue_cents,
+            order_count=order_count,
+            units=units,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SalesDailyStatus.day, SalesDailyStatus.status],
+            set_={
+                "revenue_cents": SalesDailyStatus.revenue_cents + stmt.excluded.revenue_cents,
+                "order_count": SalesDailyStatus.order_count + stmt.excluded.order_count,
+                "units": SalesDailyStatus.units + stmt.excluded.units,
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def add_product_deltas(self, day: date, deltas: list[dict]) -> None:
+        """
+        Add deltas to the day x product rollup rows.
+        Each delta has product_id, revenue_cents, order_count and units.
+        """
+        if not deltas:
+            return
+        stmt = sqlite_insert(SalesDailyProduct)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[SalesDailyProduct.day, SalesDailyProduct.product_id],
+            set_={
+                "revenue_cents": SalesDailyProduct.revenue_cents + stmt.excluded.revenue_cents,
+                "order_count": SalesDailyProduct.order_count + stmt.excluded.order_count,
+                "units": SalesDailyProduct.units + stmt.excluded.units,
+            },
+        )
+        await self.session.execute(stmt, [{"day": day, **delta} for delta in deltas])
+
+    async def get_status_rollups(
+        self,
+        date_from: date,
+        date_to: date,
+        granularity: str = "day",
+    ) -> list[Row]:
+        """
+        Get rollups grouped by period and status.
+        Returns rows of (period, status, revenue_cents, order_count, units).
+        """
+        period = _bucket(SalesDailyStatus.day, granularity).label("period")
+        query = (
+            select(
+                period,
+                SalesDailyStatus.status,
+                func.sum(SalesDailyStatus.revenue_cents).label("revenue_cents"),
+                func.sum(SalesDailyStatus.order_count).label("order_count"),
+                func.sum(SalesDailyStatus.units).label("units"),
+            )
+            .where(SalesDailyStatus.day.between(date_from, date_to))
+            .group_by(period, SalesDailyStatus.status)
+            .order_by(period, SalesDailyStatus.status)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def get_top_products(
+        self,
+        date_from: date,
+        date_to: date,
+        limit: int = 10,
+    ) -> list[Row]:
+        """
+        Get products with the highest revenue in the range.
+        Returns rows of (product_id, revenue_cents, order_count, units).
+        """
+        revenue = func.sum(SalesDailyProduct.revenue_cents).label("revenue_cents")
+        query = (
+            select(
+                SalesDailyProduct.product_id,
+                revenue,
+                func.sum(SalesDailyProduct.order_count).label("order_count"),
+                func.sum(SalesDailyProduct.units).label("units"),
+            )
+            .where(SalesDailyProduct.day.between(date_from, date_to))
+            .group_by(SalesDailyProduct.product_id)
+            .order_by(revenue.desc(), SalesDailyProduct.product_id)
+            .limit(limit)
+        )
+        result = await self.session.execute(query)
+        return list(result.all())
+
+    async def rebuild(self) -> tuple[int, int]:
+        """
+        Recompute all rollups from orders and order_items.
+        Used to backfill existing data; returns (status_rows, product_rows).
+        """
+        await self.session.execute(delete(SalesDailyStatus))
+        await self.session.execute(delete(SalesDailyProduct))
+
+        order_day = func.date(Order.created_at, type_=Date)
+        units = (
+            select(
+                OrderItem.order_id,
+                func.sum(OrderItem.quantity).label("units"),
+            )
+            .group_by(OrderItem.order_id)
+            .subquery()
+        )
+        status_rows = (
+            select(
+                order_day,
+                Order.status,
+                func.sum(Order.total_cents),
+                func.count(Order.id),
+                func.coalesce(func.sum(units.c.units), 0),
+            )
+            .outerjoin(units, units.c.order_id == Order.id)
+            .group_by(order_day, Order.status)
+        )
+        status_result = await self.session.execute(
+            insert(SalesDailyStatus).from_select(
+                ["day", "status", "revenue_cents", "order_count", "units"],
+                status_rows,
+            )
+        )
+
+        product_rows = (
+            select(
+                order_day,
+                OrderItem.product_id,
+                func.sum(OrderItem.unit_price_cents * OrderItem.quantity),
+                func.count(func.distinct(OrderItem.order_id)),
+                func.sum(OrderItem.quantity),
+            )
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.status != OrderStatus.CANCELLED.value)
+            .group_by(order_day, OrderItem.product_id)
+        )
+        product_result = await self.session.execute(
+            insert(SalesDailyProduct).from_select(
+                ["day", "product_id", "revenue_cents", "order_count", "units"],
+                product_rows,
+            )
+        )
+
+        await self.session.commit()
+        return status_result.rowcount, product_result.rowcount
@@ -0,0 +1,80 @@
+"""Stock Shard Repository - Data Access Layer for sharded stock counters."""
+
+import random
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ProductStockShard
+
+
+class StockShardRepository:
+    """Repository for ProductStockShard database operations (stage only, no commits)."""
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def reset(self, product_id: int, shards: int, total: int) -> None:
+        """Replace a product's shards with `shards` rows splitting `total` evenly."""
+        await self.session.execute(
+            delete(ProductStockShard).where(ProductStockShard.product_id == product_id)
+        )
+        if shards:
+            base, extra = divmod(total, shards)
+            await self.session.execute(ProductStockShard.__table__.insert(), [
+                {"product_id": product_id, "shard": i, "stock": base + (i < extra)}
+                for i in range(shards)
+            ])
+
+    async def add(self, product_id: int, shards: int, quantity: int) -> None:
+        """Spread a non-negative quantity over the shards in one UPDATE."""
+        base, extra = divmod(quantity, shards)
+        await self.session.execute(
+            update(ProductStockShard)
+            .where(ProductStockShard.product_id == product_id)
+            .values(stock=ProductStockShard.stock + base + (ProductStockShard.shard < extra))
+        )
+
+    async def take(self, product_id: int, shards: int, quantity: int) -> bool:
+        """
+        Decrement `quantity` without taking any shard below zero.
+
+        Shards are tried in random order with a conditional UPDATE, so
+        concurrent buyers spread across rows. If no single shard holds
+        enough, the quantity is gathered across shards (still conditional
+        per shard). Returns False if it cannot be covered; any partial take
+        is left for the caller to roll back.
+        """
+        order = random.sample(range(shards), shards)
+        for shard in order:
+            if await self._take_from(product_id, shard, quantity):
+                return True
+
+        result = await self.session.execute(
+            select(ProductStockShard.shard, ProductStockShard.stock)
+            .where(ProductStockShard.product_id == product_id, ProductStockShard.stock > 0)
+        )
+        stocks = dict(result.all())
+        if sum(stocks.values()) < quantity:
+            return False
+        remaining = quantity
+        for shard in order:
+            amount = min(stocks.get(shard, 0), remaining)
+            if amount and await self._take_from(product_id, shard, amount):
+                remaining -= amount
+                if not remaining:
+                    return True
+        # Other buyers drained shards between the read and the takes
+        return False
+
+    async def _take_from(self, product_id: int, shard: int, quantity: int) -> bool:
+        result = await self.session.execute(
+            update(ProductStockShard)
+            .where(
+                ProductStockShard.product_id == product_id,
+                ProductStockShard.shard == shard,
+                ProductStockShard.stock >= quantity,
+            )
+            .values(stock=ProductStockShard.stock - quantity)
+        )
+        return result.rowcount == 1
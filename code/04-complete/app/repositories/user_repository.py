@@ -1,6 +1,6 @@
 """User Repository - Data Access Layer."""
 
-from sqlalchemy import select
+from sqlalchemy import exists, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import User
@@ -32,6 +32,13 @@ class UserRepository:
         return result.scalar_one_or_none()
 
     async def has_user(self, user_id: int) -> bool:
-        """Check if user exists."""
-        user = await self.get_by_id(user_id)
-        return user is not None
+        """Check if user exists (SELECT EXISTS; no row or relationship loading)."""
+        result = await self.session.execute(select(exists().where(User.id == user_id)))
+        return bool(result.scalar())
+
+    async def has_users(self, user_ids: list[int]) -> set[int]:
+        """The subset of `user_ids` that exist, from the primary key index."""
+        if not user_ids:
+            return set()
+        result = await self.session.execute(select(User.id).where(User.id.in_(user_ids)))
+        return set(result.scalars().all())
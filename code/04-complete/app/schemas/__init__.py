@@ -17,17 +17,44 @@ from app.schemas.user import (
 from app.schemas.product import (
     ProductCreate,
     ProductResponse,
+    ProductPage,
+    ProductImportRow,
+    ProductImportError,
+    ProductImportResult,
+    CategoryFacet,
+    ProductFacets,
     ProductStockUpdate,
+    StockShardsUpdate,
+    StockHoldCreate,
+    StockHoldResponse,
     LowStockItem,
     BulkRestockItem,
     BulkRestockRequest,
     BulkRestockResponse,
+    InventoryMovementResponse,
+    InventoryHistoryResponse,
 )
 from app.schemas.notification import (
     NotificationResponse,
     NotificationMarkSent,
+    NotificationSentItem,
+    NotificationBulkMarkSent,
+    NotificationBulkMarkSentResponse,
     PendingNotificationsResponse,
 )
+from app.schemas.health import (
+    PoolStatus,
+    DatabaseStatus,
+    ReadinessResponse,
+)
+from app.schemas.report import (
+    ReportGranularity,
+    SalesStatusBreakdown,
+    SalesPeriod,
+    ProductSales,
+    SalesReport,
+    SalesRollupRebuildResponse,
+)
 
 __all__ = [
     # Order
@@ -46,13 +73,38 @@ __all__ = [
     # Product
     "ProductCreate",
     "ProductResponse",
+    "ProductPage",
+    "ProductImportRow",
+    "ProductImportError",
+    "ProductImportResult",
+    "CategoryFacet",
+    "ProductFacets",
     "ProductStockUpdate",
+    "StockShardsUpdate",
+    "StockHoldCreate",
+    "StockHoldResponse",
     "LowStockItem",
     "BulkRestockItem",
     "BulkRestockRequest",
     "BulkRestockResponse",
+    "InventoryMovementResponse",
+    "InventoryHistoryResponse",
     # Notification
     "NotificationResponse",
     "NotificationMarkSent",
+    "NotificationSentItem",
+    "NotificationBulkMarkSent",
+    "NotificationBulkMarkSentResponse",
     "PendingNotificationsResponse",
+    # Health
+    "PoolStatus",
+    "DatabaseStatus",
+    "ReadinessResponse",
+    # Report
+    "ReportGranularity",
+    "SalesStatusBreakdown",
+    "SalesPeriod",
+    "ProductSales",
+    "SalesReport",
+    "SalesRollupRebuildResponse",
 ]
@@ -0,0 +1,33 @@
+"""
+Pydantic Schemas for Health API
+"""
+
+from pydantic import BaseModel
+
+
+class PoolStatus(BaseModel):
+    """Connection pool counters."""
+    size: int | None
+    checked_out: int | None
+    overflow: int | None
+    max_overflow: int | None
+    exhausted: bool
+
+
+class DatabaseStatus(BaseModel):
+    """Database round-trip and write contention signals."""
+    reachable: bool
+    last_latency_ms: float | None
+    last_success_age_seconds: float | None
+    writer_queue_depth: int
+    lock_wait_max_ms: float
+    lock_wait_total_ms: float
+    last_error: str | None
+
+
+class ReadinessResponse(BaseModel):
+    """Response schema for the readiness check."""
+    status: str
+    service: str
+    pool: PoolStatus
+    database: DatabaseStatus
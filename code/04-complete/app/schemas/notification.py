@@ -20,6 +20,8 @@ class NotificationResponse(BaseModel):
     reference_id: int | None
     created_at: datetime
     sent_at: datetime | None
+    occurrences: int = 1
+    lane: str
 
 
 class NotificationMarkSent(BaseModel):
@@ -27,7 +29,27 @@ class NotificationMarkSent(BaseModel):
     sent_at: datetime | None = Field(None, description="When the notification was sent")
 
 
+class NotificationSentItem(BaseModel):
+    """Single acknowledgement in a bulk mark-sent request."""
+    id: int = Field(..., gt=0, description="Notification ID")
+    sent_at: datetime | None = Field(None, description="When it was sent (default: now)")
+
+
+class NotificationBulkMarkSent(BaseModel):
+    """Request schema for marking many notifications as sent."""
+    items: list[NotificationSentItem] = Field(
+        ..., min_length=1, max_length=10000, description="Notifications to acknowledge"
+    )
+
+
+class NotificationBulkMarkSentResponse(BaseModel):
+    """Response schema for bulk mark-sent."""
+    updated_count: int
+    not_found_ids: list[int]
+
+
 class PendingNotificationsResponse(BaseModel):
-    """Response schema for pending notifications."""
+    """Response schema for a page of pending notifications."""
     items: list[NotificationResponse]
     total: int
+    next_cursor: str | None = None
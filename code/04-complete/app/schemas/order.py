@@ -7,7 +7,9 @@ from datetime import datetime
 from decimal import Decimal
 from enum import Enum
 
-from pydantic import BaseModel, Field, ConfigDict, computed_field
+from pydantic import AliasChoices, BaseModel, Field, ConfigDict, computed_field
+
+from app.core.money import CentsDecimal
 
 
 class OrderStatus(str, Enum):
@@ -42,7 +44,9 @@ class OrderItemResponse(BaseModel):
     product_id: int
     product_name: str
     quantity: int
-    unit_price: Decimal
+    unit_price: CentsDecimal = Field(
+        validation_alias=AliasChoices("unit_price_cents", "unit_price")
+    )
     
     @computed_field
     @property
@@ -58,6 +62,10 @@ class OrderCreate(BaseModel):
     shipping_address: str | None = Field(None, max_length=500)
     notes: str | None = Field(None, max_length=1000)
     items: list[OrderItemCreate] = Field(..., min_length=1, description="Order items")
+    hold_ids: list[int] = Field(
+        default_factory=list, max_length=100,
+        description="Stock holds (POST /inventory/holds) this order consumes",
+    )
     
     model_config = ConfigDict(
         json_schema_extra={
@@ -94,7 +102,7 @@ class OrderResponse(BaseModel):
     id: int
     user_id: int
     status: str
-    total: Decimal
+    total: CentsDecimal = Field(validation_alias=AliasChoices("total_cents", "total"))
     shipping_address: str | None
     notes: str | None
     created_at: datetime
@@ -114,7 +122,7 @@ class OrderSummary(BaseModel):
     id: int
     user_id: int
     status: str
-    total: Decimal
+    total: CentsDecimal = Field(validation_alias=AliasChoices("total_cents", "total"))
     created_at: datetime
 
 
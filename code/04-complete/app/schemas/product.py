@@ -5,16 +5,19 @@ Pydantic Schemas for Product API
 from datetime import datetime
 from decimal import Decimal
 
-from pydantic import BaseModel, ConfigDict, Field, computed_field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field, computed_field
+
+from app.core.money import CentsDecimal
 
 
 class ProductCreate(BaseModel):
     """Request schema for creating a product."""
     name: str = Field(..., min_length=1, max_length=200, description="Product name")
     description: str | None = Field(None, max_length=2000, description="Product description")
-    price: Decimal = Field(..., gt=0, description="Product price")
+    price: Decimal = Field(..., gt=0, decimal_places=2, description="Product price")
     stock: int = Field(0, ge=0, description="Initial stock quantity")
     category: str | None = Field(None, max_length=50, description="Product category")
+    sku: str | None = Field(None, min_length=1, max_length=64, description="Supplier SKU (unique)")
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -29,6 +32,27 @@ class ProductCreate(BaseModel):
     )
 
 
+class ProductImportRow(ProductCreate):
+    """One row of a bulk import; the SKU is required as the upsert key."""
+    sku: str = Field(..., min_length=1, max_length=64, description="Supplier SKU (unique)")
+
+
+class ProductImportError(BaseModel):
+    """Validation errors for one import row."""
+    line: int
+    errors: list[str]
+
+
+class ProductImportResult(BaseModel):
+    """Response schema for a bulk product import."""
+    received: int
+    inserted: int
+    updated: int
+    failed: int
+    errors: list[ProductImportError]
+    errors_truncated: bool = False
+
+
 class ProductResponse(BaseModel):
     """Response schema for product."""
     model_config = ConfigDict(from_attributes=True)
@@ -36,7 +60,7 @@ class ProductResponse(BaseModel):
     id: int
     name: str
     description: str | None
-    price: Decimal
+    price: CentsDecimal = Field(validation_alias=AliasChoices("price_cents", "price"))
     stock: int
     category: str | None
     created_at: datetime
@@ -48,11 +72,61 @@ class ProductResponse(BaseModel):
         return self.stock < 10
 
 
+class ProductPage(BaseModel):
+    """Response schema for a page of products in (name, id) order."""
+    items: list[ProductResponse]
+    total: int
+    next_cursor: str | None = None
+
+
+class CategoryFacet(BaseModel):
+    """Product counts for one category (None for uncategorized)."""
+    category: str | None
+    count: int
+    in_stock: int
+    low_stock: int
+
+
+class ProductFacets(BaseModel):
+    """Response schema for catalog facet counts."""
+    categories: list[CategoryFacet]
+    total: int
+    in_stock: int
+    low_stock: int
+    out_of_stock: int
+
+
 class ProductStockUpdate(BaseModel):
     """Request schema for updating product stock."""
     stock: int = Field(..., ge=0, description="New stock quantity")
 
 
+class StockShardsUpdate(BaseModel):
+    """Request schema for sharding a hot product's stock counter."""
+    shards: int = Field(..., ge=0, le=64, description="Number of stock shards (0 disables)")
+
+
+class StockHoldCreate(BaseModel):
+    """Request schema for holding stock during checkout."""
+    product_id: int = Field(..., gt=0, description="Product ID")
+    quantity: int = Field(..., gt=0, le=100, description="Units to hold")
+    ttl_seconds: int | None = Field(
+        None, ge=1, le=3600, description="Hold lifetime (default STOCK_HOLD_TTL_SECONDS)"
+    )
+
+
+class StockHoldResponse(BaseModel):
+    """Response schema for a stock hold."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_id: int
+    quantity: int
+    status: str
+    expires_at: datetime
+    order_id: int | None
+
+
 class LowStockItem(BaseModel):
     """Response schema for low stock items."""
     model_config = ConfigDict(from_attributes=True)
@@ -78,3 +152,21 @@ class BulkRestockResponse(BaseModel):
     """Response schema for bulk restock."""
     updated_count: int
     items: list[ProductResponse]
+
+
+class InventoryMovementResponse(BaseModel):
+    """Response schema for one stock ledger entry."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    product_id: int
+    delta: int
+    reason: str
+    reference_id: int | None
+    created_at: datetime
+
+
+class InventoryHistoryResponse(BaseModel):
+    """Response schema for a page of stock history, newest first."""
+    items: list[InventoryMovementResponse]
+    next_cursor: str | None = None
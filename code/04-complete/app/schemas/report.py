@@ -0,0 +1,56 @@
+"""
+Pydantic Schemas for Reports API
+"""
+
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+
+from pydantic import BaseModel
+
+
+class ReportGranularity(str, Enum):
+    """Period size for sales reports."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class SalesStatusBreakdown(BaseModel):
+    """Sales figures for one order status within a period."""
+    status: str
+    revenue: Decimal
+    order_count: int
+    units: int
+
+
+class SalesPeriod(BaseModel):
+    """Sales figures for one period (cancelled orders excluded from totals)."""
+    period_start: date
+    revenue: Decimal
+    order_count: int
+    units: int
+    by_status: list[SalesStatusBreakdown]
+
+
+class ProductSales(BaseModel):
+    """Sales figures for one product over the report range."""
+    product_id: int
+    revenue: Decimal
+    order_count: int
+    units: int
+
+
+class SalesReport(BaseModel):
+    """Response schema for the sales report."""
+    date_from: date
+    date_to: date
+    granularity: ReportGranularity
+    periods: list[SalesPeriod]
+    top_products: list[ProductSales]
+
+
+class SalesRollupRebuildResponse(BaseModel):
+    """Response schema for a rollup rebuild."""
+    status_rows: int
+    product_rows: int
@@ -0,0 +1,125 @@
+"""Production server entry point.
+
+Sizes uvicorn worker processes from the CPUs actually available to the
+container and the database backend, creates the schema (and the shared
+catalog snapshot, when enabled) once in the parent process, then forks
+the workers.
+
+Run: python -m app.serve
+"""
+
+import asyncio
+import atexit
+import importlib.util
+import math
+import os
+from pathlib import Path
+
+import uvicorn
+
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.config import settings
+from app.core.database import (
+    DATABASE_URL,
+    async_session,
+    engine,
+    init_models,
+    is_sqlite,
+)
+
+
+def available_cpus() -> int:
+    """CPUs usable by this process, honouring affinity and cgroup quotas."""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    quota = _cgroup_cpu_quota()
+    if quota is not None:
+        cpus = min(cpus, max(1, math.ceil(quota)))
+    return cpus
+
+
+def _cgroup_cpu_quota() -> float | None:
+    """CPU limit from cgroup v2 (cpu.max) or v1 (cfs quota), if any."""
+    cpu_max = Path("/sys/fs/cgroup/cpu.max")
+    try:
+        if cpu_max.exists():
+            quota, period = cpu_max.read_text().split()[:2]
+            if quota != "max":
+                return int(quota) / int(period)
+            return None
+        quota_us = Path("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+        period_us = Path("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+        if quota_us.exists() and period_us.exists():
+            quota = int(quota_us.read_text())
+            if quota > 0:
+                return quota / int(period_us.read_text())
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def worker_count(
+    cpus: int,
+    database_url: str = DATABASE_URL,
+    requested: int | None = settings.web_concurrency,
+    max_workers: int = settings.max_workers,
+) -> int:
+    """
+    Number of worker processes to run.
+
+    - WEB_CONCURRENCY wins when set.
+    - In-memory SQLite is per-process, so it gets exactly one worker.
+    - File SQLite allows a single writer; readers scale with WAL, so run
+      one worker per CPU rather than oversubscribing writers.
+    - Server databases get the usual 2 x CPUs + 1.
+    """
+    if requested:
+        return max(1, requested)
+    if is_sqlite(database_url):
+        if ":memory:" in database_url or database_url.rstrip("/").endswith(":"):
+            return 1
+        return max(1, min(cpus, max_workers))
+    return max(1, min(2 * cpus + 1, max_workers))
+
+
+def _pick(module: str, fallback: str) -> str:
+    return module if importlib.util.find_spec(module) is not None else fallback
+
+
+async def _prepare_database() -> None:
+    import app.models  # noqa: F401 - register tables on Base.metadata
+
+    await init_models()
+    if settings.catalog_snapshot_enabled:
+        from app.services.product_service import refresh_catalog_snapshot
+
+        await refresh_catalog_snapshot(async_session)
+        atexit.register(catalog_snapshot.unlink)
+    # Workers must not inherit the parent's pooled connections
+    await engine.dispose()
+
+
+def main() -> None:
+    """Create the schema once, then start the uvicorn workers."""
+    asyncio.run(_prepare_database())
+    os.environ["SKIP_SCHEMA_INIT"] = "true"
+
+    workers = worker_count(available_cpus())
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=workers,
+        loop=_pick("uvloop", "asyncio"),
+        http=_pick("httptools", "h11"),
+        timeout_keep_alive=settings.keep_alive_seconds,
+        backlog=settings.backlog,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,23 @@
 from app.services.order_service import OrderService
 from app.services.user_service import UserService
 from app.services.product_service import ProductService
+from app.services.product_import_service import ProductImportService
+from app.services.inventory_compaction import InventoryCompactionService
 from app.services.notification_service import NotificationService
+from app.services.report_service import ReportService
+from app.services.notification_dispatcher import NotificationDispatcher
+from app.services.notification_retention import NotificationRetention
+from app.services.notification_stream import NotificationStream
 
 __all__ = [
     "OrderService",
     "UserService",
     "ProductService",
+    "ProductImportService",
+    "InventoryCompactionService",
     "NotificationService",
+    "ReportService",
+    "NotificationDispatcher",
+    "NotificationRetention",
+    "NotificationStream",
 ]
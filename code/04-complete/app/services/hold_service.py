@@ -0,0 +1,163 @@
+"""Stock Hold Service - time-limited stock reservations for checkout.
+
+Creating a hold takes stock through the ledger (or a product's shards), so
+held units cannot be sold twice. Orders consume holds; released or expired
+holds give their stock back.
+
+Expiry is driven by a min-heap of (expires_at, hold_id) per process: the
+sweeper sleeps until the earliest local hold is due (or the sweep interval
+passes), then expires every due hold in the database in batches through
+the (status, expires_at) index. The database query is the source of truth,
+so holds created by other workers or before a restart still expire; heap
+entries for holds that were consumed first are simply skipped.
+"""
+
+import asyncio
+import heapq
+import logging
+import time
+from datetime import UTC, datetime, timedelta
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.exceptions import StockHoldNotFoundError
+from app.models import MovementReason, StockHold
+from app.repositories.hold_repository import StockHoldRepository
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+
+logger = logging.getLogger(__name__)
+
+
+class HoldExpiryQueue:
+    """Min-heap of hold expiry times: O(log n) push and pop."""
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[float, int]] = []
+        self._changed = asyncio.Event()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, expires_at: datetime, hold_id: int) -> None:
+        entry = (expires_at.timestamp(), hold_id)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] == entry:
+            # New earliest expiry: wake the sweeper so it can sleep less
+            self._changed.set()
+
+    def pop_due(self, now: float | None = None) -> list[int]:
+        """Remove and return the ids of holds due by `now`."""
+        now = time.time() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[1])
+        return due
+
+    def clear(self) -> None:
+        self._heap.clear()
+
+    async def wait(self, max_wait: float) -> None:
+        """Sleep until the earliest hold is due or `max_wait` seconds pass."""
+        deadline = time.time() + max_wait
+        while True:
+            wake_at = min(deadline, self._heap[0][0]) if self._heap else deadline
+            delay = wake_at - time.time()
+            if delay <= 0:
+                return
+            self._changed.clear()
+            try:
+                await asyncio.wait_for(self._changed.wait(), delay)
+            except TimeoutError:
+                return
+
+
+hold_expiry_queue = HoldExpiryQueue()
+
+
+class HoldService:
+    """Service layer for stock holds."""
+
+    def __init__(
+        self,
+        repository: StockHoldRepository,
+        products: ProductService | None = None,
+        queue: HoldExpiryQueue | None = None,
+    ) -> None:
+        self.repository = repository
+        self.products = products or ProductService(ProductRepository(repository.session))
+        self.queue = queue if queue is not None else hold_expiry_queue
+
+    async def create_hold(
+        self,
+        product_id: int,
+        quantity: int,
+        ttl_seconds: int | None = None,
+    ) -> StockHold:
+        """
+        Hold stock for `ttl_seconds` (default STOCK_HOLD_TTL_SECONDS).
+        Raises ProductNotFoundError or InsufficientStockError.
+        """
+        ttl = timedelta(seconds=ttl_seconds or settings.stock_hold_ttl_seconds)
+        hold = StockHold(
+            product_id=product_id,
+            quantity=quantity,
+            expires_at=datetime.now(UTC) + ttl,
+        )
+        await self.repository.stage(hold)
+        try:
+            await self.products.stage_take_stock(
+                product_id, quantity, MovementReason.HOLD, hold.id
+            )
+        except Exception:
+            await self.repository.session.rollback()
+            raise
+        await self.repository.commit()
+        self.queue.push(hold.expires_at, hold.id)
+        return hold
+
+    async def release_hold(self, hold_id: int) -> StockHold:
+        """Give an active hold's stock back before it expires."""
+        hold = await self.repository.release(hold_id)
+        if hold is None:
+            await self.repository.session.rollback()
+            raise StockHoldNotFoundError(hold_id)
+        await self.products.stage_return_stock(
+            [(hold.product_id, hold.quantity, hold.id)], MovementReason.HOLD_RELEASE
+        )
+        await self.repository.commit()
+        return hold
+
+    async def expire_due(self, batch_size: int = 500, now: datetime | None = None) -> int:
+        """Expire up to `batch_size` due holds in one commit; returns the count."""
+        expired = await self.repository.expire_due(now or datetime.now(UTC), batch_size)
+        if not expired:
+            await self.repository.session.rollback()
+            return 0
+        await self.products.stage_return_stock(
+            [(product_id, quantity, hold_id) for hold_id, product_id, quantity in expired],
+            MovementReason.HOLD_RELEASE,
+        )
+        await self.repository.commit()
+        return len(expired)
+
+
+async def run_hold_sweeper(
+    session_factory: async_sessionmaker[AsyncSession],
+    interval: float,
+    batch_size: int,
+    queue: HoldExpiryQueue = hold_expiry_queue,
+) -> None:
+    """Expire holds as they come due, in batches."""
+    while True:
+        await queue.wait(interval)
+        queue.pop_due()
+        try:
+            async with session_factory() as session:
+                service = HoldService(StockHoldRepository(session), queue=queue)
+                while await service.expire_due(batch_size) == batch_size:
+                    pass
+        except SQLAlchemyError:
+            logger.exception("Stock hold sweep failed")
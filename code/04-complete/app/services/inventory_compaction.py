@@ -0,0 +1,53 @@
+"""Inventory Compaction - fold ledger movements into product stock snapshots.
+
+Product stock is the products.stock snapshot plus the movements appended
+since its stock_applied_id. Compaction folds those pending movements into
+the snapshot in batches, one short transaction each, so stock reads never
+sum a long tail of the ledger. The ledger itself keeps every movement for
+the stock history.
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.repositories.inventory_repository import InventoryRepository
+
+logger = logging.getLogger(__name__)
+
+
+class InventoryCompactionService:
+    """Service layer for inventory ledger compaction."""
+
+    def __init__(self, inventory: InventoryRepository) -> None:
+        self.inventory = inventory
+
+    async def compact(
+        self, batch_size: int = settings.inventory_compaction_batch_size
+    ) -> int:
+        """Fold every pending movement into product snapshots; returns the count."""
+        total = 0
+        while True:
+            folded, _ = await self.inventory.compact(batch_size)
+            total += folded
+            if folded < batch_size:
+                return total
+
+
+async def run_inventory_compactor(
+    session_factory: async_sessionmaker[AsyncSession],
+    interval: float,
+    batch_size: int,
+) -> None:
+    """Periodically fold ledger movements into product stock snapshots."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as session:
+                service = InventoryCompactionService(InventoryRepository(session))
+                await service.compact(batch_size)
+        except SQLAlchemyError:
+            logger.exception("Inventory compaction failed")
@@ -0,0 +1,332 @@
+"""Notification Dispatcher - background delivery of pending notifications.
+
+The dispatcher runs inside the API process (started from the lifespan).
+Each cycle it claims a batch of pending rows with one UPDATE ... RETURNING
+stamped with a claim token, delivers them through a pluggable sender with
+bounded concurrency, and records the outcome of the whole batch in one
+transaction. Claim tokens make it safe to run one dispatcher per worker.
+
+Batches are shared between delivery lanes by weighted fair queuing, and a
+lane with a rate limit is only offered as many rows as its token bucket
+holds, so a flood of admin alerts cannot starve order emails.
+
+In digest mode, notifications are only claimed once their digest window
+has closed, and a recipient's notifications of one type and window are
+claimed together and merged into one outbound message; its source rows
+are settled together with the rest of the batch.
+"""
+
+import asyncio
+import json
+import logging
+import secrets
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Protocol, TextIO
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.exceptions import NotificationDeliveryError
+from app.models import Notification, NotificationLane, NotificationStatus
+from app.models.notification import LANE_PRIORITY
+from app.repositories.notification_repository import NotificationRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OutboundMessage:
+    """A message handed to a sender; may cover several notifications."""
+    recipient_id: int
+    type: str
+    subject: str
+    message: str
+    notification_ids: tuple[int, ...]
+
+
+class NotificationSender(Protocol):
+    """
+    Delivers one outbound message; raises NotificationDeliveryError (or an
+    OSError from the transport) on failure. Any other exception is logged
+    and retried like a delivery failure.
+    """
+
+    async def send(self, message: OutboundMessage) -> None:
+        ...
+
+
+def json_line(message: OutboundMessage) -> str:
+    """One message as a JSON line."""
+    return json.dumps({
+        "recipient_id": message.recipient_id,
+        "type": message.type,
+        "subject": message.subject,
+        "message": message.message,
+        "notification_ids": list(message.notification_ids),
+    }) + "\n"
+
+
+class StreamSender:
+    """Writes each message as a JSON line to a text stream (stdout by default)."""
+
+    def __init__(self, stream: TextIO | None = None) -> None:
+        self.stream = stream or sys.stdout
+
+    async def send(self, message: OutboundMessage) -> None:
+        self.stream.write(json_line(message))
+        self.stream.flush()
+
+
+class FileSender:
+    """Appends each message as a JSON line to a local file."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+    async def send(self, message: OutboundMessage) -> None:
+        await asyncio.to_thread(self._append, json_line(message))
+
+    def _append(self, line: str) -> None:
+        # Opened per message so no handle outlives the dispatcher
+        with self.path.open("a", encoding="utf-8") as stream:
+            stream.write(line)
+
+
+def build_sender(spec: str) -> NotificationSender:
+    """Build a sender from a spec: "stdout" or "file:<path>"."""
+    if spec == "stdout":
+        return StreamSender()
+    if spec.startswith("file:"):
+        return FileSender(spec.removeprefix("file:"))
+    raise ValueError(f"Unknown notification sender: {spec!r}")
+
+
+class TokenBucket:
+    """Rate limiter: `rate` tokens per second, holding at most `burst`."""
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        self.burst = burst if burst is not None else max(rate, 1.0)
+        self.tokens = self.burst
+        self.updated_at = time.monotonic()
+
+    def available(self) -> int:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        return int(self.tokens)
+
+    def take(self, count: int) -> None:
+        self.tokens -= count
+
+
+@dataclass
+class DispatchResult:
+    """Outcome of one dispatch cycle."""
+    claimed: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+    errors: list[str] = field(default_factory=list)
+    messages: int = 0
+    claimed_by_lane: dict[str, int] = field(default_factory=dict)
+
+
+class NotificationDispatcher:
+    """Claims, delivers and settles pending notifications in batches."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        sender: NotificationSender,
+        batch_size: int = settings.notification_batch_size,
+        concurrency: int = settings.notification_concurrency,
+        max_attempts: int = settings.notification_max_attempts,
+        backoff_base_seconds: float = settings.notification_backoff_base_seconds,
+        backoff_max_seconds: float = settings.notification_backoff_max_seconds,
+        poll_interval_seconds: float = settings.notification_poll_interval_seconds,
+        claim_timeout_seconds: float = settings.notification_claim_timeout_seconds,
+        lane_weights: dict[str, float] | None = None,
+        lane_rate_limits: dict[str, float] | None = None,
+        digest_window_seconds: float | None = (
+            settings.notification_digest_window_seconds
+            if settings.notification_digest_enabled else None
+        ),
+    ) -> None:
+        self.session_factory = session_factory
+        self.sender = sender
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.poll_interval_seconds = poll_interval_seconds
+        self.claim_timeout = timedelta(seconds=claim_timeout_seconds)
+        weights = settings.notification_lane_weights if lane_weights is None else lane_weights
+        rate_limits = (
+            settings.notification_lane_rate_limits
+            if lane_rate_limits is None else lane_rate_limits
+        )
+        self.lane_weights = {
+            lane: weights.get(lane.value, 1.0) for lane in NotificationLane
+        }
+        self.digest_window_seconds = digest_window_seconds
+        self.digest_window = (
+            timedelta(seconds=digest_window_seconds) if digest_window_seconds else None
+        )
+        self.rate_limiters = {
+            NotificationLane(lane): TokenBucket(rate)
+            for lane, rate in rate_limits.items()
+        }
+
+    async def run(self) -> None:
+        """Dispatch forever; sleeps only when there was nothing to claim."""
+        while True:
+            try:
+                result = await self.run_once()
+            except Exception:
+                # Claimed rows are picked up again once their claim times out
+                logger.exception("Notification dispatch cycle failed")
+                result = DispatchResult()
+            if result.claimed < self.batch_size:
+                await asyncio.sleep(self.poll_interval_seconds)
+
+    async def run_once(self) -> DispatchResult:
+        """Claim one batch, deliver it and record the results."""
+        claim_token = secrets.token_hex(16)
+        async with self.session_factory() as session:
+            repository = NotificationRepository(session)
+            batch = await repository.claim_pending(
+                claim_token, self.batch_size, self.claim_timeout, self._lane_quotas(),
+                self.digest_window,
+            )
+            if not batch:
+                return DispatchResult()
+
+            result = DispatchResult(claimed=len(batch))
+            for notification in batch:
+                lane = notification.lane
+                result.claimed_by_lane[lane.value] = result.claimed_by_lane.get(lane.value, 0) + 1
+            for lane, limiter in self.rate_limiters.items():
+                limiter.take(result.claimed_by_lane.get(lane.value, 0))
+
+            messages = self._compose(batch)
+            result.messages = len(messages)
+            outcomes = await self._deliver(messages)
+
+            by_id = {notification.id: notification for notification in batch}
+            sent_ids: list[int] = []
+            failures: list[dict] = []
+            for message, error in zip(messages, outcomes):
+                if error is None:
+                    sent_ids.extend(message.notification_ids)
+                    result.sent += len(message.notification_ids)
+                    continue
+                result.errors.append(error)
+                for notification_id in message.notification_ids:
+                    failure = self._failure(by_id[notification_id], error)
+                    failures.append(failure)
+                    if failure["status"] == NotificationStatus.FAILED.value:
+                        result.failed += 1
+                    else:
+                        result.retried += 1
+
+            await repository.complete_claimed(claim_token, sent_ids, failures)
+            return result
+
+    def _lane_quotas(self) -> dict[int, tuple[float, int]]:
+        """priority -> (weight, max rows this cycle) for the fair claim."""
+        quotas = {}
+        for lane, weight in self.lane_weights.items():
+            limiter = self.rate_limiters.get(lane)
+            max_rows = self.batch_size if limiter is None else limiter.available()
+            quotas[LANE_PRIORITY[lane]] = (weight, max_rows)
+        return quotas
+
+    def _compose(self, batch: list[Notification]) -> list[OutboundMessage]:
+        """Turn claimed notifications into outbound messages."""
+        if not self.digest_window_seconds:
+            return [
+                OutboundMessage(
+                    recipient_id=notification.recipient_id,
+                    type=notification.type,
+                    subject=notification.subject,
+                    message=notification.message,
+                    notification_ids=(notification.id,),
+                )
+                for notification in batch
+            ]
+
+        groups: dict[tuple[int, str, int], list[Notification]] = {}
+        for notification in batch:
+            created_at = notification.created_at
+            if created_at.tzinfo is None:
+                created_at = created_at.replace(tzinfo=UTC)
+            # Whole seconds, as claim_pending groups rows (digest_window_index)
+            window = int(int(created_at.timestamp()) // self.digest_window_seconds)
+            key = (notification.recipient_id, notification.type, window)
+            groups.setdefault(key, []).append(notification)
+        return [self._digest(group) for group in groups.values()]
+
+    @staticmethod
+    def _digest(group: list[Notification]) -> OutboundMessage:
+        """One message for a recipient's notifications of one type and window."""
+        group.sort(key=lambda notification: (notification.created_at, notification.id))
+        first = group[0]
+        if len(group) == 1:
+            subject, message = first.subject, first.message
+        else:
+            subject = f"{first.subject} ({len(group)} updates)"
+            message = "\n".join(notification.message for notification in group)
+        return OutboundMessage(
+            recipient_id=first.recipient_id,
+            type=first.type,
+            subject=subject,
+            message=message,
+            notification_ids=tuple(notification.id for notification in group),
+        )
+
+    async def _deliver(self, messages: list[OutboundMessage]) -> list[str | None]:
+        """Send messages with bounded concurrency; returns an error per message."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def deliver(message: OutboundMessage) -> str | None:
+            async with semaphore:
+                try:
+                    await self.sender.send(message)
+                except (NotificationDeliveryError, OSError) as e:
+                    return f"{type(e).__name__}: {e}"[:500]
+                except Exception as e:
+                    # A sender bug must not take the batch (or the loop) down
+                    logger.exception("Notification sender raised unexpectedly")
+                    return f"{type(e).__name__}: {e}"[:500]
+                return None
+
+        return await asyncio.gather(*(deliver(message) for message in messages))
+
+    def _failure(self, notification: Notification, error: str) -> dict:
+        """Retry with exponential backoff, or give up after max attempts."""
+        attempts = notification.attempts + 1
+        if attempts >= self.max_attempts:
+            return {
+                "id": notification.id,
+                "attempts": attempts,
+                "status": NotificationStatus.FAILED.value,
+                "next_attempt_at": None,
+                "last_error": error,
+            }
+        delay = min(
+            self.backoff_max_seconds,
+            self.backoff_base_seconds * 2 ** (attempts - 1),
+        )
+        return {
+            "id": notification.id,
+            "attempts": attempts,
+            "status": NotificationStatus.PENDING.value,
+            "next_attempt_at": datetime.now(UTC) + timedelta(seconds=delay),
+            "last_error": error,
+        }
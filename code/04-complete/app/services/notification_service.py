@@ -1,10 +1,20 @@
 """Notification Service - Business Logic Layer."""
 
-from datetime import datetime
+from datetime import UTC, datetime
+from typing import Any
 
-from app.models import Notification, NotificationType
+from app.core.config import settings
+from app.models import (
+    Notification,
+    NotificationLane,
+    NotificationStatus,
+    NotificationType,
+)
+from app.models.notification import LANE_PRIORITY
 from app.repositories.notification_repository import NotificationRepository
-from app.core.exceptions import NotificationNotFoundError
+from app.core.exceptions import InvalidCursorError, NotificationNotFoundError
+from app.core.pagination import decode_cursor, encode_cursor
+from app.services.notification_templates import notification_templates
 
 
 class NotificationService:
@@ -13,9 +23,40 @@ class NotificationService:
     def __init__(self, repository: NotificationRepository) -> None:
         self.repository = repository
 
-    async def get_pending_notifications(self) -> list[Notification]:
-        """Get all pending notifications."""
-        return await self.repository.get_pending()
+    async def get_pending_notifications(
+        self,
+        limit: int = 100,
+        cursor: str | None = None,
+        lane: NotificationLane | None = None,
+    ) -> tuple[list[Notification], int, str | None]:
+        """
+        Get one page of pending notifications, most urgent lane first.
+        Returns (notifications, total_pending, next_cursor).
+        """
+        after = None
+        if cursor:
+            priority, created_at, notification_id = decode_cursor(cursor, 3)
+            try:
+                after = (
+                    int(priority),
+                    datetime.fromisoformat(created_at),
+                    int(notification_id),
+                )
+            except (TypeError, ValueError):
+                raise InvalidCursorError(cursor)
+
+        priority = LANE_PRIORITY[lane] if lane is not None else None
+        notifications = await self.repository.get_pending(limit + 1, after, priority)
+        next_cursor = None
+        if len(notifications) > limit:
+            notifications = notifications[:limit]
+            last = notifications[-1]
+            next_cursor = encode_cursor(
+                last.priority, last.created_at.isoformat(), last.id
+            )
+
+        total = await self.repository.count_by_status(NotificationStatus.PENDING.value)
+        return notifications, total, next_cursor
 
     async def mark_as_sent(
         self,
@@ -28,29 +69,110 @@ class NotificationService:
             raise NotificationNotFoundError(notification_id)
         return notification
 
+    async def mark_many_as_sent(
+        self,
+        items: list[tuple[int, datetime | None]],
+    ) -> tuple[int, list[int]]:
+        """
+        Mark many notifications as sent.
+        Returns (updated_count, not_found_ids).
+        """
+        sent_at_by_id = dict(items)  # a repeated id keeps its last sent_at
+        updated = set(await self.repository.mark_sent_bulk(sent_at_by_id))
+        not_found = [i for i in sent_at_by_id if i not in updated]
+        return len(updated), not_found
+
     async def create_order_notification(
         self,
         notification_type: NotificationType,
         recipient_id: int,
         order_id: int,
-        message: str
+        message: str | None = None,
+        values: dict[str, Any] | None = None,
+        locale: str | None = None,
     ) -> Notification:
         """Create a notification for order events."""
-        subject_map = {
-            NotificationType.ORDER_CREATED: "Order Created",
-            NotificationType.ORDER_SHIPPED: "Order Shipped",
-            NotificationType.ORDER_DELIVERED: "Order Delivered",
-            NotificationType.ORDER_CANCELLED: "Order Cancelled",
-        }
-        
-        notification = Notification(
+        notification = self.build_order_notification(
+            notification_type, recipient_id, order_id, message, values, locale
+        )
+        return await self.repository.create(notification)
+
+    def stage_order_notification(
+        self,
+        notification_type: NotificationType,
+        recipient_id: int,
+        order_id: int,
+        message: str | None = None,
+        values: dict[str, Any] | None = None,
+        locale: str | None = None,
+    ) -> Notification:
+        """
+        Add an order notification to the caller's open transaction (outbox).
+        It is committed, or rolled back, together with the order change.
+        """
+        notification = self.build_order_notification(
+            notification_type, recipient_id, order_id, message, values, locale
+        )
+        self.repository.add(notification)
+        return notification
+
+    async def create_order_notifications_bulk(
+        self,
+        notification_type: NotificationType,
+        recipients: list[tuple[int, int, dict[str, Any]]],
+        locale: str | None = None,
+    ) -> list[Notification]:
+        """
+        Create one notification per (recipient_id, order_id, values) in a
+        single commit, rendering the batch through the template cache.
+        """
+        rendered = notification_templates.render_many(
+            notification_type,
+            ({"order_id": order_id, **values} for _, order_id, values in recipients),
+            locale,
+        )
+        notifications = [
+            Notification(
+                type=notification_type.value,
+                recipient_id=recipient_id,
+                subject=subject,
+                message=message,
+                reference_id=order_id,
+            )
+            for (recipient_id, order_id, _), (subject, message) in zip(recipients, rendered)
+        ]
+        return await self.repository.create_bulk(notifications)
+
+    @staticmethod
+    def build_order_notification(
+        notification_type: NotificationType,
+        recipient_id: int,
+        order_id: int,
+        message: str | None = None,
+        values: dict[str, Any] | None = None,
+        locale: str | None = None,
+    ) -> Notification:
+        """
+        Build (but do not persist) a notification for an order event.
+        The subject, and the message unless one is given, come from the
+        type's template rendered with order_id plus `values`.
+        """
+        values = {"order_id": order_id, **(values or {})}
+        if message is None:
+            subject, message = notification_templates.render(
+                notification_type, values, locale
+            )
+        else:
+            subject = notification_templates.render_subject(
+                notification_type, values, locale
+            )
+        return Notification(
             type=notification_type.value,
             recipient_id=recipient_id,
-            subject=subject_map.get(notification_type, "Order Update"),
+            subject=subject,
             message=message,
             reference_id=order_id
         )
-        return await self.repository.create(notification)
 
     async def create_low_stock_notification(
         self,
@@ -58,12 +180,49 @@ class NotificationService:
         product_name: str,
         current_stock: int
     ) -> Notification:
-        """Create a low stock notification."""
-        notification = Notification(
+        """
+        Create a low stock notification, or coalesce it into the product's
+        pending alert for the current window.
+        """
+        notification = self.build_low_stock_notification(
+            product_id, product_name, current_stock
+        )
+        return await self.repository.create_coalesced(notification)
+
+    async def stage_low_stock_notification(
+        self,
+        product_id: int,
+        product_name: str,
+        current_stock: int
+    ) -> Notification:
+        """Coalesce a low stock alert into the caller's open transaction."""
+        notification = self.build_low_stock_notification(
+            product_id, product_name, current_stock
+        )
+        return await self.repository.stage_coalesced(notification)
+
+    @staticmethod
+    def build_low_stock_notification(
+        product_id: int,
+        product_name: str,
+        current_stock: int,
+        now: datetime | None = None,
+    ) -> Notification:
+        """
+        Build (but do not persist) a low stock alert. Alerts for one product
+        share a dedupe key per fixed window of low_stock_alert_window_seconds.
+        """
+        now = now or datetime.now(UTC)
+        window = int(now.timestamp() // settings.low_stock_alert_window_seconds)
+        subject, message = notification_templates.render(
+            NotificationType.LOW_STOCK,
+            {"product_name": product_name, "stock": current_stock},
+        )
+        return Notification(
             type=NotificationType.LOW_STOCK.value,
             recipient_id=0,  # Admin notification
-            subject=f"Low Stock Alert: {product_name}",
-            message=f"Product '{product_name}' has low stock: {current_stock} units remaining",
-            reference_id=product_id
+            subject=subject,
+            message=message,
+            reference_id=product_id,
+            dedupe_key=f"low_stock:{product_id}:{window}",
         )
-        return await self.repository.create(notification)
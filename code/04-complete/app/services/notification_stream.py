@@ -0,0 +1,155 @@
+"""Notification Stream - server-sent events for new pending notifications.
+
+A client first catches up from the database (everything pending after its
+Last-Event-ID), then follows the in-process broadcaster. Event ids are
+notification ids, which only grow, so an event at or below the last id sent
+is a duplicate and is skipped. A client only queries the database again
+when its queue overflowed; rows committed by other worker processes reach
+the broadcaster through one shared NotificationPoller per process, so idle
+connections cost no queries.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator
+from typing import Any
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.broadcast import Broadcaster, notification_broadcaster
+from app.core.config import settings
+from app.repositories.notification_repository import (
+    NotificationRepository,
+    notification_event,
+)
+
+logger = logging.getLogger(__name__)
+
+RETRY_MILLISECONDS = 3000
+
+
+def format_event(payload: dict[str, Any]) -> str:
+    """Encode one notification as an SSE frame."""
+    return f"id: {payload['id']}\nevent: notification\ndata: {json.dumps(payload)}\n\n"
+
+
+class NotificationStream:
+    """Produces the SSE frames for one client connection."""
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        broadcaster: Broadcaster = notification_broadcaster,
+        heartbeat_seconds: float = settings.notification_stream_heartbeat_seconds,
+        replay_limit: int = settings.notification_stream_replay_limit,
+    ) -> None:
+        self.session_factory = session_factory
+        self.broadcaster = broadcaster
+        self.heartbeat_seconds = heartbeat_seconds
+        self.replay_limit = replay_limit
+
+    async def events(self, last_event_id: int | None = None) -> AsyncIterator[str]:
+        """Yield SSE frames until the client disconnects."""
+        # Subscribe before reading the database so nothing committed in
+        # between is missed; duplicates are filtered by id
+        with self.broadcaster.subscribe() as subscription:
+            if last_event_id is None:
+                last_id = await self._max_id()
+            else:
+                last_id = last_event_id
+            yield f"retry: {RETRY_MILLISECONDS}\n\n"
+            if last_event_id is not None:
+                replayed_id = last_id
+                async for frame, replayed_id in self._replay(last_id):
+                    yield frame
+                last_id = replayed_id
+
+            while True:
+                if subscription.lagged:
+                    subscription.reset()
+                    replayed_id = last_id
+                    async for frame, replayed_id in self._replay(last_id):
+                        yield frame
+                    last_id = replayed_id
+                    continue
+                try:
+                    payload = await asyncio.wait_for(
+                        subscription.queue.get(), self.heartbeat_seconds
+                    )
+                except TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if payload["id"] > last_id:
+                    last_id = payload["id"]
+                    yield format_event(payload)
+
+    async def _replay(self, last_id: int) -> AsyncIterator[tuple[str, int]]:
+        """Pending notifications after last_id from the database, page by page."""
+        while True:
+            async with self.session_factory() as session:
+                page = await NotificationRepository(session).get_pending_after_id(
+                    last_id, self.replay_limit
+                )
+                payloads = [notification_event(n) for n in page]
+            for payload in payloads:
+                last_id = payload["id"]
+                yield format_event(payload), last_id
+            if len(payloads) < self.replay_limit:
+                return
+
+    async def _max_id(self) -> int:
+        async with self.session_factory() as session:
+            return await NotificationRepository(session).get_max_id()
+
+
+class NotificationPoller:
+    """
+    Publishes pending notifications committed by other worker processes to
+    this process's broadcaster; one per process, shared by every stream.
+    Rows this process committed itself are published again and skipped by
+    the streams as duplicates.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        broadcaster: Broadcaster = notification_broadcaster,
+        interval_seconds: float = settings.notification_stream_poll_seconds,
+        page_size: int = settings.notification_stream_replay_limit,
+    ) -> None:
+        self.session_factory = session_factory
+        self.broadcaster = broadcaster
+        self.interval_seconds = interval_seconds
+        self.page_size = page_size
+        self._last_id: int | None = None
+
+    async def run(self) -> None:
+        """Poll forever, once per interval."""
+        while True:
+            try:
+                await self.poll_once()
+            except SQLAlchemyError:
+                logger.exception("Notification stream poll failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def poll_once(self) -> int:
+        """Publish rows added since the last poll; returns how many."""
+        async with self.session_factory() as session:
+            repository = NotificationRepository(session)
+            if self._last_id is None or not self.broadcaster.subscriber_count:
+                # Nobody listening: only move the cursor; a stream subscribing
+                # later starts from a max id at least this high
+                self._last_id = await repository.get_max_id()
+                return 0
+            published = 0
+            while True:
+                page = await repository.get_pending_after_id(self._last_id, self.page_size)
+                for notification in page:
+                    payload = notification_event(notification)
+                    self._last_id = payload["id"]
+                    self.broadcaster.publish(payload)
+                published += len(page)
+                if len(page) < self.page_size:
+                    return published
@@ -0,0 +1,222 @@
+"""Notification Templates - compiled subject/message templates per type.
+
+Templates use str.format syntax with plain field names and are parsed once
+when registered. Each NotificationType can have locale variants; lookups
+fall back from "th-TH" to "th" to the default locale. The resolved template
+is memoized per (type, locale); rendered output is not, since per-order
+values such as order_id would make every key unique. Bulk renders instead
+format the values shared by the whole batch once and fill in the rest per
+notification.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Any
+
+from app.core.config import settings
+from app.models import NotificationType
+
+_formatter = Formatter()
+
+
+def _same(a: Any, b: Any) -> bool:
+    """Whether two values always format alike (Decimal("1.0") == Decimal("1.00"))."""
+    return a is b or (type(a) is type(b) and type(a) in (str, int) and a == b)
+
+
+class CompiledTemplate:
+    """A str.format template split into literal text and field slots once."""
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self._parts: list[tuple[str, str | None, str, str | None]] = []
+        fields = set()
+        for literal, field_name, format_spec, conversion in _formatter.parse(source):
+            if field_name is not None:
+                if not field_name.isidentifier():
+                    raise ValueError(f"Unsupported template field {field_name!r} in {source!r}")
+                fields.add(field_name)
+            self._parts.append((literal, field_name, format_spec or "", conversion))
+        self.fields = frozenset(fields)
+
+    def render(self, values: dict[str, Any]) -> str:
+        chunks = []
+        for literal, field_name, format_spec, conversion in self._parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(self._format(values[field_name], format_spec, conversion))
+        return "".join(chunks)
+
+    def bind(self, values: dict[str, Any]) -> "CompiledTemplate":
+        """
+        A copy with the given fields formatted into its literal text; the
+        other fields stay slots for render.
+        """
+        bound = CompiledTemplate.__new__(CompiledTemplate)
+        bound.source = self.source
+        bound._parts = []
+        pending = ""
+        for literal, field_name, format_spec, conversion in self._parts:
+            pending += literal
+            if field_name is None:
+                continue
+            if field_name in values:
+                pending += self._format(values[field_name], format_spec, conversion)
+            else:
+                bound._parts.append((pending, field_name, format_spec, conversion))
+                pending = ""
+        if pending:
+            bound._parts.append((pending, None, "", None))
+        bound.fields = self.fields - values.keys()
+        return bound
+
+    @staticmethod
+    def _format(value: Any, format_spec: str, conversion: str | None) -> str:
+        if conversion is not None:
+            value = _formatter.convert_field(value, conversion)
+        return format(value, format_spec)
+
+
+@dataclass(frozen=True)
+class NotificationTemplate:
+    """Compiled subject and message for one type and locale."""
+    subject: CompiledTemplate
+    message: CompiledTemplate
+
+
+class TemplateRegistry:
+    """Templates by (NotificationType, locale) with a bounded lookup cache."""
+
+    def __init__(
+        self,
+        default_locale: str = settings.notification_default_locale,
+        cache_size: int = settings.notification_template_cache_size,
+    ) -> None:
+        self.default_locale = default_locale
+        self._templates: dict[tuple[NotificationType, str], NotificationTemplate] = {}
+        self._resolve = lru_cache(maxsize=cache_size)(self._lookup)
+
+    def register(
+        self,
+        notification_type: NotificationType,
+        subject: str,
+        message: str,
+        locale: str | None = None,
+    ) -> None:
+        """Compile and add a template variant."""
+        key = (notification_type, (locale or self.default_locale).lower())
+        self._templates[key] = NotificationTemplate(
+            CompiledTemplate(subject), CompiledTemplate(message)
+        )
+        self._resolve.cache_clear()
+
+    def get(
+        self,
+        notification_type: NotificationType,
+        locale: str | None = None,
+    ) -> NotificationTemplate:
+        """Template for a locale, falling back to its language, then the default."""
+        return self._resolve(notification_type, locale)
+
+    def render(
+        self,
+        notification_type: NotificationType,
+        values: dict[str, Any],
+        locale: str | None = None,
+    ) -> tuple[str, str]:
+        """(subject, message) for one set of values."""
+        template = self.get(notification_type, locale)
+        return template.subject.render(values), template.message.render(values)
+
+    def render_subject(
+        self,
+        notification_type: NotificationType,
+        values: dict[str, Any],
+        locale: str | None = None,
+    ) -> str:
+        return self.get(notification_type, locale).subject.render(values)
+
+    def render_many(
+        self,
+        notification_type: NotificationType,
+        values: Iterable[dict[str, Any]],
+        locale: str | None = None,
+    ) -> list[tuple[str, str]]:
+        """
+        Render a batch; fields with the same value in every item are
+        formatted once, leaving only the per-item fields to fill in.
+        """
+        items = list(values)
+        if not items:
+            return []
+        template = self.get(notification_type, locale)
+        first = items[0]
+        shared = {
+            name: first[name]
+            for name in template.subject.fields | template.message.fields
+            if all(_same(item[name], first[name]) for item in items[1:])
+        }
+        subject = template.subject.bind(shared)
+        message = template.message.bind(shared)
+        return [(subject.render(item), message.render(item)) for item in items]
+
+    def cache_info(self):
+        return self._resolve.cache_info()
+
+    def _lookup(
+        self,
+        notification_type: NotificationType,
+        locale: str | None,
+    ) -> NotificationTemplate:
+        for candidate in self._locale_chain(locale):
+            template = self._templates.get((notification_type, candidate))
+            if template is not None:
+                return template
+        raise KeyError(f"No template for {notification_type.value!r}")
+
+    def _locale_chain(self, locale: str | None) -> list[str]:
+        chain = []
+        if locale:
+            locale = locale.replace("_", "-").lower()
+            chain.append(locale)
+            language = locale.split("-", 1)[0]
+            if language != locale:
+                chain.append(language)
+        chain.append(self.default_locale.lower())
+        return chain
+
+
+def build_default_registry() -> TemplateRegistry:
+    """Registry with the built-in English and Thai templates."""
+    registry = TemplateRegistry()
+    status_message = "Your order #{order_id} is now {status}."
+    for notification_type, subject, message in (
+        (NotificationType.ORDER_CREATED, "Order Created",
+         "Your order #{order_id} has been placed. Total: {total}"),
+        (NotificationType.ORDER_SHIPPED, "Order Shipped", status_message),
+        (NotificationType.ORDER_DELIVERED, "Order Delivered", status_message),
+        (NotificationType.ORDER_CANCELLED, "Order Cancelled", status_message),
+        (NotificationType.LOW_STOCK, "Low Stock Alert: {product_name}",
+         "Product '{product_name}' has low stock: {stock} units remaining"),
+        (NotificationType.RESTOCK, "Restocked: {product_name}",
+         "Product '{product_name}' was restocked: {stock} units available"),
+    ):
+        registry.register(notification_type, subject, message, locale="en")
+
+    for notification_type, subject, message in (
+        (NotificationType.ORDER_CREATED, "สร้างคำสั่งซื้อแล้ว",
+         "คำสั่งซื้อ #{order_id} ของคุณได้รับแล้ว ยอดรวม: {total}"),
+        (NotificationType.ORDER_SHIPPED, "จัดส่งคำสั่งซื้อแล้ว",
+         "คำสั่งซื้อ #{order_id} ของคุณถูกจัดส่งแล้ว"),
+        (NotificationType.ORDER_DELIVERED, "ส่งถึงแล้ว",
+         "คำสั่งซื้อ #{order_id} ของคุณส่งถึงแล้ว"),
+        (NotificationType.ORDER_CANCELLED, "ยกเลิกคำสั่งซื้อแล้ว",
+         "คำสั่งซื้อ #{order_id} ของคุณถูกยกเลิกแล้ว"),
+    ):
+        registry.register(notification_type, subject, message, locale="th")
+    return registry
+
+
+notification_templates = build_default_registry()
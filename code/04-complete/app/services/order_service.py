@@ -1,70 +1,177 @@
 """Order Service - Business Logic Layer."""
 
-from decimal import Decimal
+from datetime import UTC, date, datetime
 
-from app.models import Order, OrderItem, OrderStatus
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.money import from_cents
+from app.core.user_ids import UserIdSet, known_users
+from app.models import NotificationType, Order, OrderItem, OrderStatus
+from app.repositories.hold_repository import StockHoldRepository
+from app.repositories.notification_repository import NotificationRepository
 from app.repositories.order_repository import OrderRepository
+from app.repositories.product_repository import ProductRepository
+from app.repositories.report_repository import ReportRepository
+from app.repositories.user_repository import UserRepository
+from app.services.notification_service import NotificationService
 from app.schemas import OrderCreate, OrderUpdate
 from app.core.exceptions import (
     OrderNotFoundError,
     InvalidStatusTransitionError,
     OrderCancellationError,
+    StockHoldQuantityError,
+    StockHoldUnavailableError,
+    UserNotFoundError,
 )
 
-# Mock product catalog (in real app, this would call Product Service)
+# Mock product catalog as (name, unit price in cents)
+# (in real app, this would call Product Service)
 PRODUCTS = {
-    1: ("Laptop Pro 15\"", Decimal("1299.99")),
-    2: ("Wireless Mouse", Decimal("49.99")),
-    3: ("USB-C Hub", Decimal("79.99")),
-    4: ("Mechanical Keyboard", Decimal("149.99")),
-    5: ("Monitor 27\"", Decimal("449.99")),
-    6: ("Desk Lamp", Decimal("39.99")),
-    7: ("Office Chair", Decimal("299.99")),
-    8: ("Standing Desk", Decimal("599.99")),
+    1: ("Laptop Pro 15\"", 129999),
+    2: ("Wireless Mouse", 4999),
+    3: ("USB-C Hub", 7999),
+    4: ("Mechanical Keyboard", 14999),
+    5: ("Monitor 27\"", 44999),
+    6: ("Desk Lamp", 3999),
+    7: ("Office Chair", 29999),
+    8: ("Standing Desk", 59999),
+}
+
+# Status changes that notify the customer
+STATUS_NOTIFICATIONS = {
+    OrderStatus.SHIPPED.value: NotificationType.ORDER_SHIPPED,
+    OrderStatus.DELIVERED.value: NotificationType.ORDER_DELIVERED,
+    OrderStatus.CANCELLED.value: NotificationType.ORDER_CANCELLED,
 }
 
 
 class OrderService:
     """Service layer for order business logic."""
 
-    def __init__(self, repository: OrderRepository) -> None:
+    def __init__(
+        self,
+        repository: OrderRepository,
+        reports: ReportRepository | None = None,
+        notifications: NotificationService | None = None,
+        holds: StockHoldRepository | None = None,
+        users: UserRepository | None = None,
+        user_ids: UserIdSet | None = None,
+        products: ProductRepository | None = None,
+    ) -> None:
         self.repository = repository
+        # Rollups and outbox notifications share the order session so they
+        # commit atomically with the order change
+        self.reports = reports or ReportRepository(repository.session)
+        self.notifications = notifications or NotificationService(
+            NotificationRepository(repository.session)
+        )
+        self.holds = holds or StockHoldRepository(repository.session)
+        self.users = users or UserRepository(repository.session)
+        self.user_ids = user_ids if user_ids is not None else known_users
+        self.products = products or ProductRepository(repository.session)
 
     async def create_order(self, data: OrderCreate) -> Order:
         """
         Create a new order with items.
-        Calculates total from product prices.
+        Calculates total from product prices (see _price_items).
+        The user is confirmed from the in-process user id set; only an id
+        it does not know yet costs a query.
         """
+        if data.user_id not in await self.user_ids.existing(self.users, [data.user_id]):
+            raise UserNotFoundError(data.user_id)
+
         order = Order(
             user_id=data.user_id,
             shipping_address=data.shipping_address,
             notes=data.notes,
-            status=OrderStatus.PENDING.value
+            status=OrderStatus.PENDING.value,
+            # Set now, not at flush, so the rollup day is the stored day
+            created_at=datetime.now(UTC),
         )
         
-        total = Decimal("0.00")
+        total_cents = 0
+        prices = await self._price_items([item.product_id for item in data.items])
         
         for item_data in data.items:
-            product = PRODUCTS.get(item_data.product_id)
-            if not product:
-                # In real app, would call Product Service
-                product = (f"Product {item_data.product_id}", Decimal("99.99"))
-            
-            product_name, unit_price = product
+            product_name, unit_price_cents = prices[item_data.product_id]
             
             item = OrderItem(
                 product_id=item_data.product_id,
                 product_name=product_name,
                 quantity=item_data.quantity,
-                unit_price=unit_price
+                unit_price_cents=unit_price_cents
             )
             order.items.append(item)
-            total += unit_price * item_data.quantity
+            total_cents += item.subtotal_cents
         
-        order.total = total
+        order.total_cents = total_cents
         
+        await self._record_sales(order, order.status, sign=1, products=True)
+        await self.repository.stage(order)
+        if data.hold_ids:
+            await self._consume_holds(order, data.hold_ids)
+        self.notifications.stage_order_notification(
+            NotificationType.ORDER_CREATED,
+            order.user_id,
+            order.id,
+            values={"total": from_cents(order.total_cents)},
+        )
         return await self.repository.create(order)
     
+    async def _price_items(self, product_ids: list[int]) -> dict[int, tuple[str, int]]:
+        """
+        (name, unit price in cents) per product id: from the catalog snapshot,
+        then the products table in one query for the ids it misses; the mock
+        catalog only prices ids that are not in the catalog at all.
+        """
+        prices = {}
+        for product_id in product_ids:
+            price = catalog_snapshot.price_of(product_id)
+            if price is not None:
+                prices[product_id] = price
+        missing = [product_id for product_id in product_ids if product_id not in prices]
+        if missing:
+            for product in await self.products.get_many(missing):
+                prices[product.id] = (product.name, product.price_cents)
+        for product_id in product_ids:
+            if product_id not in prices:
+                # In real app, would call Product Service
+                prices[product_id] = PRODUCTS.get(
+                    product_id, (f"Product {product_id}", 9999)
+                )
+        return prices
+
+    async def _consume_holds(self, order: Order, hold_ids: list[int]) -> None:
+        """
+        Consume stock holds for a staged order. Every hold must be active,
+        unexpired and for one of the order's products, and a product's holds
+        must add up to exactly its ordered quantity; otherwise the order is
+        rolled back.
+        """
+        hold_ids = list(dict.fromkeys(hold_ids))
+        consumed = {
+            hold_id: (product_id, quantity)
+            for hold_id, product_id, quantity
+            in await self.holds.consume(hold_ids, order.id, datetime.now(UTC))
+        }
+        ordered: dict[int, int] = {}
+        for item in order.items:
+            ordered[item.product_id] = ordered.get(item.product_id, 0) + item.quantity
+        unavailable = [
+            hold_id for hold_id in hold_ids
+            if hold_id not in consumed or consumed[hold_id][0] not in ordered
+        ]
+        if unavailable:
+            await self.repository.session.rollback()
+            raise StockHoldUnavailableError(unavailable)
+
+        held: dict[int, int] = {}
+        for product_id, quantity in consumed.values():
+            held[product_id] = held.get(product_id, 0) + quantity
+        for product_id, quantity in held.items():
+            if quantity != ordered[product_id]:
+                await self.repository.session.rollback()
+                raise StockHoldQuantityError(product_id, quantity, ordered[product_id])
+
     async def get_order(self, order_id: int) -> Order:
         """Get order by ID or raise OrderNotFoundError."""
         order = await self.repository.get_by_id(order_id)
@@ -105,7 +212,10 @@ class OrderService:
                     order.status, 
                     data.status.value
                 )
+            old_status = order.status
             order.status = data.status.value
+            await self._record_status_change(order, old_status)
+            self._stage_status_notification(order)
         
         if data.shipping_address is not None:
             order.shipping_address = data.shipping_address
@@ -125,6 +235,71 @@ class OrderService:
         if not order.can_transition_to(OrderStatus.CANCELLED):
             raise OrderCancellationError(order_id, order.status)
         
+        old_status = order.status
         order.status = OrderStatus.CANCELLED.value
+        await self._record_status_change(order, old_status)
+        self._stage_status_notification(order)
         
         return await self.repository.update(order)
+
+    def _stage_status_notification(self, order: Order) -> None:
+        """Queue the customer notification for the order's new status, if any."""
+        notification_type = STATUS_NOTIFICATIONS.get(order.status)
+        if notification_type is None:
+            return
+        self.notifications.stage_order_notification(
+            notification_type,
+            order.user_id,
+            order.id,
+            values={"status": order.status},
+        )
+
+    async def _record_sales(
+        self,
+        order: Order,
+        status: str,
+        sign: int,
+        products: bool,
+    ) -> None:
+        """Stage sales rollup deltas for an order counted under a status."""
+        day = _sales_day(order)
+        units = sum(item.quantity for item in order.items)
+        await self.reports.add_status_delta(
+            day,
+            status,
+            revenue_cents=sign * order.total_cents,
+            order_count=sign,
+            units=sign * units,
+        )
+        if products:
+            await self.reports.add_product_deltas(day, _product_deltas(order, sign))
+
+    async def _record_status_change(self, order: Order, old_status: str) -> None:
+        """Move an order's rollup contribution from its old status to the new one."""
+        if old_status == order.status:
+            return
+        await self._record_sales(order, old_status, sign=-1, products=False)
+        await self._record_sales(order, order.status, sign=1, products=False)
+        if order.status == OrderStatus.CANCELLED.value:
+            # Product rollups only count live sales
+            await self.reports.add_product_deltas(
+                _sales_day(order), _product_deltas(order, sign=-1)
+            )
+
+
+def _sales_day(order: Order) -> date:
+    """Rollup day for an order (its creation date)."""
+    return order.created_at.date()
+
+
+def _product_deltas(order: Order, sign: int) -> list[dict]:
+    """Per-product rollup deltas for an order's items."""
+    deltas: dict[int, dict] = {}
+    for item in order.items:
+        delta = deltas.setdefault(
+            item.product_id,
+            {"product_id": item.product_id, "revenue_cents": 0, "order_count": sign, "units": 0},
+        )
+        delta["revenue_cents"] += sign * item.subtotal_cents
+        delta["units"] += sign * item.quantity
+    return list(deltas.values())
@@ -0,0 +1,126 @@
+"""Product Import Service - bulk create or update products by SKU.
+
+Parsed records (app.core.product_import) are validated one by one and
+upserted in chunks, one transaction per chunk, so a large file never
+holds the write lock for long and a bad row only costs its own line.
+Each chunk also appends its stock movements to the ledger, bumps the
+catalog version and feeds the in-process listing and name caches.
+"""
+
+from collections.abc import AsyncIterable
+
+from pydantic import ValidationError
+
+from app.core.catalog_snapshot import catalog_snapshot
+from app.core.config import settings
+from app.core.money import to_cents
+from app.core.product_import import Record
+from app.models import MovementReason
+from app.repositories.product_repository import ProductRepository
+from app.schemas import ProductImportError, ProductImportResult, ProductImportRow
+from app.services.product_service import ProductService
+
+
+class ProductImportService:
+    """Service layer for bulk product imports."""
+
+    def __init__(
+        self,
+        repository: ProductRepository,
+        products: ProductService | None = None,
+    ) -> None:
+        self.repository = repository
+        self.products = products or ProductService(repository)
+
+    async def import_products(
+        self,
+        records: AsyncIterable[Record],
+        chunk_size: int | None = None,
+        max_errors: int | None = None,
+    ) -> ProductImportResult:
+        """
+        Validate parsed import records and upsert them by SKU, one
+        transaction per chunk. Stock is only touched when a row carries a
+        stock value: it becomes the INITIAL movement of a new product, or an
+        ADJUSTMENT to reach that value for an existing one. Rows that fail
+        validation are reported and skipped; earlier chunks stay committed.
+        """
+        chunk_size = chunk_size or settings.product_import_chunk_size
+        if max_errors is None:
+            max_errors = settings.product_import_max_errors
+        result = ProductImportResult(
+            received=0, inserted=0, updated=0, failed=0, errors=[]
+        )
+        chunk: dict[str, ProductImportRow] = {}
+        async for line, record in records:
+            result.received += 1
+            if isinstance(record, str):
+                errors = [record]
+            else:
+                try:
+                    row = ProductImportRow.model_validate(record)
+                except ValidationError as e:
+                    errors = [
+                        f"{'.'.join(map(str, error['loc'])) or 'row'}: {error['msg']}"
+                        for error in e.errors()
+                    ]
+                else:
+                    # A repeated SKU must see the earlier row applied first
+                    if row.sku in chunk or len(chunk) >= chunk_size:
+                        await self._import_chunk(chunk, result)
+                        chunk = {}
+                    chunk[row.sku] = row
+                    continue
+            result.failed += 1
+            if len(result.errors) < max_errors:
+                result.errors.append(ProductImportError(line=line, errors=errors))
+            else:
+                result.errors_truncated = True
+        if chunk:
+            await self._import_chunk(chunk, result)
+        if result.inserted or result.updated:
+            self.products.facets.clear()
+        if result.updated and catalog_snapshot.generation:
+            # Names and prices are not patched in place; republish them
+            await self.products.refresh_catalog_snapshot()
+        return result
+
+    async def _import_chunk(
+        self, chunk: dict[str, ProductImportRow], result: ProductImportResult
+    ) -> None:
+        """Upsert one chunk of validated rows and commit it."""
+        products = self.products
+        existing = await self.repository.get_stock_by_sku(list(chunk))
+        ids = await self.repository.upsert_by_sku([
+            {
+                "sku": row.sku,
+                "name": row.name,
+                "description": row.description,
+                "price_cents": to_cents(row.price),
+                "category": row.category,
+            }
+            for row in chunk.values()
+        ])
+        movements = []
+        for sku, row in chunk.items():
+            if sku in existing:
+                result.updated += 1
+                if "stock" not in row.model_fields_set:
+                    continue
+                product_id, stock, shards = existing[sku]
+                if row.stock != stock:
+                    movements.append((product_id, row.stock - stock, MovementReason.ADJUSTMENT))
+                    if shards:
+                        await products.shards.reset(product_id, shards, row.stock)
+            else:
+                result.inserted += 1
+                if row.stock:
+                    movements.append((ids[sku], row.stock, MovementReason.INITIAL))
+        await products.inventory.append_many([
+            {"product_id": product_id, "delta": delta, "reason": reason.value}
+            for product_id, delta, reason in movements
+        ])
+        await self.repository.bump_catalog_version()
+        await products.inventory.commit()
+        products.listing.invalidate()
+        products.names.add_many((ids[sku], row.name) for sku, row in chunk.items())
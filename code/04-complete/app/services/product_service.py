@@ -1,30 +1,102 @@
 """Product Service - Business Logic Layer."""
 
-from app.models import Product
+import asyncio
+import logging
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.catalog_snapshot import SnapshotColumns, catalog_snapshot
+from app.core.product_autocomplete import ProductNameIndex, product_names
+from app.core.money import to_cents
+from app.core.product_facets import FacetCache, product_facets
+from app.core.product_listing import (
+    ProductListing,
+    page_envelope,
+    product_listing,
+    serialize_product,
+    with_stock,
+)
+from app.models import InventoryMovement, MovementReason, Product, match_query
+from app.repositories.inventory_repository import InventoryRepository
+from app.repositories.notification_repository import NotificationRepository
 from app.repositories.product_repository import ProductRepository
-from app.schemas import ProductCreate, BulkRestockRequest
-from app.core.exceptions import ProductNotFoundError
+from app.repositories.stock_shard_repository import StockShardRepository
+from app.services.notification_service import NotificationService
+from app.schemas import (
+    BulkRestockRequest,
+    CategoryFacet,
+    ProductCreate,
+    ProductFacets,
+)
+from app.core.exceptions import (
+    InsufficientStockError,
+    InvalidCursorError,
+    ProductAlreadyExistsError,
+    ProductNotFoundError,
+)
+from app.core.pagination import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+LOW_STOCK_THRESHOLD = 10
 
 
 class ProductService:
     """Service layer for product business logic."""
 
-    def __init__(self, repository: ProductRepository) -> None:
+    def __init__(
+        self,
+        repository: ProductRepository,
+        notifications: NotificationService | None = None,
+        inventory: InventoryRepository | None = None,
+        listing: ProductListing | None = None,
+        names: ProductNameIndex | None = None,
+        facets: FacetCache | None = None,
+        shards: StockShardRepository | None = None,
+    ) -> None:
         self.repository = repository
+        self.listing = listing or product_listing
+        self.names = names if names is not None else product_names
+        self.facets = facets or product_facets
+        self.inventory = inventory or InventoryRepository(repository.session)
+        self.shards = shards or StockShardRepository(repository.session)
+        self.notifications = notifications or NotificationService(
+            NotificationRepository(repository.session)
+        )
 
     async def create_product(self, data: ProductCreate) -> Product:
-        """Create a new product."""
+        """Create a new product; its initial stock is the first ledger movement."""
+        if data.sku is not None and await self.repository.get_by_sku(data.sku):
+            raise ProductAlreadyExistsError(data.sku)
         product = Product(
+            sku=data.sku,
             name=data.name,
             description=data.description,
-            price=data.price,
-            stock=data.stock,
+            price_cents=to_cents(data.price),
             category=data.category,
         )
-        return await self.repository.create(product)
+        await self.repository.stage(product)
+        if data.stock:
+            await self.inventory.append(product.id, data.stock, MovementReason.INITIAL)
+        version = await self.repository.bump_catalog_version()
+        product = await self.repository.update(product)
+        self.listing.invalidate()
+        self.names.add(product.id, product.name)
+        self.facets.apply(version, [(product.category, None, product.stock)])
+        return product
 
     async def get_product(self, product_id: int) -> Product:
-        """Get product by ID."""
+        """
+        Get product by ID, served from the shared catalog snapshot when
+        present; stock is always read from the database.
+        """
+        product = catalog_snapshot.get(product_id)
+        if product is not None:
+            stocks = await self.repository.get_stocks([product_id])
+            if product_id in stocks:
+                product.stock = stocks[product_id]
+                return product
         product = await self.repository.get_by_id(product_id)
         if not product:
             raise ProductNotFoundError(product_id)
@@ -33,33 +105,313 @@ class ProductService:
     async def list_products(
         self,
         category: str | None = None,
-        page: int = 1,
-        page_size: int = 20,
-    ) -> tuple[list[Product], int]:
-        """List products with optional filtering."""
-        return await self.repository.get_all(
-            category=category,
-            page=page,
-            page_size=page_size,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> tuple[list[Product], int, str | None]:
+        """
+        One page of products in (name, id) order from the database.
+        Returns (products, total, next_cursor).
+        """
+        category = category or None
+        after = self._decode_listing_cursor(cursor)
+        products = await self.repository.get_page(category, limit + 1, after)
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = encode_cursor(products[-1].name, products[-1].id)
+        return products, await self.listing.total(self.repository, category), next_cursor
+
+    async def list_products_json(
+        self,
+        category: str | None = None,
+        limit: int = 20,
+        cursor: str | None = None,
+    ) -> bytes:
+        """
+        One page of products as ProductPage JSON, sliced from the in-process
+        listing (with live stock) when available, otherwise queried and
+        serialized here.
+        """
+        category = category or None
+        after = self._decode_listing_cursor(cursor)
+        view = await self.listing.view(self.repository)
+        if view is None:
+            products, total, next_cursor = await self.list_products(category, limit, cursor)
+            items = [serialize_product(product) for product in products]
+        else:
+            entries, total, last = view.page(category, limit, after)
+            next_cursor = encode_cursor(*last) if last else None
+            stocks = await self.repository.get_stocks([product_id for product_id, _ in entries])
+            items = [with_stock(item, stocks.get(product_id, 0)) for product_id, item in entries]
+        return page_envelope(items, total, next_cursor)
+
+    @staticmethod
+    def _decode_listing_cursor(cursor: str | None) -> tuple[str, int] | None:
+        if not cursor:
+            return None
+        name, product_id = decode_cursor(cursor, 2)
+        if not isinstance(name, str) or not isinstance(product_id, int):
+            raise InvalidCursorError(cursor)
+        return name, product_id
+
+    async def search_products(self, query: str, limit: int = 20) -> list[Product]:
+        """Full-text search over name and description, best match first."""
+        match = match_query(query)
+        if match is None:
+            return []
+        return await self.repository.search(match, limit)
+
+    async def autocomplete(self, prefix: str, limit: int = 10) -> list[str]:
+        """Product names starting with `prefix`, from the in-process name index."""
+        await self.names.sync(self.repository)
+        return self.names.complete(prefix, limit)
+
+    async def get_facets(self) -> ProductFacets:
+        """Per-category counts and stock buckets from the facet cache."""
+        categories = await self.facets.get(self.repository)
+        items = sorted(categories.items(), key=lambda item: (item[0] is None, item[0] or ""))
+        total = sum(counts.count for _, counts in items)
+        in_stock = sum(counts.in_stock for _, counts in items)
+        return ProductFacets(
+            categories=[
+                CategoryFacet(
+                    category=category,
+                    count=counts.count,
+                    in_stock=counts.in_stock,
+                    low_stock=counts.low_stock,
+                )
+                for category, counts in items
+                if counts.count
+            ],
+            total=total,
+            in_stock=in_stock,
+            low_stock=sum(counts.low_stock for _, counts in items),
+            out_of_stock=total - in_stock,
         )
 
-    async def get_low_stock_items(self, threshold: int = 10) -> list[Product]:
-        """Get products with low stock."""
-        return await self.repository.get_low_stock(threshold)
+    async def get_low_stock_items(
+        self,
+        threshold: int = 10,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[Product], str | None]:
+        """
+        Get one page of products with low stock, lowest first.
+        Returns (products, next_cursor).
+        """
+        after = None
+        if cursor:
+            stock, product_id = decode_cursor(cursor, 2)
+            try:
+                after = (int(stock), int(product_id))
+            except (TypeError, ValueError):
+                raise InvalidCursorError(cursor)
+
+        products = await self.repository.get_low_stock(threshold, limit + 1, after)
+        next_cursor = None
+        if len(products) > limit:
+            products = products[:limit]
+            next_cursor = encode_cursor(products[-1].stock, products[-1].id)
+        return products, next_cursor
 
     async def update_stock(self, product_id: int, new_stock: int) -> Product:
-        """Update product stock."""
-        product = await self.repository.update_stock(product_id, new_stock)
+        """
+        Set product stock by appending the difference to the ledger, raising
+        a low stock alert in the same commit.
+        """
+        product = await self.repository.get_by_id(product_id)
         if not product:
             raise ProductNotFoundError(product_id)
+        old_stock = product.stock
+        delta = new_stock - old_stock
+        if delta:
+            await self.inventory.append(product.id, delta, MovementReason.ADJUSTMENT)
+            if product.stock_shards:
+                await self.shards.reset(product.id, product.stock_shards, new_stock)
+        if new_stock < LOW_STOCK_THRESHOLD:
+            await self.notifications.stage_low_stock_notification(
+                product.id, product.name, new_stock
+            )
+        version = await self.repository.bump_catalog_version()
+        product = await self.repository.update(product)
+        self.listing.invalidate()
+        self.facets.apply(version, [(product.category, old_stock, product.stock)])
         return product
 
     async def bulk_restock(self, data: BulkRestockRequest) -> list[Product]:
-        """Bulk restock multiple products."""
-        updated_products = []
+        """Bulk restock multiple products with one ledger append and one commit."""
+        product_ids = list(dict.fromkeys(item.product_id for item in data.items))
+        found = {p.id: p for p in await self.repository.get_many(product_ids)}
+        for product_id in product_ids:
+            if product_id not in found:
+                raise ProductNotFoundError(product_id)
+        before = {product_id: product.stock for product_id, product in found.items()}
+
+        await self.inventory.append_many([
+            {
+                "product_id": item.product_id,
+                "delta": item.quantity,
+                "reason": MovementReason.RESTOCK.value,
+            }
+            for item in data.items
+        ])
+        added: dict[int, int] = {}
         for item in data.items:
-            product = await self.repository.add_stock(item.product_id, item.quantity)
-            if not product:
-                raise ProductNotFoundError(item.product_id)
-            updated_products.append(product)
-        return updated_products
+            added[item.product_id] = added.get(item.product_id, 0) + item.quantity
+        for product_id, quantity in added.items():
+            if found[product_id].stock_shards:
+                await self.shards.add(product_id, found[product_id].stock_shards, quantity)
+        version = await self.repository.bump_catalog_version()
+        await self.inventory.commit()
+        self.listing.invalidate()
+
+        products = {p.id: p for p in await self.repository.get_many(product_ids)}
+        self.facets.apply(version, [
+            (product.category, before[product.id], product.stock)
+            for product in products.values()
+        ])
+        return [products[item.product_id] for item in data.items]
+
+    async def stage_take_stock(
+        self,
+        product_id: int,
+        quantity: int,
+        reason: MovementReason = MovementReason.ORDER,
+        reference_id: int | None = None,
+    ) -> None:
+        """
+        Stage a stock decrement in the current transaction, never going
+        below zero. Sharded products decrement a random shard; others use a
+        conditional ledger append. On shortage the transaction is rolled
+        back and InsufficientStockError raised.
+
+        Decrements do not bump the catalog version: on a flash-sale SKU that
+        row would become the new hot spot. Cached listings read live stock
+        per page, and cached facets reload their stock buckets after
+        product_facets_stock_ttl_seconds.
+        """
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            raise ProductNotFoundError(product_id)
+        if product.stock_shards:
+            taken = await self.shards.take(product.id, product.stock_shards, quantity)
+            if taken:
+                await self.inventory.append(product.id, -quantity, reason, reference_id)
+        else:
+            taken = await self.inventory.append_if_available(
+                product.id, quantity, reason, reference_id
+            )
+        if not taken:
+            available = product.stock
+            await self.repository.session.rollback()
+            raise InsufficientStockError(product_id, quantity, available)
+
+    async def take_stock(
+        self,
+        product_id: int,
+        quantity: int,
+        reason: MovementReason = MovementReason.ORDER,
+        reference_id: int | None = None,
+    ) -> None:
+        """Decrement stock and commit (see stage_take_stock)."""
+        await self.stage_take_stock(product_id, quantity, reason, reference_id)
+        await self.inventory.commit()
+
+    async def stage_return_stock(
+        self,
+        items: list[tuple[int, int, int | None]],
+        reason: MovementReason,
+    ) -> None:
+        """
+        Stage stock coming back, as (product_id, quantity, reference_id):
+        one ledger insert, plus the shards of sharded products.
+        """
+        await self.inventory.append_many([
+            {
+                "product_id": product_id,
+                "delta": quantity,
+                "reason": reason.value,
+                "reference_id": reference_id,
+            }
+            for product_id, quantity, reference_id in items
+        ])
+        returned: dict[int, int] = {}
+        for product_id, quantity, _ in items:
+            returned[product_id] = returned.get(product_id, 0) + quantity
+        for product in await self.repository.get_many(list(returned)):
+            if product.stock_shards:
+                await self.shards.add(product.id, product.stock_shards, returned[product.id])
+
+    async def set_stock_shards(self, product_id: int, shards: int) -> Product:
+        """
+        Split a hot product's stock across `shards` counters (0 turns
+        sharding off). The shards start from the current stock, so stock
+        is unchanged.
+        """
+        product = await self.repository.get_by_id(product_id)
+        if not product:
+            raise ProductNotFoundError(product_id)
+        await self.shards.reset(product.id, shards, product.stock if shards else 0)
+        product.stock_shards = shards
+        return await self.repository.update(product)
+
+    async def get_stock_history(
+        self,
+        product_id: int,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[InventoryMovement], str | None]:
+        """
+        Get one page of a product's stock movements, newest first.
+        Returns (movements, next_cursor).
+        """
+        before_id = None
+        if cursor:
+            (value,) = decode_cursor(cursor, 1)
+            try:
+                before_id = int(value)
+            except (TypeError, ValueError):
+                raise InvalidCursorError(cursor)
+        if await self.repository.get_by_id(product_id) is None:
+            raise ProductNotFoundError(product_id)
+
+        movements = await self.inventory.get_history(product_id, limit + 1, before_id)
+        next_cursor = None
+        if len(movements) > limit:
+            movements = movements[:limit]
+            next_cursor = encode_cursor(movements[-1].id)
+        return movements, next_cursor
+
+    async def refresh_catalog_snapshot(self) -> int:
+        """Rebuild the shared-memory catalog snapshot; returns its generation."""
+        columns = SnapshotColumns()
+        async for product in self.repository.stream_all():
+            columns.add(product)
+        return catalog_snapshot.publish(columns)
+
+
+async def refresh_catalog_snapshot(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> int:
+    """Rebuild the catalog snapshot from a fresh session."""
+    async with session_factory() as session:
+        service = ProductService(ProductRepository(session))
+        return await service.refresh_catalog_snapshot()
+
+
+async def run_catalog_refresher(
+    session_factory: async_sessionmaker[AsyncSession],
+    interval: float,
+) -> None:
+    """
+    Keep the catalog snapshot fresh.
+    Every worker runs this; whichever finds the snapshot stale rebuilds it.
+    """
+    while True:
+        await asyncio.sleep(interval / 4)
+        age = catalog_snapshot.age()
+        if age is None or age >= interval:
+            try:
+                await refresh_catalog_snapshot(session_factory)
+            except SQLAlchemyError:
+                logger.exception("Catalog snapshot refresh failed")
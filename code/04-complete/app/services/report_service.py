@@ -0,0 +1,84 @@
+"""Report Service - Business Logic Layer."""
+
+from collections import defaultdict
+from datetime import date
+
+from app.core.exceptions import InvalidReportRangeError
+from app.core.money import from_cents
+from app.models import OrderStatus
+from app.repositories.report_repository import ReportRepository
+from app.schemas import (
+    ProductSales,
+    ReportGranularity,
+    SalesPeriod,
+    SalesReport,
+    SalesStatusBreakdown,
+)
+
+
+class ReportService:
+    """Service layer for sales reports served from rollup tables."""
+
+    def __init__(self, repository: ReportRepository) -> None:
+        self.repository = repository
+
+    async def get_sales_report(
+        self,
+        date_from: date,
+        date_to: date,
+        granularity: ReportGranularity = ReportGranularity.DAY,
+        top_products: int = 10,
+    ) -> SalesReport:
+        """Build a sales report for the inclusive date range."""
+        if date_from > date_to:
+            raise InvalidReportRangeError(date_from, date_to)
+
+        rows = await self.repository.get_status_rollups(
+            date_from, date_to, granularity.value
+        )
+        breakdowns: dict[date, list[SalesStatusBreakdown]] = defaultdict(list)
+        for row in rows:
+            breakdowns[row.period].append(
+                SalesStatusBreakdown(
+                    status=row.status,
+                    revenue=from_cents(row.revenue_cents),
+                    order_count=row.order_count,
+                    units=row.units,
+                )
+            )
+
+        periods = []
+        for period_start, by_status in breakdowns.items():
+            counted = [b for b in by_status if b.status != OrderStatus.CANCELLED.value]
+            periods.append(
+                SalesPeriod(
+                    period_start=period_start,
+                    revenue=sum((b.revenue for b in counted), from_cents(0)),
+                    order_count=sum(b.order_count for b in counted),
+                    units=sum(b.units for b in counted),
+                    by_status=by_status,
+                )
+            )
+
+        products = await self.repository.get_top_products(
+            date_from, date_to, top_products
+        )
+        return SalesReport(
+            date_from=date_from,
+            date_to=date_to,
+            granularity=granularity,
+            periods=periods,
+            top_products=[
+                ProductSales(
+                    product_id=row.product_id,
+                    revenue=from_cents(row.revenue_cents),
+                    order_count=row.order_count,
+                    units=row.units,
+                )
+                for row in products
+            ],
+        )
+
+    async def rebuild_rollups(self) -> tuple[int, int]:
+        """Recompute rollups from the order tables."""
+        return await self.repository.rebuild()
@@ -1,16 +1,18 @@
 """User Service - Business Logic Layer."""
 
+from app.core.exceptions import UserAlreadyExistsError, UserNotFoundError
+from app.core.user_ids import UserIdSet, known_users
 from app.models import User
 from app.repositories.user_repository import UserRepository
 from app.schemas import UserCreate
-from app.core.exceptions import UserNotFoundError, UserAlreadyExistsError
 
 
 class UserService:
     """Service layer for user business logic."""
 
-    def __init__(self, repository: UserRepository) -> None:
+    def __init__(self, repository: UserRepository, user_ids: UserIdSet | None = None) -> None:
         self.repository = repository
+        self.user_ids = user_ids if user_ids is not None else known_users
 
     async def create_user(self, data: UserCreate) -> User:
         """Create a new user."""
@@ -23,7 +25,9 @@ class UserService:
             email=data.email,
             name=data.name,
         )
-        return await self.repository.create(user)
+        user = await self.repository.create(user)
+        self.user_ids.add(user.id)
+        return user
 
     async def get_user(self, user_id: int) -> User:
         """Get user by ID."""
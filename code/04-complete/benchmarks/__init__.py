@@ -0,0 +1 @@
+"""Standalone benchmarks (python -m benchmarks.<name>)."""
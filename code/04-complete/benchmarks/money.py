@@ -0,0 +1,132 @@
+"""
+Money representation benchmark: Numeric/Decimal vs integer cents.
+
+Times the three places money is handled per request, once the way they
+worked with Numeric(10, 2) columns and Decimal arithmetic, and once with
+integer cents:
+
+    read      load N prices from SQLite (Numeric vs INTEGER column)
+    price     total N orders of --items line items
+    serialize dump N products as ProductResponse JSON
+
+    python -m benchmarks.money --rows 100000 --items 5
+
+Uses an in-memory SQLite database; each case reports the best of --repeat
+runs.
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import UTC, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+
+from pydantic import BaseModel, ConfigDict
+from sqlalchemy import Column, Integer, MetaData, Numeric, Table, insert, select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.schemas import ProductResponse
+
+
+class DecimalProductResponse(ProductResponse):
+    """ProductResponse as it was before cents: price read as a Decimal."""
+    model_config = ConfigDict(from_attributes=True)
+
+    price: Decimal
+
+
+def best_of(repeat: int, func) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+async def bench_read(rows: int, repeat: int) -> dict:
+    metadata = MetaData()
+    numeric = Table("numeric_prices", metadata, Column("id", Integer, primary_key=True),
+                    Column("price", Numeric(10, 2)))
+    cents = Table("cents_prices", metadata, Column("id", Integer, primary_key=True),
+                  Column("price_cents", Integer))
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(metadata.create_all)
+        await conn.execute(insert(numeric), [
+            {"price": Decimal(i % 100_000) / 100} for i in range(rows)
+        ])
+        await conn.execute(insert(cents), [{"price_cents": i % 100_000} for i in range(rows)])
+
+    timings = {}
+    async with engine.connect() as conn:
+        for name, column in (("decimal", numeric.c.price), ("cents", cents.c.price_cents)):
+            best = float("inf")
+            for _ in range(repeat):
+                started = time.perf_counter()
+                (await conn.execute(select(column))).scalars().all()
+                best = min(best, time.perf_counter() - started)
+            timings[name] = best
+    await engine.dispose()
+    return timings
+
+
+def bench_price(rows: int, items: int, repeat: int) -> dict:
+    decimal_lines = [(Decimal(f"{i % 1000}.99"), 1 + i % 3) for i in range(items)]
+    cents_lines = [(i % 1000 * 100 + 99, 1 + i % 3) for i in range(items)]
+
+    def price_decimal() -> None:
+        for _ in range(rows):
+            total = Decimal("0.00")
+            for unit_price, quantity in decimal_lines:
+                total += Decimal(str(unit_price)) * quantity
+
+    def price_cents() -> None:
+        for _ in range(rows):
+            total = 0
+            for unit_price_cents, quantity in cents_lines:
+                total += unit_price_cents * quantity
+
+    return {"decimal": best_of(repeat, price_decimal), "cents": best_of(repeat, price_cents)}
+
+
+def bench_serialize(rows: int, repeat: int) -> dict:
+    now = datetime.now(UTC)
+    products = [
+        SimpleNamespace(
+            id=i, name=f"Product {i}", description=None, stock=i % 50, category="bench",
+            created_at=now, price=Decimal(i % 100_000) / 100, price_cents=i % 100_000,
+        )
+        for i in range(rows)
+    ]
+
+    def dump(schema: type[BaseModel]):
+        return lambda: [schema.model_validate(p).model_dump_json() for p in products]
+
+    return {
+        "decimal": best_of(repeat, dump(DecimalProductResponse)),
+        "cents": best_of(repeat, dump(ProductResponse)),
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    results = {
+        "read": await bench_read(args.rows, args.repeat),
+        "price": bench_price(args.rows, args.items, args.repeat),
+        "serialize": bench_serialize(args.rows, args.repeat),
+    }
+    print(f"{'case':>10} | {'decimal ms':>12} | {'cents ms':>12} | {'speedup':>8}")
+    for case, timings in results.items():
+        print(
+            f"{case:>10} | {timings['decimal'] * 1000:>12.1f} | "
+            f"{timings['cents'] * 1000:>12.1f} | {timings['decimal'] / timings['cents']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
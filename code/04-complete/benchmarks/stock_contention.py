@@ -0,0 +1,136 @@
+"""
+Stock contention benchmark: single-row vs sharded decrements.
+
+Runs concurrent buyers against one product through ProductService.take_stock,
+once with the product unsharded (conditional ledger append) and once with
+its stock split across shards, and reports throughput, latency and whether
+the final stock matches the units sold.
+
+    python -m benchmarks.stock_contention --buyers 32 --orders 4000 --shards 8
+
+Uses a temporary file-backed SQLite database in WAL mode. SQLite admits one
+writer at a time, so here the shards mostly shorten each write; on a
+row-locking database (PostgreSQL, MySQL) they also remove the row lock
+every buyer would otherwise queue on.
+"""
+
+import argparse
+import asyncio
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.core.exceptions import InsufficientStockError
+from app.repositories.product_repository import ProductRepository
+from app.schemas import ProductCreate
+from app.services.product_service import ProductService
+
+
+async def run_case(
+    session_factory: async_sessionmaker[AsyncSession],
+    shards: int,
+    buyers: int,
+    orders: int,
+    stock: int,
+) -> dict:
+    async with session_factory() as session:
+        service = ProductService(ProductRepository(session))
+        product = await service.create_product(ProductCreate(
+            name=f"Flash {shards}", price="1.00", stock=stock,
+        ))
+        if shards:
+            await service.set_stock_shards(product.id, shards)
+
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for i in range(orders):
+        queue.put_nowait(i)
+    latencies: list[float] = []
+    counts = {"sold": 0, "sold_out": 0, "retries": 0}
+
+    async def buyer() -> None:
+        while True:
+            try:
+                queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            started = time.perf_counter()
+            while True:
+                async with session_factory() as session:
+                    service = ProductService(ProductRepository(session))
+                    try:
+                        await service.take_stock(product.id, 1)
+                        counts["sold"] += 1
+                    except InsufficientStockError:
+                        counts["sold_out"] += 1
+                    except OperationalError:
+                        counts["retries"] += 1
+                        continue
+                break
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(buyer() for _ in range(buyers)))
+    elapsed = time.perf_counter() - started
+
+    async with session_factory() as session:
+        remaining = (await ProductRepository(session).get_by_id(product.id)).stock
+
+    latencies.sort()
+    return {
+        "mode": f"{shards} shards" if shards else "single row",
+        "orders/s": orders / elapsed,
+        "p50 ms": statistics.median(latencies) * 1000,
+        "p99 ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "retries": counts["retries"],
+        "sold": counts["sold"],
+        "consistent": counts["sold"] + remaining == stock and remaining >= 0,
+    }
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        url = f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        engine = create_async_engine(url, pool_size=args.buyers, max_overflow=0)
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            cursor.execute("PRAGMA journal_mode=WAL")
+            cursor.execute("PRAGMA synchronous=NORMAL")
+            cursor.execute("PRAGMA busy_timeout=5000")
+            cursor.close()
+
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+        # Stock covers only part of the orders, so the run also checks that
+        # concurrent buyers never oversell once the product sells out
+        stock = args.orders * 3 // 4
+        rows = [
+            await run_case(session_factory, shards, args.buyers, args.orders, stock)
+            for shards in (0, args.shards)
+        ]
+        await engine.dispose()
+
+    columns = list(rows[0])
+    print(" | ".join(f"{c:>12}" for c in columns))
+    for row in rows:
+        print(" | ".join(
+            f"{row[c]:>12.1f}" if isinstance(row[c], float) else f"{row[c]!s:>12}"
+            for c in columns
+        ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--buyers", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--shards", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -5,13 +5,16 @@ Lab 4 Complete: Test setup with async database.
 
 import pytest
 import pytest_asyncio
-from decimal import Decimal
 from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 
 from app.main import app
 from app.core.database import Base, get_async_session
-from app.models import Order, OrderItem, OrderStatus
+from app.core.product_autocomplete import product_names
+from app.core.product_facets import product_facets
+from app.core.product_listing import product_listing
+from app.core.user_ids import known_users
+from app.models import Order, OrderItem, OrderStatus, User
 
 
 # Test database URL (in-memory SQLite)
@@ -23,6 +26,20 @@ def anyio_backend():
     return "asyncio"
 
 
+@pytest.fixture(autouse=True)
+def reset_product_caches():
+    """Each test gets a fresh database, so drop the in-process caches."""
+    product_listing.clear()
+    product_names.clear()
+    product_facets.clear()
+    known_users.clear()
+    yield
+    product_listing.clear()
+    product_names.clear()
+    product_facets.clear()
+    known_users.clear()
+
+
 @pytest_asyncio.fixture
 async def test_engine():
     """Create test database engine."""
@@ -71,20 +88,32 @@ async def client(test_session):
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def customers(test_session) -> list[User]:
+    """Create users 1 and 2 to place orders."""
+    users = [
+        User(email="ann@example.com", name="Ann"),
+        User(email="bob@example.com", name="Bob"),
+    ]
+    test_session.add_all(users)
+    await test_session.commit()
+    return users
+
+
 @pytest_asyncio.fixture
 async def sample_order(test_session) -> Order:
     """Create a sample order for testing."""
     order = Order(
         user_id=1,
         status=OrderStatus.PENDING.value,
-        total=Decimal("149.98"),
+        total_cents=14998,
         shipping_address="123 Test St"
     )
     order.items.append(OrderItem(
         product_id=1,
         product_name="Test Product",
         quantity=2,
-        unit_price=Decimal("74.99")
+        unit_price_cents=7499
     ))
     
     test_session.add(order)
@@ -103,14 +132,14 @@ async def multiple_orders(test_session) -> list[Order]:
         order = Order(
             user_id=1 if i < 3 else 2,
             status=OrderStatus.PENDING.value if i < 2 else OrderStatus.CONFIRMED.value,
-            total=Decimal(f"{100 + i * 50}.00"),
+            total_cents=(100 + i * 50) * 100,
             shipping_address=f"Address {i+1}"
         )
         order.items.append(OrderItem(
             product_id=i + 1,
             product_name=f"Product {i+1}",
             quantity=1,
-            unit_price=Decimal(f"{100 + i * 50}.00")
+            unit_price_cents=(100 + i * 50) * 100
         ))
         orders.append(order)
     
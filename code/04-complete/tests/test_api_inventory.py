@@ -0,0 +1,72 @@
+"""
+Integration Tests for Inventory API
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.models import Product
+
+
+@pytest_asyncio.fixture
+async def stocked_products(test_session) -> list[Product]:
+    """Products around the default threshold of 10 (two tie on stock 3)."""
+    stocks = [0, 3, 3, 5, 9, 10, 14]
+    products = [
+        Product(name=f"Product {i}", price_cents=100, stock=stock)
+        for i, stock in enumerate(stocks)
+    ]
+    test_session.add_all(products)
+    await test_session.commit()
+    return products
+
+
+class TestLowStockAPI:
+    """Tests for GET /api/v1/inventory/low-stock."""
+
+    @pytest.mark.asyncio
+    async def test_pages_follow_next_cursor(self, client, stocked_products):
+        """Pages should walk (stock, id) order without gaps or repeats."""
+        seen = []
+        params = {"threshold": 10, "limit": 2}
+        while True:
+            response = await client.get("/api/v1/inventory/low-stock", params=params)
+            assert response.status_code == 200
+            seen.extend((item["stock"], item["id"]) for item in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+            params["cursor"] = cursor
+
+        expected = sorted((p.stock, p.id) for p in stocked_products if p.stock < 10)
+        assert seen == expected
+
+    @pytest.mark.asyncio
+    async def test_last_page_has_no_cursor(self, client, stocked_products):
+        """A page holding every match should not advertise a next cursor."""
+        response = await client.get("/api/v1/inventory/low-stock")
+
+        assert len(response.json()) == 5
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, client):
+        """Should return 400 for a malformed cursor."""
+        response = await client.get(
+            "/api/v1/inventory/low-stock", params={"cursor": "bogus"}
+        )
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_query_uses_stock_index(self, test_session):
+        """The low-stock query should be an index range scan, not a table scan."""
+        rows = await test_session.execute(text(
+            "EXPLAIN QUERY PLAN SELECT * FROM products "
+            "WHERE stock < 10 ORDER BY stock, id LIMIT 100"
+        ))
+        plan = " ".join(row[-1] for row in rows)
+
+        assert "idx_product_stock_id" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,133 @@
+"""
+Integration Tests for Notifications API
+"""
+
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models import Notification, NotificationType
+
+
+@pytest_asyncio.fixture
+async def pending_notifications(test_session) -> list[Notification]:
+    """Create pending notifications for pagination testing."""
+    notifications = [
+        Notification(
+            type=NotificationType.ORDER_CREATED.value,
+            recipient_id=1,
+            subject="Order Created",
+            message=f"Order {i} created",
+            reference_id=i,
+        )
+        for i in range(5)
+    ]
+    test_session.add_all(notifications)
+    await test_session.commit()
+    return notifications
+
+
+class TestPendingNotificationsAPI:
+    """Tests for GET /api/v1/notifications/pending."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_pagination(self, client, pending_notifications):
+        """Pages should follow next_cursor without gaps or repeats."""
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 2}
+            if cursor:
+                params["cursor"] = cursor
+            response = await client.get("/api/v1/notifications/pending", params=params)
+            assert response.status_code == 200
+            data = response.json()
+            assert data["total"] == 5
+            seen.extend(item["id"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [n.id for n in pending_notifications]
+
+    @pytest.mark.asyncio
+    async def test_total_tracks_status_changes(self, client, pending_notifications):
+        """Counter-backed total should drop when a notification is sent."""
+        await client.put(f"/api/v1/notifications/{pending_notifications[0].id}/sent")
+
+        response = await client.get("/api/v1/notifications/pending")
+
+        assert response.json()["total"] == 4
+        assert len(response.json()["items"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_urgent_lane_listed_first(self, client, test_session, pending_notifications):
+        """Order notifications should precede older admin alerts, and lane should filter."""
+        alert = Notification(
+            type=NotificationType.LOW_STOCK.value,
+            recipient_id=0,
+            subject="Low Stock Alert",
+            message="Widget is low",
+            created_at=datetime(2020, 1, 1),
+        )
+        test_session.add(alert)
+        await test_session.commit()
+
+        response = await client.get("/api/v1/notifications/pending")
+        items = response.json()["items"]
+        assert items[-1]["id"] == alert.id
+        assert items[-1]["lane"] == "admin"
+        assert items[0]["lane"] == "transactional"
+
+        response = await client.get("/api/v1/notifications/pending", params={"lane": "admin"})
+        assert [item["id"] for item in response.json()["items"]] == [alert.id]
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, client):
+        """Should return 400 for a malformed cursor."""
+        response = await client.get(
+            "/api/v1/notifications/pending", params={"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == 400
+
+
+class TestBulkMarkSentAPI:
+    """Tests for PUT /api/v1/notifications/sent."""
+
+    @pytest.mark.asyncio
+    async def test_bulk_mark_sent(self, client, test_session, pending_notifications):
+        """Should update found ids in one call and report missing ones."""
+        first, second = pending_notifications[0], pending_notifications[1]
+        response = await client.put("/api/v1/notifications/sent", json={
+            "items": [
+                {"id": first.id, "sent_at": "2025-01-01T10:00:00"},
+                {"id": second.id},
+                {"id": 99999},
+            ]
+        })
+
+        assert response.status_code == 200
+        assert response.json() == {"updated_count": 2, "not_found_ids": [99999]}
+
+        pending = await client.get("/api/v1/notifications/pending")
+        assert pending.json()["total"] == 3
+        rows = await test_session.execute(
+            select(Notification)
+            .where(Notification.id.in_([first.id, second.id]))
+            .order_by(Notification.id)
+            .execution_options(populate_existing=True)
+        )
+        first_row, second_row = rows.scalars().all()
+        assert first_row.sent_at == datetime(2025, 1, 1, 10, 0)
+        assert second_row.sent_at is not None
+        assert second_row.status == "sent"
+
+    @pytest.mark.asyncio
+    async def test_bulk_mark_sent_requires_items(self, client):
+        """Should return 422 for an empty list."""
+        response = await client.put("/api/v1/notifications/sent", json={"items": []})
+
+        assert response.status_code == 422
@@ -10,7 +10,7 @@ class TestCreateOrderAPI:
     """Tests for POST /api/v1/orders."""
     
     @pytest.mark.asyncio
-    async def test_create_order_success(self, client):
+    async def test_create_order_success(self, client, customers):
         """Should create order and return 201."""
         response = await client.post("/api/v1/orders", json={
             "user_id": 1,
@@ -156,3 +156,15 @@ class TestHealthAPI:
         data = response.json()
         assert data["status"] == "healthy"
         assert data["service"] == "order-service"
+
+    @pytest.mark.asyncio
+    async def test_readiness_check(self, client):
+        """Should report pool and database status."""
+        response = await client.get("/api/v1/health/ready")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["database"]["reachable"] is True
+        assert data["database"]["writer_queue_depth"] >= 0
+        assert "checked_out" in data["pool"]
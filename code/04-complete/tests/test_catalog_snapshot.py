@@ -0,0 +1,111 @@
+"""
+Unit Tests for the Shared-Memory Catalog Snapshot
+"""
+
+import os
+from datetime import datetime
+
+import pytest
+
+from app.core.catalog_snapshot import CatalogSnapshot
+from app.models import Product
+from app.repositories.product_repository import ProductRepository
+from app.schemas import ProductCreate
+from app.services import product_service
+from app.services.product_service import ProductService
+
+
+@pytest.fixture
+def snapshot_name():
+    """Unique segment name per test; segments are removed afterwards."""
+    name = f"shopfast_test_{os.getpid()}_{id(object())}"
+    yield name
+    CatalogSnapshot(name).unlink()
+
+
+def _products() -> list[Product]:
+    created = datetime(2025, 1, 2, 3, 4, 5)
+    return [
+        Product(id=1, name="Laptop", description="Fast", price_cents=129999,
+                stock=5, category="electronics", created_at=created),
+        Product(id=7, name="Chair", description=None, price_cents=29999,
+                stock=20, category=None, created_at=created),
+    ]
+
+
+class TestCatalogSnapshot:
+    """Tests for publishing and reading the columnar snapshot."""
+
+    def test_get_round_trips_all_fields(self, snapshot_name):
+        """Products read back should match what was published."""
+        writer = CatalogSnapshot(snapshot_name)
+        writer.publish(_products())
+
+        reader = CatalogSnapshot(snapshot_name)
+        laptop = reader.get(1)
+        chair = reader.get(7)
+
+        assert laptop.name == "Laptop"
+        assert laptop.price_cents == 129999
+        assert laptop.category == "electronics"
+        assert laptop.created_at == datetime(2025, 1, 2, 3, 4, 5)
+        assert chair.description is None
+        assert chair.category is None
+        assert reader.get(3) is None
+        assert reader.price_of(7) == ("Chair", 29999)
+        reader.close()
+        writer.close()
+
+    def test_stock_is_not_stored(self, snapshot_name):
+        """Snapshot products should carry no stock; it changes on every order."""
+        writer = CatalogSnapshot(snapshot_name)
+        writer.publish(_products())
+
+        assert writer.get(1).stock_snapshot is None
+        writer.close()
+
+    def test_reader_detects_new_generation(self, snapshot_name):
+        """Readers should remap after a refresh bumps the generation."""
+        writer = CatalogSnapshot(snapshot_name)
+        assert writer.publish(_products()) == 1
+        reader = CatalogSnapshot(snapshot_name)
+        assert reader.get(1).name == "Laptop"
+
+        renamed = _products()
+        renamed[0].name = "Laptop Pro"
+        assert writer.publish(renamed) == 2
+
+        assert reader.generation == 2
+        assert reader.get(1).name == "Laptop Pro"
+        reader.close()
+        writer.close()
+
+    def test_disabled_snapshot_returns_nothing(self, snapshot_name):
+        """A disabled snapshot should never attach."""
+        CatalogSnapshot(snapshot_name).publish(_products())
+
+        assert CatalogSnapshot(snapshot_name, enabled=False).get(1) is None
+
+
+class TestSnapshotReads:
+    """Tests for ProductService reads served from the snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_get_product_reads_live_stock(
+        self, snapshot_name, test_session, monkeypatch
+    ):
+        """Stock taken after publishing should show in snapshot-served products."""
+        snapshot = CatalogSnapshot(snapshot_name)
+        monkeypatch.setattr(product_service, "catalog_snapshot", snapshot)
+        service = ProductService(ProductRepository(test_session))
+        product = await service.create_product(
+            ProductCreate(name="Lamp", price="19.99", stock=10)
+        )
+        await service.refresh_catalog_snapshot()
+
+        await service.take_stock(product.id, 4)
+        served = await service.get_product(product.id)
+
+        assert served is not product  # built from the snapshot
+        assert (served.name, served.price_cents, served.stock) == ("Lamp", 1999, 6)
+        snapshot.close()
@@ -0,0 +1,125 @@
+"""
+Tests for the Inventory Ledger
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+
+from app.models import InventoryMovement, Product
+from app.repositories.inventory_repository import InventoryRepository
+from app.services.inventory_compaction import InventoryCompactionService
+
+
+@pytest_asyncio.fixture
+async def product_id(client) -> int:
+    """Create a product through the API with 20 units."""
+    response = await client.post("/api/v1/products", json={
+        "name": "Widget",
+        "price": "9.99",
+        "stock": 20,
+        "category": "tools",
+    })
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+async def history(client, product_id: int, **params) -> dict:
+    response = await client.get(f"/api/v1/inventory/{product_id}/history", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+class TestInventoryLedger:
+    """Tests for ledger-backed stock writes."""
+
+    @pytest.mark.asyncio
+    async def test_initial_stock_is_a_movement(self, client, product_id):
+        """Creating a product should record its initial stock in the ledger."""
+        data = await history(client, product_id)
+
+        assert [(m["delta"], m["reason"]) for m in data["items"]] == [(20, "initial")]
+        response = await client.get(f"/api/v1/products/{product_id}")
+        assert response.json()["stock"] == 20
+
+    @pytest.mark.asyncio
+    async def test_writes_append_movements(self, client, product_id):
+        """Set and restock should append deltas, newest first in history."""
+        await client.put(f"/api/v1/inventory/{product_id}", json={"stock": 15})
+        response = await client.post("/api/v1/inventory/restock", json={
+            "items": [{"product_id": product_id, "quantity": 7}],
+        })
+        assert response.json()["items"][0]["stock"] == 22
+
+        data = await history(client, product_id)
+        assert [(m["delta"], m["reason"]) for m in data["items"]] == [
+            (7, "restock"), (-5, "adjustment"), (20, "initial"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_restock_unknown_product_writes_nothing(
+        self, client, test_session, product_id
+    ):
+        """A restock naming a missing product should 404 before appending anything."""
+        response = await client.post("/api/v1/inventory/restock", json={
+            "items": [
+                {"product_id": product_id, "quantity": 5},
+                {"product_id": 99999, "quantity": 5},
+            ],
+        })
+
+        assert response.status_code == 404
+        count = await test_session.scalar(select(func.count(InventoryMovement.id)))
+        assert count == 1
+
+    @pytest.mark.asyncio
+    async def test_history_pagination(self, client, product_id):
+        """History pages should follow next_cursor."""
+        for stock in (18, 16, 14):
+            await client.put(f"/api/v1/inventory/{product_id}", json={"stock": stock})
+
+        first = await history(client, product_id, limit=3)
+        second = await history(client, product_id, limit=3, cursor=first["next_cursor"])
+
+        assert len(first["items"]) == 3
+        assert [m["reason"] for m in second["items"]] == ["initial"]
+        assert second["next_cursor"] is None
+
+    @pytest.mark.asyncio
+    async def test_history_unknown_product_returns_404(self, client):
+        """Should return 404 for a missing product."""
+        response = await client.get("/api/v1/inventory/99999/history")
+
+        assert response.status_code == 404
+
+
+class TestInventoryCompaction:
+    """Tests for folding movements into the stock snapshot."""
+
+    @pytest.mark.asyncio
+    async def test_compaction_folds_pending_deltas(self, client, test_session, product_id):
+        """Compaction should move pending deltas into the snapshot, keeping stock."""
+        await client.put(f"/api/v1/inventory/{product_id}", json={"stock": 12})
+        service = InventoryCompactionService(InventoryRepository(test_session))
+
+        assert await service.compact(batch_size=1) == 2
+        assert await service.compact() == 0
+
+        product = await test_session.get(Product, product_id, populate_existing=True)
+        assert product.stock_snapshot == 12
+        assert product.pending_delta == 0
+        assert product.stock == 12
+        assert len((await history(client, product_id))["items"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_low_stock_sees_uncompacted_movements(
+        self, client, test_session, product_id
+    ):
+        """A product whose snapshot is high but pending deltas drop it should be low."""
+        service = InventoryCompactionService(InventoryRepository(test_session))
+        await service.compact()
+        await client.put(f"/api/v1/inventory/{product_id}", json={"stock": 4})
+
+        response = await client.get("/api/v1/inventory/low-stock")
+
+        assert [(item["id"], item["stock"]) for item in response.json()] == [(product_id, 4)]
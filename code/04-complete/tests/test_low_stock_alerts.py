@@ -0,0 +1,100 @@
+"""
+Tests for coalesced low stock alerts
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.models import Notification, NotificationStatus, NotificationType, Product
+from app.repositories.notification_repository import NotificationRepository
+from app.services.notification_service import NotificationService
+
+
+@pytest_asyncio.fixture
+async def product(test_session) -> Product:
+    """Create a product that is well stocked."""
+    product = Product(name="Widget", price_cents=999, stock=50, category="tools")
+    test_session.add(product)
+    await test_session.commit()
+    await test_session.refresh(product)
+    return product
+
+
+async def low_stock_alerts(session) -> list[Notification]:
+    result = await session.execute(
+        select(Notification)
+        .where(Notification.type == NotificationType.LOW_STOCK.value)
+        .order_by(Notification.id)
+    )
+    return list(result.scalars().all())
+
+
+class TestLowStockCoalescing:
+    """Tests for one pending low stock alert per product and window."""
+
+    @pytest.mark.asyncio
+    async def test_stock_update_raises_alert(self, client, test_session, product):
+        """Dropping below the threshold should create a pending alert."""
+        response = await client.put(f"/api/v1/inventory/{product.id}", json={"stock": 3})
+        assert response.status_code == 200
+
+        alerts = await low_stock_alerts(test_session)
+        assert len(alerts) == 1
+        assert alerts[0].reference_id == product.id
+        assert alerts[0].occurrences == 1
+        assert "3 units" in alerts[0].message
+
+    @pytest.mark.asyncio
+    async def test_repeats_coalesce_in_place(self, client, test_session, product):
+        """Repeated alerts should update the pending row instead of adding rows."""
+        for stock in (8, 5, 2):
+            await client.put(f"/api/v1/inventory/{product.id}", json={"stock": stock})
+
+        alerts = await low_stock_alerts(test_session)
+        assert len(alerts) == 1
+        assert alerts[0].occurrences == 3
+        assert "2 units" in alerts[0].message
+
+        response = await client.get("/api/v1/notifications/pending")
+        assert response.json()["total"] == 1
+
+    @pytest.mark.asyncio
+    async def test_sent_alert_is_not_reused(self, client, test_session, product):
+        """Once the pending alert is sent, the next alert should start a new row."""
+        await client.put(f"/api/v1/inventory/{product.id}", json={"stock": 5})
+        [alert] = await low_stock_alerts(test_session)
+        await client.put(f"/api/v1/notifications/{alert.id}/sent")
+
+        await client.put(f"/api/v1/inventory/{product.id}", json={"stock": 4})
+
+        alerts = await low_stock_alerts(test_session)
+        assert [a.status for a in alerts] == [
+            NotificationStatus.SENT.value,
+            NotificationStatus.PENDING.value,
+        ]
+
+    @pytest.mark.asyncio
+    async def test_healthy_stock_raises_no_alert(self, client, test_session, product):
+        """Stock at or above the threshold should not raise an alert."""
+        await client.put(f"/api/v1/inventory/{product.id}", json={"stock": 10})
+        assert await low_stock_alerts(test_session) == []
+
+    @pytest.mark.asyncio
+    async def test_new_window_starts_new_alert(self, test_session, product):
+        """Alerts in different windows should not coalesce."""
+        now = datetime.now(UTC)
+        first = NotificationService.build_low_stock_notification(
+            product.id, product.name, 5, now
+        )
+        later = NotificationService.build_low_stock_notification(
+            product.id, product.name, 4, now + timedelta(days=1)
+        )
+        assert first.dedupe_key != later.dedupe_key
+
+        repository = NotificationRepository(test_session)
+        await repository.create_coalesced(first)
+        await repository.create_coalesced(later)
+        assert len(await low_stock_alerts(test_session)) == 2
@@ -0,0 +1,180 @@
+"""
+Tests for Schema Migrations
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import inspect, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core import database
+from app.core.database import Base
+from app.core.migrations import run_migrations
+from app.models import Notification, NotificationCounter, NotificationLane, Product
+from app.models.notification import LANE_PRIORITY
+
+
+class TestMoneyToCents:
+    """Tests for the Numeric-to-integer-cents money migration."""
+
+    @pytest.mark.asyncio
+    async def test_numeric_columns_become_cents(self):
+        """Old Numeric(10, 2) amounts should be copied to cents and dropped."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.execute(text(
+                "CREATE TABLE products (id INTEGER PRIMARY KEY, name VARCHAR(200), "
+                "price NUMERIC(10, 2) NOT NULL)"
+            ))
+            await conn.execute(text(
+                "CREATE TABLE orders (id INTEGER PRIMARY KEY, total NUMERIC(10, 2))"
+            ))
+            await conn.execute(text(
+                "INSERT INTO products (name, price) VALUES ('Lamp', 19.99), ('Desk', 0.29)"
+            ))
+            await conn.execute(text("INSERT INTO orders (total) VALUES (1399.97)"))
+
+            await conn.run_sync(run_migrations)
+            await conn.run_sync(run_migrations)
+
+            prices = await conn.execute(text("SELECT price_cents FROM products ORDER BY id"))
+            totals = await conn.execute(text("SELECT total_cents FROM orders"))
+            columns = await conn.run_sync(
+                lambda sync: {c["name"] for c in inspect(sync).get_columns("products")}
+            )
+        await engine.dispose()
+
+        assert prices.scalars().all() == [1999, 29]
+        assert totals.scalars().all() == [139997]
+        assert "price" not in columns
+
+    @pytest.mark.asyncio
+    async def test_fresh_schema_is_untouched(self):
+        """A database created from the current models should need no migration."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            before = await conn.run_sync(
+                lambda sync: [c["name"] for c in inspect(sync).get_columns("products")]
+            )
+            await conn.run_sync(run_migrations)
+            after = await conn.run_sync(
+                lambda sync: [c["name"] for c in inspect(sync).get_columns("products")]
+            )
+        await engine.dispose()
+
+        assert before == after
+
+
+# Schema as created by the models before SKUs, dispatcher columns and cents
+BASELINE_SCHEMA = (
+    (
+        "CREATE TABLE users (id INTEGER NOT NULL, email VARCHAR(120) NOT NULL, "
+        "name VARCHAR(100) NOT NULL, created_at DATETIME NOT NULL, PRIMARY KEY (id))"
+    ),
+    (
+        "CREATE TABLE products (id INTEGER NOT NULL, name VARCHAR(200) NOT NULL, "
+        "description TEXT, price NUMERIC(10, 2) NOT NULL, stock INTEGER NOT NULL, "
+        "category VARCHAR(50), created_at DATETIME NOT NULL, PRIMARY KEY (id))"
+    ),
+    "CREATE INDEX ix_products_category ON products (category)",
+    (
+        "CREATE TABLE notifications (id INTEGER NOT NULL, type VARCHAR(50) NOT NULL, "
+        "recipient_id INTEGER NOT NULL, subject VARCHAR(200) NOT NULL, message TEXT NOT NULL, "
+        "status VARCHAR(20) NOT NULL, reference_id INTEGER, created_at DATETIME NOT NULL, "
+        "sent_at DATETIME, PRIMARY KEY (id))"
+    ),
+    "CREATE INDEX idx_notification_status_created ON notifications (status, created_at)",
+    (
+        "CREATE TABLE orders (id INTEGER NOT NULL, user_id INTEGER NOT NULL, "
+        "status VARCHAR(20) NOT NULL, total NUMERIC(10, 2) NOT NULL, "
+        "shipping_address VARCHAR(500), notes VARCHAR(1000), created_at DATETIME NOT NULL, "
+        "updated_at DATETIME NOT NULL, PRIMARY KEY (id), "
+        "FOREIGN KEY(user_id) REFERENCES users (id))"
+    ),
+    (
+        "CREATE TABLE order_items (id INTEGER NOT NULL, order_id INTEGER NOT NULL, "
+        "product_id INTEGER NOT NULL, product_name VARCHAR(200) NOT NULL, "
+        "quantity INTEGER NOT NULL, unit_price NUMERIC(10, 2) NOT NULL, PRIMARY KEY (id), "
+        "FOREIGN KEY(order_id) REFERENCES orders (id) ON DELETE CASCADE)"
+    ),
+    (
+        "INSERT INTO products (name, price, stock, created_at) "
+        "VALUES ('Lamp', 19.99, 5, '2024-01-01 00:00:00')"
+    ),
+    (
+        "INSERT INTO notifications (type, recipient_id, subject, message, status, created_at) "
+        "VALUES ('order_created', 1, 'Order', 'Placed', 'pending', '2024-01-01 00:00:00'), "
+        "('low_stock', 0, 'Low', 'Stock', 'pending', '2024-01-01 00:00:00')"
+    ),
+)
+
+
+class TestBaselineUpgrade:
+    """Tests for upgrading a database created before the added columns."""
+
+    @pytest_asyncio.fixture
+    async def baseline_engine(self, monkeypatch):
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            for statement in BASELINE_SCHEMA:
+                await conn.execute(text(statement))
+        monkeypatch.setattr(database, "engine", engine)
+        yield engine
+        await engine.dispose()
+
+    @pytest.mark.asyncio
+    async def test_init_models_upgrades_baseline(self, baseline_engine):
+        """init_models should add every missing column and index, twice safely."""
+        await database.init_models()
+        await database.init_models()
+
+        async with baseline_engine.connect() as conn:
+            schema = await conn.run_sync(lambda sync: {
+                table: (
+                    {c["name"] for c in inspect(sync).get_columns(table)},
+                    {i["name"] for i in inspect(sync).get_indexes(table)},
+                )
+                for table in ("products", "notifications")
+            })
+        for table in (Product.__table__, Notification.__table__):
+            columns, indexes = schema[table.name]
+            assert columns == set(table.columns.keys())
+            assert {index.name for index in table.indexes} <= indexes
+
+    @pytest.mark.asyncio
+    async def test_upgraded_rows_are_usable(self, baseline_engine):
+        """Old rows should load through the models with their new defaults."""
+        await database.init_models()
+        session_factory = async_sessionmaker(baseline_engine, expire_on_commit=False)
+
+        async with session_factory() as session:
+            product = (await session.execute(select(Product))).scalar_one()
+            priorities = dict((await session.execute(
+                select(Notification.type, Notification.priority)
+            )).all())
+            session.add(Product(name="Desk", sku="DESK-1", price_cents=100, stock=1))
+            await session.commit()
+
+        assert (product.sku, product.price_cents, product.stock_shards) == (None, 1999, 0)
+        assert priorities == {
+            "order_created": LANE_PRIORITY[NotificationLane.TRANSACTIONAL],
+            "low_stock": LANE_PRIORITY[NotificationLane.ADMIN],
+        }
+
+    @pytest.mark.asyncio
+    async def test_counters_cover_existing_rows(self, baseline_engine):
+        """Counter triggers should be installed and counters start from existing rows."""
+        await database.init_models()
+        await database.init_models()
+        session_factory = async_sessionmaker(baseline_engine, expire_on_commit=False)
+
+        async with session_factory() as session:
+            await session.execute(text(
+                "UPDATE notifications SET status = 'sent' WHERE type = 'low_stock'"
+            ))
+            counters = dict((await session.execute(
+                select(NotificationCounter.status, NotificationCounter.count)
+            )).all())
+
+        assert counters == {"pending": 1, "sent": 1}
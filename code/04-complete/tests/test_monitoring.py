@@ -0,0 +1,50 @@
+"""
+Unit Tests for Database Monitoring
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.core.monitoring import DatabaseMonitor, PoolStats
+from app.models import Notification
+
+
+class TestDatabaseMonitor:
+    """Tests for statement instrumentation and the cached probe."""
+
+    @pytest.mark.asyncio
+    async def test_write_statements_are_tracked(self, test_engine, test_session):
+        """Writes should be timed and leave no queued writers behind."""
+        monitor = DatabaseMonitor(probe_ttl=60)
+        monitor.instrument(test_engine)
+
+        test_session.add(Notification(type="restock", recipient_id=0, subject="s", message="m"))
+        await test_session.commit()
+
+        lock_wait_max, _ = monitor.lock_wait_ms()
+        assert monitor.writer_queue_depth == 0
+        assert lock_wait_max > 0
+        assert monitor.last_latency_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_probe_is_cached(self, test_engine, test_session):
+        """Probe should not query again within the TTL."""
+        monitor = DatabaseMonitor(probe_ttl=60)
+        statements = []
+        event.listen(
+            test_engine.sync_engine,
+            "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+
+        await monitor.probe(test_session)
+        await monitor.probe(test_session)
+
+        assert statements == ["SELECT 1"]
+        assert monitor.probe_age() is not None
+
+    def test_pool_exhaustion(self):
+        """Pool is exhausted only when size plus overflow are checked out."""
+        assert PoolStats(size=5, checked_out=15, overflow=10, max_overflow=10).exhausted
+        assert not PoolStats(size=5, checked_out=3, overflow=-2, max_overflow=10).exhausted
+        assert not PoolStats(size=None, checked_out=None, overflow=None, max_overflow=None).exhausted
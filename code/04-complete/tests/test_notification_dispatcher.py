@@ -0,0 +1,368 @@
+"""
+Tests for the Background Notification Dispatcher
+"""
+
+import asyncio
+import contextlib
+import io
+import json
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.models import Notification, NotificationStatus, NotificationType
+from app.repositories.notification_repository import NotificationRepository
+from app.services.notification_dispatcher import (
+    FileSender,
+    NotificationDispatcher,
+    OutboundMessage,
+    StreamSender,
+)
+
+
+class FailingSender:
+    """Sender that always fails."""
+
+    async def send(self, message: OutboundMessage) -> None:
+        raise ConnectionError("smtp unavailable")
+
+
+class BrokenSender:
+    """Sender with a bug: raises something other than a delivery error."""
+
+    async def send(self, message: OutboundMessage) -> None:
+        raise RuntimeError("template bug")
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def pending_notifications(test_session) -> list[Notification]:
+    notifications = [
+        Notification(
+            type=NotificationType.ORDER_SHIPPED.value,
+            recipient_id=i,
+            subject="Order Shipped",
+            message=f"Order {i} shipped",
+            reference_id=i,
+        )
+        for i in range(1, 4)
+    ]
+    test_session.add_all(notifications)
+    await test_session.commit()
+    return notifications
+
+
+async def _statuses(session_factory) -> list[tuple[str, int]]:
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(Notification.status, Notification.attempts).order_by(Notification.id)
+        )
+        return [tuple(row) for row in rows]
+
+
+class TestNotificationDispatcher:
+    """Tests for claiming, delivery and settlement."""
+
+    @pytest.mark.asyncio
+    async def test_delivers_and_marks_sent(self, session_factory, pending_notifications):
+        """Claimed notifications should be delivered and marked sent in bulk."""
+        stream = io.StringIO()
+        dispatcher = NotificationDispatcher(session_factory, StreamSender(stream))
+
+        result = await dispatcher.run_once()
+
+        assert result.claimed == 3
+        assert result.sent == 3
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        assert [line["recipient_id"] for line in lines] == [1, 2, 3]
+        assert await _statuses(session_factory) == [(NotificationStatus.SENT.value, 0)] * 3
+        assert (await dispatcher.run_once()).claimed == 0
+
+    @pytest.mark.asyncio
+    async def test_batch_size_limits_claim(self, session_factory, pending_notifications):
+        """Only batch_size rows should be claimed per cycle."""
+        dispatcher = NotificationDispatcher(
+            session_factory, StreamSender(io.StringIO()), batch_size=2
+        )
+
+        assert (await dispatcher.run_once()).claimed == 2
+        assert (await dispatcher.run_once()).claimed == 1
+
+    @pytest.mark.asyncio
+    async def test_failure_backs_off_then_fails(self, session_factory, pending_notifications):
+        """Failed deliveries should be retried later, then marked failed."""
+        dispatcher = NotificationDispatcher(
+            session_factory,
+            FailingSender(),
+            max_attempts=2,
+            backoff_base_seconds=0,
+        )
+
+        first = await dispatcher.run_once()
+        assert first.retried == 3
+        assert await _statuses(session_factory) == [(NotificationStatus.PENDING.value, 1)] * 3
+
+        second = await dispatcher.run_once()
+        assert second.failed == 3
+        assert await _statuses(session_factory) == [(NotificationStatus.FAILED.value, 2)] * 3
+
+    @pytest.mark.asyncio
+    async def test_backoff_delays_retry(self, session_factory, pending_notifications):
+        """Rows in backoff should not be claimed again immediately."""
+        dispatcher = NotificationDispatcher(
+            session_factory, FailingSender(), backoff_base_seconds=60
+        )
+
+        await dispatcher.run_once()
+
+        assert (await dispatcher.run_once()).claimed == 0
+
+    @pytest.mark.asyncio
+    async def test_unexpected_sender_error_is_retried(
+        self, session_factory, pending_notifications
+    ):
+        """A sender raising an unexpected error should not stop the dispatch loop."""
+        dispatcher = NotificationDispatcher(
+            session_factory,
+            BrokenSender(),
+            backoff_base_seconds=60,
+            poll_interval_seconds=60,
+        )
+        cycles: asyncio.Queue = asyncio.Queue()
+        run_once = dispatcher.run_once
+
+        async def recorded_run_once():
+            result = await run_once()
+            cycles.put_nowait(result)
+            return result
+
+        dispatcher.run_once = recorded_run_once
+        task = asyncio.create_task(dispatcher.run())
+        try:
+            result = await asyncio.wait_for(cycles.get(), timeout=5)
+            # The cycle returned and the loop went back to sleep
+            await asyncio.sleep(0)
+            assert not task.done()
+        finally:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+
+        assert result.retried == 3
+        assert await _statuses(session_factory) == [(NotificationStatus.PENDING.value, 1)] * 3
+        async with session_factory() as session:
+            rows = (await session.execute(select(Notification))).scalars().all()
+        assert all(row.next_attempt_at is not None for row in rows)
+        assert all(row.last_error == "RuntimeError: template bug" for row in rows)
+
+    @pytest.mark.asyncio
+    async def test_stale_claim_cannot_settle_failures(
+        self, session_factory, pending_notifications
+    ):
+        """A failure reported under an expired claim should not touch the re-claimed row."""
+        async with session_factory() as session:
+            repository = NotificationRepository(session)
+            stale = await repository.claim_pending("stale", 1, timedelta(0))
+            fresh = await repository.claim_pending("fresh", 1, timedelta(0))
+            assert [n.id for n in stale] == [n.id for n in fresh]
+
+            await repository.complete_claimed("stale", [], [{
+                "id": stale[0].id,
+                "attempts": 1,
+                "status": NotificationStatus.FAILED.value,
+                "next_attempt_at": None,
+                "last_error": "late",
+            }])
+
+        assert (await _statuses(session_factory))[0] == (NotificationStatus.PENDING.value, 0)
+
+    @pytest.mark.asyncio
+    async def test_file_sender_appends_lines(self, tmp_path):
+        """FileSender should append one JSON line per message."""
+        path = tmp_path / "outbox.jsonl"
+        sender = FileSender(path)
+        for i in (1, 2):
+            await sender.send(OutboundMessage(1, "order_shipped", "Shipped", f"#{i}", (i,)))
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [line["notification_ids"] for line in lines] == [[1], [2]]
+
+
+@pytest_asyncio.fixture
+async def mixed_backlog(test_session) -> list[Notification]:
+    """A restock storm of admin alerts queued ahead of a few order emails."""
+    alerts = [
+        Notification(
+            type=NotificationType.LOW_STOCK.value,
+            recipient_id=0,
+            subject="Low Stock Alert",
+            message=f"Product {i} is low",
+            reference_id=i,
+        )
+        for i in range(20)
+    ]
+    orders = [
+        Notification(
+            type=NotificationType.ORDER_SHIPPED.value,
+            recipient_id=i,
+            subject="Order Shipped",
+            message=f"Order {i} shipped",
+            reference_id=i,
+        )
+        for i in range(5)
+    ]
+    test_session.add_all(alerts)
+    await test_session.commit()
+    test_session.add_all(orders)
+    await test_session.commit()
+    return alerts + orders
+
+
+class TestPriorityLanes:
+    """Tests for weighted fair queuing and per-lane rate limits."""
+
+    @pytest.mark.asyncio
+    async def test_order_emails_jump_the_alert_backlog(self, session_factory, mixed_backlog):
+        """Transactional rows should take their weighted share despite being newer."""
+        dispatcher = NotificationDispatcher(
+            session_factory, StreamSender(io.StringIO()), batch_size=6
+        )
+
+        result = await dispatcher.run_once()
+
+        assert result.claimed_by_lane == {"transactional": 5, "admin": 1}
+
+    @pytest.mark.asyncio
+    async def test_idle_lane_share_goes_to_busy_lanes(self, session_factory, mixed_backlog):
+        """Once the transactional lane drains, admin rows should fill the batch."""
+        dispatcher = NotificationDispatcher(
+            session_factory, StreamSender(io.StringIO()), batch_size=10
+        )
+
+        await dispatcher.run_once()
+        result = await dispatcher.run_once()
+
+        assert result.claimed_by_lane == {"admin": 10}
+
+    @pytest.mark.asyncio
+    async def test_lane_rate_limit_caps_claims(self, session_factory, mixed_backlog):
+        """A rate-limited lane should only be offered what its bucket holds."""
+        dispatcher = NotificationDispatcher(
+            session_factory,
+            StreamSender(io.StringIO()),
+            batch_size=20,
+            lane_rate_limits={"admin": 2},
+        )
+
+        first = await dispatcher.run_once()
+        second = await dispatcher.run_once()
+
+        assert first.claimed_by_lane == {"transactional": 5, "admin": 2}
+        assert second.claimed_by_lane == {}
+
+
+@pytest_asyncio.fixture
+async def same_day_shipments(test_session) -> list[Notification]:
+    """Three shipments for recipient 1 in one hour, one the next day, one for recipient 2."""
+    base = datetime(2025, 3, 1, 9, 0)
+    created = [
+        (1, base),
+        (1, base + timedelta(minutes=10)),
+        (1, base + timedelta(minutes=20)),
+        (1, base + timedelta(days=1)),
+        (2, base),
+    ]
+    notifications = [
+        Notification(
+            type=NotificationType.ORDER_SHIPPED.value,
+            recipient_id=recipient_id,
+            subject="Order Shipped",
+            message=f"Order {i} shipped",
+            reference_id=i,
+            created_at=created_at,
+        )
+        for i, (recipient_id, created_at) in enumerate(created)
+    ]
+    test_session.add_all(notifications)
+    await test_session.commit()
+    return notifications
+
+
+class TestDigestMode:
+    """Tests for merging a recipient's notifications into digests."""
+
+    @pytest.mark.asyncio
+    async def test_merges_same_window(self, session_factory, same_day_shipments):
+        """Same recipient, type and window should become one message."""
+        stream = io.StringIO()
+        dispatcher = NotificationDispatcher(
+            session_factory, StreamSender(stream), digest_window_seconds=3600
+        )
+
+        result = await dispatcher.run_once()
+
+        assert (result.claimed, result.messages, result.sent) == (5, 3, 5)
+        lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+        digest = next(line for line in lines if len(line["notification_ids"]) > 1)
+        assert digest["recipient_id"] == 1
+        assert digest["subject"] == "Order Shipped (3 updates)"
+        assert digest["message"].splitlines() == [
+            "Order 0 shipped", "Order 1 shipped", "Order 2 shipped",
+        ]
+        assert await _statuses(session_factory) == [(NotificationStatus.SENT.value, 0)] * 5
+
+    @pytest.mark.asyncio
+    async def test_failed_digest_retries_every_source(self, session_factory, same_day_shipments):
+        """A failed digest should schedule a retry for each merged notification."""
+        dispatcher = NotificationDispatcher(
+            session_factory, FailingSender(), digest_window_seconds=3600
+        )
+
+        result = await dispatcher.run_once()
+
+        assert result.messages == 3
+        assert result.retried == 5
+
+    @pytest.mark.asyncio
+    async def test_open_window_is_not_claimed(self, session_factory, test_session):
+        """Notifications whose window is still open should wait for it to close."""
+        test_session.add(Notification(
+            type=NotificationType.ORDER_SHIPPED.value, recipient_id=1,
+            subject="Order Shipped", message="Order 9 shipped",
+        ))
+        await test_session.commit()
+        digest = NotificationDispatcher(
+            session_factory, StreamSender(io.StringIO()), digest_window_seconds=86400
+        )
+        immediate = NotificationDispatcher(session_factory, StreamSender(io.StringIO()))
+
+        assert (await digest.run_once()).claimed == 0
+        assert (await immediate.run_once()).claimed == 1
+
+    @pytest.mark.asyncio
+    async def test_claims_whole_window_group(self, session_factory, same_day_shipments):
+        """A batch should take every row of a picked group, even past batch_size."""
+        stream = io.StringIO()
+        dispatcher = NotificationDispatcher(
+            session_factory, StreamSender(stream), batch_size=1, digest_window_seconds=3600
+        )
+
+        first = await dispatcher.run_once()
+
+        assert (first.claimed, first.messages) == (3, 1)
+        line = json.loads(stream.getvalue())
+        assert (line["recipient_id"], len(line["notification_ids"])) == (1, 3)
+
+    @pytest.mark.asyncio
+    async def test_disabled_by_default(self, session_factory, same_day_shipments):
+        """Without a digest window every notification is its own message."""
+        dispatcher = NotificationDispatcher(session_factory, StreamSender(io.StringIO()))
+
+        assert (await dispatcher.run_once()).messages == 5
@@ -0,0 +1,127 @@
+"""
+Tests for Notification Retention
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.monitoring import metrics
+from app.models import (
+    Notification,
+    NotificationArchive,
+    NotificationCounter,
+    NotificationStatus,
+    NotificationType,
+)
+from app.services.notification_retention import (
+    BYTES_RECLAIMED,
+    ROWS_ARCHIVED,
+    NotificationRetention,
+)
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def aged_notifications(test_session) -> list[Notification]:
+    """Seven old sent rows, one recent sent row and one old pending row."""
+    old = datetime.now(UTC) - timedelta(days=45)
+    notifications = [
+        Notification(
+            type=NotificationType.ORDER_SHIPPED.value,
+            recipient_id=i,
+            subject="Order Shipped",
+            message=f"Your order {i} has shipped. " * 20,
+            status=NotificationStatus.SENT.value,
+            created_at=old + timedelta(minutes=i),
+            sent_at=old + timedelta(minutes=i + 1),
+        )
+        for i in range(7)
+    ]
+    notifications.append(Notification(
+        type=NotificationType.ORDER_SHIPPED.value,
+        recipient_id=99,
+        subject="Order Shipped",
+        message="recent",
+        status=NotificationStatus.SENT.value,
+        sent_at=datetime.now(UTC),
+    ))
+    notifications.append(Notification(
+        type=NotificationType.LOW_STOCK.value,
+        recipient_id=0,
+        subject="Low Stock Alert",
+        message="still pending",
+        created_at=old,
+    ))
+    test_session.add_all(notifications)
+    await test_session.commit()
+    return notifications
+
+
+class TestNotificationRetention:
+    """Tests for archiving old sent notifications."""
+
+    @pytest.mark.asyncio
+    async def test_moves_old_sent_rows_in_batches(
+        self, test_session, session_factory, aged_notifications
+    ):
+        """Only old sent rows should move, batch by batch, with messages intact."""
+        retention = NotificationRetention(session_factory, retention_days=30, batch_size=3)
+
+        result = await retention.run_once()
+
+        assert result.rows == 7
+        assert result.batches == 3
+        remaining = await test_session.scalars(select(Notification.message))
+        assert sorted(remaining.all()) == ["recent", "still pending"]
+
+        archived = (await test_session.scalars(
+            select(NotificationArchive).order_by(NotificationArchive.id)
+        )).all()
+        assert [a.id for a in archived] == [n.id for n in aged_notifications[:7]]
+        assert archived[0].message == aged_notifications[0].message
+
+    @pytest.mark.asyncio
+    async def test_reports_reclaimed_bytes(self, session_factory, aged_notifications):
+        """Compressed archive rows should be smaller and the savings recorded."""
+        archived_before = metrics.get(ROWS_ARCHIVED)
+        reclaimed_before = metrics.get(BYTES_RECLAIMED)
+
+        result = await NotificationRetention(session_factory, retention_days=30).run_once()
+
+        assert result.archived_bytes < result.message_bytes
+        assert metrics.get(ROWS_ARCHIVED) - archived_before == 7
+        assert metrics.get(BYTES_RECLAIMED) - reclaimed_before == result.bytes_reclaimed
+
+    @pytest.mark.asyncio
+    async def test_keeps_status_counters_in_step(
+        self, test_session, session_factory, aged_notifications
+    ):
+        """Deleting archived rows should decrement the sent counter."""
+        await NotificationRetention(session_factory, retention_days=30).run_once()
+
+        counter = await test_session.get(
+            NotificationCounter, NotificationStatus.SENT.value, populate_existing=True
+        )
+        actual = await test_session.scalar(
+            select(func.count(Notification.id))
+            .where(Notification.status == NotificationStatus.SENT.value)
+        )
+        assert counter.count == actual == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint(self, client, session_factory, aged_notifications):
+        """GET /metrics should expose the retention counters."""
+        await NotificationRetention(session_factory, retention_days=30).run_once()
+
+        response = await client.get("/api/v1/metrics")
+        assert response.status_code == 200
+        assert f"# TYPE {ROWS_ARCHIVED} counter" in response.text
+        assert BYTES_RECLAIMED in response.text
@@ -0,0 +1,189 @@
+"""
+Tests for the Server-Sent Notification Stream
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.broadcast import Broadcaster, notification_broadcaster
+from app.models import Notification, NotificationType
+from app.services.notification_stream import NotificationPoller, NotificationStream
+
+
+def make_notification(i: int) -> Notification:
+    return Notification(
+        type=NotificationType.ORDER_CREATED.value,
+        recipient_id=1,
+        subject="Order Created",
+        message=f"Order {i} created",
+        reference_id=i,
+    )
+
+
+def event_id(frame: str) -> int:
+    assert frame.startswith("id: ")
+    return int(frame.split("\n", 1)[0].removeprefix("id: "))
+
+
+@pytest.fixture
+def session_factory(test_engine):
+    return async_sessionmaker(test_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@pytest_asyncio.fixture
+async def pending_notifications(test_session) -> list[Notification]:
+    notifications = [make_notification(i) for i in range(3)]
+    test_session.add_all(notifications)
+    await test_session.commit()
+    return notifications
+
+
+class TestBroadcaster:
+    """Tests for the in-process broadcaster."""
+
+    def test_slow_subscriber_is_marked_lagged(self):
+        """A full queue should mark the subscriber lagging instead of blocking."""
+        broadcaster = Broadcaster(queue_size=2)
+        with broadcaster.subscribe() as subscription:
+            for i in range(5):
+                broadcaster.publish({"id": i})
+            assert subscription.lagged
+            assert subscription.queue.qsize() == 2
+
+            subscription.reset()
+            assert not subscription.lagged
+            assert subscription.queue.empty()
+        assert broadcaster.subscriber_count == 0
+
+    @pytest.mark.asyncio
+    async def test_publishes_on_commit_only(self, test_session):
+        """New notifications should be broadcast after commit, not on rollback."""
+        with notification_broadcaster.subscribe() as subscription:
+            test_session.add(make_notification(1))
+            await test_session.flush()
+            await test_session.rollback()
+            assert subscription.queue.empty()
+
+            notification = make_notification(2)
+            test_session.add(notification)
+            await test_session.commit()
+
+            payload = subscription.queue.get_nowait()
+            assert payload["id"] == notification.id
+            assert payload["message"] == "Order 2 created"
+
+
+class TestNotificationStream:
+    """Tests for the SSE frame generator."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_after_last_event_id(self, session_factory, pending_notifications):
+        """Replay should start after Last-Event-ID."""
+        stream = NotificationStream(session_factory, broadcaster=Broadcaster())
+        events = stream.events(last_event_id=pending_notifications[0].id)
+
+        assert (await anext(events)).startswith("retry:")
+        frames = [await anext(events), await anext(events)]
+        await events.aclose()
+
+        assert [event_id(f) for f in frames] == [n.id for n in pending_notifications[1:]]
+        data = json.loads(frames[0].split("data: ", 1)[1])
+        assert data["message"] == "Order 1 created"
+
+    @pytest.mark.asyncio
+    async def test_follows_live_commits(self, test_session, session_factory, pending_notifications):
+        """Without Last-Event-ID only notifications committed later should stream."""
+        stream = NotificationStream(session_factory)
+        events = stream.events()
+        await anext(events)  # retry frame; the generator is now subscribed
+
+        next_frame = anext(events)
+        notification = make_notification(10)
+        test_session.add(notification)
+        await test_session.commit()
+
+        assert event_id(await next_frame) == notification.id
+        await events.aclose()
+
+    @pytest.mark.asyncio
+    async def test_lagging_client_resyncs_from_database(
+        self, test_session, session_factory
+    ):
+        """A client whose queue overflowed should catch up from the database."""
+        broadcaster = Broadcaster(queue_size=1)
+        stream = NotificationStream(session_factory, broadcaster=broadcaster)
+        events = stream.events(last_event_id=0)
+        await anext(events)
+
+        notifications = [make_notification(i) for i in range(4)]
+        test_session.add_all(notifications)
+        await test_session.commit()
+        for notification in notifications:
+            broadcaster.publish({"id": notification.id})
+
+        frames = [await anext(events) for _ in notifications]
+        await events.aclose()
+        assert [event_id(f) for f in frames] == [n.id for n in notifications]
+
+    @pytest.mark.asyncio
+    async def test_idle_heartbeat_does_not_query(self, session_factory, pending_notifications):
+        """Idle heartbeats should not hit the database."""
+        sessions = 0
+
+        def counting_factory():
+            nonlocal sessions
+            sessions += 1
+            return session_factory()
+
+        stream = NotificationStream(
+            counting_factory, broadcaster=Broadcaster(), heartbeat_seconds=0.01
+        )
+        events = stream.events()
+
+        assert (await anext(events)).startswith("retry:")
+        opened = sessions
+        assert [await anext(events) for _ in range(3)] == [": keepalive\n\n"] * 3
+        await events.aclose()
+
+        assert opened == 1
+        assert sessions == opened
+
+
+class TestNotificationPoller:
+    """Tests for the shared per-process poller."""
+
+    @pytest.mark.asyncio
+    async def test_publishes_rows_from_other_workers(self, test_session, session_factory):
+        """Rows committed elsewhere should reach subscribers through one poll."""
+        broadcaster = Broadcaster()
+        poller = NotificationPoller(session_factory, broadcaster=broadcaster, page_size=2)
+        assert await poller.poll_once() == 0
+
+        with broadcaster.subscribe() as subscription:
+            notifications = [make_notification(i) for i in range(3)]
+            test_session.add_all(notifications)
+            await test_session.commit()
+
+            assert await poller.poll_once() == 3
+            assert await poller.poll_once() == 0
+            ids = [subscription.queue.get_nowait()["id"] for _ in notifications]
+        assert ids == [n.id for n in notifications]
+
+    @pytest.mark.asyncio
+    async def test_skips_database_rows_without_subscribers(
+        self, test_session, session_factory, pending_notifications
+    ):
+        """Without subscribers the poller should only advance its cursor."""
+        broadcaster = Broadcaster()
+        poller = NotificationPoller(session_factory, broadcaster=broadcaster)
+        await poller.poll_once()
+        test_session.add(make_notification(5))
+        await test_session.commit()
+
+        assert await poller.poll_once() == 0
+        with broadcaster.subscribe() as subscription:
+            assert await poller.poll_once() == 0
+            assert subscription.queue.empty()
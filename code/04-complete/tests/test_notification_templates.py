@@ -0,0 +1,130 @@
+"""
+Tests for Notification Templates
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from app.models import NotificationType
+from app.repositories.notification_repository import NotificationRepository
+from app.services.notification_service import NotificationService
+from app.services.notification_templates import (
+    CompiledTemplate,
+    TemplateRegistry,
+    build_default_registry,
+)
+
+
+class TestCompiledTemplate:
+    """Tests for template compilation."""
+
+    def test_matches_str_format(self):
+        """Rendering should match str.format, including specs and conversions."""
+        source = "Order #{order_id:05d} for {name!r}: {total}"
+        values = {"order_id": 42, "name": "Ann", "total": Decimal("9.50")}
+
+        template = CompiledTemplate(source)
+
+        assert template.render(values) == source.format(**values)
+        assert template.fields == {"order_id", "name", "total"}
+
+    def test_bind_formats_shared_fields(self):
+        """A bound template should only leave the unbound fields to render."""
+        template = CompiledTemplate("Order #{order_id} is now {status!s:>8}.")
+
+        bound = template.bind({"status": "shipped"})
+
+        assert bound.fields == {"order_id"}
+        assert bound.render({"order_id": 7}) == "Order #7 is now  shipped."
+
+    def test_rejects_attribute_fields(self):
+        """Only plain field names should be accepted."""
+        with pytest.raises(ValueError):
+            CompiledTemplate("{order.id}")
+
+
+class TestTemplateRegistry:
+    """Tests for locale lookup and the render cache."""
+
+    def test_locale_fallback(self):
+        """Region locales should fall back to the language, then the default."""
+        registry = build_default_registry()
+        values = {"order_id": 7, "status": "shipped"}
+
+        thai, _ = registry.render(NotificationType.ORDER_SHIPPED, values, "th-TH")
+        english, message = registry.render(NotificationType.ORDER_SHIPPED, values, "fr")
+
+        assert thai == "จัดส่งคำสั่งซื้อแล้ว"
+        assert english == "Order Shipped"
+        assert message == "Your order #7 is now shipped."
+
+    def test_cache_is_not_keyed_on_values(self):
+        """Different orders should share one cached template lookup."""
+        registry = TemplateRegistry()
+        registry.register(NotificationType.ORDER_SHIPPED, "Shipped", "Order #{order_id}")
+
+        rendered = [
+            registry.render(NotificationType.ORDER_SHIPPED, {"order_id": i})
+            for i in range(30)
+        ]
+
+        assert rendered[4] == ("Shipped", "Order #4")
+        info = registry.cache_info()
+        assert (info.misses, info.hits, info.currsize) == (1, 29, 1)
+
+    def test_render_many_matches_render(self):
+        """Bulk rendering should match rendering each item on its own."""
+        registry = build_default_registry()
+        items = [
+            {"order_id": 1, "total": Decimal("5.0")},
+            {"order_id": 2, "total": Decimal("5.00")},
+            {"order_id": 3, "total": Decimal("5.00")},
+        ]
+
+        rendered = registry.render_many(NotificationType.ORDER_CREATED, items)
+
+        assert rendered == [
+            registry.render(NotificationType.ORDER_CREATED, item) for item in items
+        ]
+        assert rendered[0][1] == "Your order #1 has been placed. Total: 5.0"
+
+    def test_missing_type_raises(self):
+        """Unregistered types should raise KeyError."""
+        with pytest.raises(KeyError):
+            TemplateRegistry().render(NotificationType.RESTOCK, {})
+
+
+class TestNotificationServiceTemplates:
+    """Tests for notification building from templates."""
+
+    def test_order_notification_from_template(self):
+        """Order notifications should take subject and message from the template."""
+        notification = NotificationService.build_order_notification(
+            NotificationType.ORDER_CREATED, 1, 12, values={"total": Decimal("20.00")}
+        )
+
+        assert notification.subject == "Order Created"
+        assert notification.message == "Your order #12 has been placed. Total: 20.00"
+
+    def test_explicit_message_is_kept(self):
+        """An explicit message should override the template's message only."""
+        notification = NotificationService.build_order_notification(
+            NotificationType.ORDER_DELIVERED, 1, 12, "Left at the door"
+        )
+
+        assert notification.subject == "Order Delivered"
+        assert notification.message == "Left at the door"
+
+    @pytest.mark.asyncio
+    async def test_bulk_create(self, test_session):
+        """Bulk creation should render every recipient in one commit."""
+        service = NotificationService(NotificationRepository(test_session))
+
+        notifications = await service.create_order_notifications_bulk(
+            NotificationType.ORDER_SHIPPED,
+            [(user_id, 100 + user_id, {"status": "shipped"}) for user_id in range(5)],
+        )
+
+        assert [n.id is not None for n in notifications] == [True] * 5
+        assert notifications[2].message == "Your order #102 is now shipped."
@@ -4,9 +4,10 @@ Lab 4 Complete: Testing business logic layer.
 """
 
 import pytest
-from decimal import Decimal
 
-from app.models import Order, OrderStatus
+from sqlalchemy import event, select
+
+from app.models import Notification, NotificationType, Order, OrderStatus, Product
 from app.schemas import OrderCreate, OrderUpdate, OrderItemCreate
 from app.repositories.order_repository import OrderRepository
 from app.services.order_service import OrderService
@@ -21,7 +22,7 @@ class TestCreateOrder:
     """Tests for order creation."""
     
     @pytest.mark.asyncio
-    async def test_create_order_calculates_total(self, test_session):
+    async def test_create_order_calculates_total(self, test_session, customers):
         """Order total should be sum of item prices × quantities."""
         repository = OrderRepository(test_session)
         service = OrderService(repository)
@@ -37,11 +38,11 @@ class TestCreateOrder:
         
         order = await service.create_order(data)
         
-        assert order.total == Decimal("1399.97")
+        assert order.total_cents == 139997
         assert len(order.items) == 2
     
     @pytest.mark.asyncio
-    async def test_create_order_sets_pending_status(self, test_session):
+    async def test_create_order_sets_pending_status(self, test_session, customers):
         """New orders should have pending status."""
         repository = OrderRepository(test_session)
         service = OrderService(repository)
@@ -55,6 +56,36 @@ class TestCreateOrder:
         
         assert order.status == OrderStatus.PENDING.value
 
+    @pytest.mark.asyncio
+    async def test_create_order_prices_from_catalog(self, test_session, customers):
+        """Catalog products missing from the snapshot should be priced from the database."""
+        test_session.add_all([
+            Product(id=2, sku="MOUSE", name="Silent Mouse", price_cents=2599, stock=5),
+            Product(id=42, sku="CABLE", name="HDMI Cable", price_cents=899, stock=5),
+        ])
+        await test_session.commit()
+        service = OrderService(OrderRepository(test_session))
+
+        order = await service.create_order(OrderCreate(
+            user_id=1,
+            items=[
+                OrderItemCreate(product_id=2, quantity=1),
+                OrderItemCreate(product_id=42, quantity=2),
+                OrderItemCreate(product_id=3, quantity=1),
+            ],
+        ))
+
+        prices = {
+            item.product_id: (item.product_name, item.unit_price_cents)
+            for item in order.items
+        }
+        assert prices == {
+            2: ("Silent Mouse", 2599),
+            42: ("HDMI Cable", 899),
+            3: ("USB-C Hub", 7999),
+        }
+        assert order.total_cents == 2599 + 2 * 899 + 7999
+
 
 class TestGetOrder:
     """Tests for getting orders."""
@@ -182,3 +213,38 @@ class TestListOrders:
         
         assert len(orders) == 3
         assert all(o.status == OrderStatus.CONFIRMED.value for o in orders)
+
+
+class TestOrderOutbox:
+    """Tests for order notifications written in the order's transaction."""
+    
+    @pytest.mark.asyncio
+    async def test_create_order_emits_notification_in_one_commit(self, test_session, customers):
+        """Order and ORDER_CREATED notification should share one commit."""
+        repository = OrderRepository(test_session)
+        service = OrderService(repository)
+        commits = []
+        event.listen(test_session.sync_session, "after_commit", lambda s: commits.append(s))
+        
+        order = await service.create_order(OrderCreate(
+            user_id=2,
+            items=[OrderItemCreate(product_id=1, quantity=1)]
+        ))
+        
+        assert len(commits) == 1
+        notification = (await test_session.execute(select(Notification))).scalar_one()
+        assert notification.type == NotificationType.ORDER_CREATED.value
+        assert notification.recipient_id == 2
+        assert notification.reference_id == order.id
+    
+    @pytest.mark.asyncio
+    async def test_ship_and_cancel_emit_notifications(self, test_session, sample_order):
+        """Shipping-path and cancel transitions should queue notifications."""
+        repository = OrderRepository(test_session)
+        service = OrderService(repository)
+        
+        await service.update_order(sample_order.id, OrderUpdate(status=OrderStatus.CONFIRMED))
+        await service.cancel_order(sample_order.id)
+        
+        types = (await test_session.execute(select(Notification.type))).scalars().all()
+        assert types == [NotificationType.ORDER_CANCELLED.value]
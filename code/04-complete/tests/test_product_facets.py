@@ -0,0 +1,124 @@
+"""
+Tests for Product Facet Counts
+"""
+
+import pytest
+import pytest_asyncio
+
+from app.core.product_facets import FacetCache
+from app.repositories.product_repository import ProductRepository
+from app.schemas import ProductCreate, BulkRestockRequest
+from app.services.product_service import ProductService
+
+
+class CountingRepository(ProductRepository):
+    """Repository that counts facet aggregate queries."""
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.loads = 0
+
+    async def get_facet_counts(self, low_stock_threshold: int):
+        self.loads += 1
+        return await super().get_facet_counts(low_stock_threshold)
+
+
+@pytest_asyncio.fixture
+async def products(client) -> list[dict]:
+    """Products across two categories and every stock bucket."""
+    created = []
+    for category, stock in [
+        ("tools", 0), ("tools", 5), ("tools", 50), ("toys", 9), ("toys", 10), (None, 1),
+    ]:
+        response = await client.post("/api/v1/products", json={
+            "name": f"{category} {stock}", "price": "1.00", "stock": stock,
+            "category": category,
+        })
+        created.append(response.json())
+    return created
+
+
+class TestProductFacets:
+    """Tests for GET /api/v1/products/facets."""
+
+    @pytest.mark.asyncio
+    async def test_counts_and_buckets(self, client, products):
+        """Should count products per category and per stock bucket."""
+        response = await client.get("/api/v1/products/facets")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "categories": [
+                {"category": "tools", "count": 3, "in_stock": 2, "low_stock": 1},
+                {"category": "toys", "count": 2, "in_stock": 2, "low_stock": 1},
+                {"category": None, "count": 1, "in_stock": 1, "low_stock": 1},
+            ],
+            "total": 6,
+            "in_stock": 5,
+            "low_stock": 3,
+            "out_of_stock": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_empty_catalog(self, client):
+        """An empty catalog should report zero counts."""
+        response = await client.get("/api/v1/products/facets")
+
+        assert response.json()["categories"] == []
+        assert response.json()["total"] == 0
+
+    @pytest.mark.asyncio
+    async def test_local_writes_update_counts_in_place(self, test_session, products):
+        """Create, stock updates and restocks should not reload the aggregate."""
+        repository = CountingRepository(test_session)
+        service = ProductService(repository, facets=FacetCache(version_ttl=0))
+        await service.get_facets()
+        tools_empty, toys_ten = products[0]["id"], products[4]["id"]
+
+        await service.create_product(ProductCreate(
+            name="New", price="2.00", stock=3, category="games"
+        ))
+        await service.update_stock(toys_ten, 0)
+        await service.bulk_restock(BulkRestockRequest(
+            items=[{"product_id": tools_empty, "quantity": 20}]
+        ))
+        facets = await service.get_facets()
+
+        assert repository.loads == 1
+        fresh = await ProductService(
+            repository, facets=FacetCache(version_ttl=0)
+        ).get_facets()
+        assert facets == fresh
+        assert (facets.in_stock, facets.low_stock, facets.out_of_stock) == (6, 4, 1)
+
+    @pytest.mark.asyncio
+    async def test_other_worker_writes_trigger_reload(self, test_session, products):
+        """A version bump this cache did not apply should reload the counts."""
+        cache = FacetCache(version_ttl=0)
+        repository = CountingRepository(test_session)
+        service = ProductService(repository, facets=cache)
+        await service.get_facets()
+
+        other = ProductService(ProductRepository(test_session), facets=FacetCache())
+        await other.create_product(ProductCreate(name="Remote", price="1.00", stock=2))
+        facets = await service.get_facets()
+
+        assert repository.loads == 2
+        assert facets.total == 7
+
+    @pytest.mark.asyncio
+    async def test_stock_takes_are_picked_up_after_stock_ttl(self, test_session, products):
+        """Stock moved without a version bump should be reloaded once stock_ttl passes."""
+        cache = FacetCache(version_ttl=60, stock_ttl=60)
+        repository = CountingRepository(test_session)
+        service = ProductService(repository, facets=cache)
+        await service.get_facets()
+
+        await service.take_stock(products[1]["id"], 5)
+        cached = await service.get_facets()
+        cache.stock_ttl = 0
+        reloaded = await service.get_facets()
+
+        assert (cached.in_stock, cached.out_of_stock) == (5, 1)
+        assert (reloaded.in_stock, reloaded.out_of_stock) == (4, 2)
+        assert repository.loads == 2
@@ -0,0 +1,186 @@
+"""
+Tests for Bulk Product Import
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+
+from app.core.product_import import iter_csv_records, iter_ndjson_records
+from app.repositories.product_repository import ProductRepository
+from app.services.product_import_service import ProductImportService
+
+CSV = "text/csv"
+NDJSON = "application/x-ndjson"
+
+
+async def chunked(data: bytes, size: int):
+    for i in range(0, len(data), size):
+        yield data[i:i + size]
+
+
+async def collect(records) -> list:
+    return [record async for record in records]
+
+
+async def post_import(client, body: str, content_type: str):
+    return await client.post(
+        "/api/v1/products/import",
+        content=body.encode(),
+        headers={"content-type": content_type},
+    )
+
+
+@pytest_asyncio.fixture
+async def service(test_session) -> ProductImportService:
+    return ProductImportService(ProductRepository(test_session))
+
+
+class TestImportParsers:
+    """Tests for the incremental CSV and NDJSON parsers."""
+
+    @pytest.mark.asyncio
+    async def test_csv_records_survive_any_chunking(self):
+        """Quoted newlines, escaped quotes and split UTF-8 should parse the same at any chunk size."""
+        data = (
+            'sku,name,description,price\r\n'
+            'A1,"Desk, oak","Line one\nline ""two""",10.00\r\n'
+            'B2,Café,,3.50\r\n'
+        ).encode()
+        expected = [
+            (2, {"sku": "A1", "name": "Desk, oak",
+                 "description": 'Line one\nline "two"', "price": "10.00"}),
+            (4, {"sku": "B2", "name": "Café", "price": "3.50"}),
+        ]
+        for size in (1, 2, 7, len(data)):
+            assert await collect(iter_csv_records(chunked(data, size))) == expected
+
+    @pytest.mark.asyncio
+    async def test_csv_reports_malformed_records(self):
+        """Wrong field counts and an unterminated quote should be errors."""
+        data = b'sku,name,price\nA1,Desk\nB2,"Open,1.00\n'
+
+        records = await collect(iter_csv_records(chunked(data, 4)))
+
+        assert records == [(2, "expected 3 fields, got 2"), (3, "unterminated quoted value")]
+
+    @pytest.mark.asyncio
+    async def test_ndjson_records(self):
+        """Each non-blank line should be one object; others are errors."""
+        data = b'{"sku": "A1"}\n\n[1]\n{bad\n{"sku": "B2"}'
+
+        records = await collect(iter_ndjson_records(chunked(data, 3)))
+
+        assert records[0] == (1, {"sku": "A1"})
+        assert records[1] == (3, "expected a JSON object")
+        assert records[2][0] == 4 and records[2][1].startswith("invalid JSON")
+        assert records[3] == (5, {"sku": "B2"})
+
+
+class TestProductImport:
+    """Tests for POST /api/v1/products/import."""
+
+    @pytest.mark.asyncio
+    async def test_csv_import_creates_products(self, client):
+        """Rows should become products with their stock in the ledger."""
+        body = "sku,name,price,stock,category\nA1,Desk,120.00,5,office\nB2,Lamp,15.00,,\n"
+
+        response = await post_import(client, body, CSV)
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "received": 2, "inserted": 2, "updated": 0, "failed": 0,
+            "errors": [], "errors_truncated": False,
+        }
+        page = (await client.get("/api/v1/products")).json()
+        assert [(p["name"], p["stock"], p["category"]) for p in page["items"]] == [
+            ("Desk", 5, "office"), ("Lamp", 0, None),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_reimport_updates_by_sku(self, client):
+        """Existing SKUs should be updated in place, stock adjusted only when given."""
+        await post_import(client, "sku,name,price,stock\nA1,Desk,120.00,5\nB2,Lamp,15.00,8\n", CSV)
+        body = "\n".join(json.dumps(row) for row in [
+            {"sku": "A1", "name": "Oak Desk", "price": "99.00", "stock": 2},
+            {"sku": "B2", "name": "Lamp", "price": "12.00"},
+        ])
+
+        response = await post_import(client, body, NDJSON)
+
+        assert response.json()["updated"] == 2
+        page = (await client.get("/api/v1/products")).json()
+        assert page["total"] == 2
+        assert [(p["name"], p["price"], p["stock"]) for p in page["items"]] == [
+            ("Lamp", "12.00", 8), ("Oak Desk", "99.00", 2),
+        ]
+        desk_id = page["items"][1]["id"]
+        history = (await client.get(f"/api/v1/inventory/{desk_id}/history")).json()
+        assert [(m["delta"], m["reason"]) for m in history["items"]] == [
+            (-3, "adjustment"), (5, "initial"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_are_reported_and_skipped(self, client):
+        """Rows failing validation should be listed by line; the rest imported."""
+        body = "sku,name,price\nA1,Desk,-1\n,Lamp,2.00\nC3,Chair,40.00\n"
+
+        response = await post_import(client, body, CSV)
+
+        result = response.json()
+        assert (result["received"], result["inserted"], result["failed"]) == (3, 1, 2)
+        assert [error["line"] for error in result["errors"]] == [2, 3]
+        assert result["errors"][0]["errors"][0].startswith("price:")
+        assert result["errors"][1]["errors"][0].startswith("sku:")
+
+    @pytest.mark.asyncio
+    async def test_chunks_commit_separately(self, service):
+        """Repeated SKUs and chunk boundaries should apply rows in order."""
+        rows = [
+            {"sku": f"S{i % 3}", "name": f"Item {i}", "price": "1.00", "stock": i}
+            for i in range(7)
+        ]
+
+        async def records():
+            for line, row in enumerate(rows, 1):
+                yield line, row
+
+        result = await service.import_products(records(), chunk_size=2)
+
+        assert (result.inserted, result.updated) == (3, 4)
+        products, total, _ = await service.products.list_products()
+        assert total == 3
+        assert sorted((p.sku, p.name, p.stock) for p in products) == [
+            ("S0", "Item 6", 6), ("S1", "Item 4", 4), ("S2", "Item 5", 5),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_error_list_is_capped(self, service):
+        """Only the first max_errors row errors should be returned."""
+        async def records():
+            for line in range(1, 6):
+                yield line, {"sku": "X"}
+
+        result = await service.import_products(records(), max_errors=2)
+
+        assert result.failed == 5
+        assert len(result.errors) == 2
+        assert result.errors_truncated
+
+    @pytest.mark.asyncio
+    async def test_unsupported_content_type(self, client):
+        """Bodies that are neither CSV nor NDJSON should be rejected."""
+        response = await post_import(client, "{}", "application/json")
+
+        assert response.status_code == 415
+
+    @pytest.mark.asyncio
+    async def test_duplicate_sku_on_create(self, client):
+        """Creating a product with a SKU already in use should conflict."""
+        product = {"name": "Desk", "price": "1.00", "sku": "A1"}
+        await client.post("/api/v1/products", json=product)
+
+        response = await client.post("/api/v1/products", json=product)
+
+        assert response.status_code == 409
@@ -0,0 +1,183 @@
+"""
+Tests for the In-Process Product Listing
+"""
+
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+
+from app.core.product_listing import ProductListing
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+
+
+@pytest_asyncio.fixture
+async def products(client) -> list[dict]:
+    """Products created through the API, out of name order, in two categories."""
+    created = []
+    for name, category in [
+        ("Mouse", "peripherals"), ("Desk", "furniture"), ("Keyboard", "peripherals"),
+        ("Chair", "furniture"), ("Lamp", None), ("Monitor", "peripherals"),
+    ]:
+        response = await client.post("/api/v1/products", json={
+            "name": name, "price": "10.00", "stock": 20, "category": category,
+        })
+        created.append(response.json())
+    return created
+
+
+class CountingRepository(ProductRepository):
+    """Repository that counts catalog version reads and rebuilds."""
+
+    def __init__(self, session):
+        super().__init__(session)
+        self.version_reads = 0
+        self.builds = 0
+
+    async def get_catalog_version(self) -> int:
+        self.version_reads += 1
+        return await super().get_catalog_version()
+
+    def stream_by_name(self, batch_size: int = 5000):
+        self.builds += 1
+        return super().stream_by_name(batch_size)
+
+
+class TestProductListing:
+    """Tests for GET /api/v1/products served from memory."""
+
+    @pytest.mark.asyncio
+    async def test_pages_match_database(self, client, test_session, products):
+        """Cached pages and cursors should equal the database query for every filter."""
+        database = ProductService(
+            ProductRepository(test_session), listing=ProductListing(enabled=False)
+        )
+        for category in (None, "peripherals", "furniture", "missing"):
+            params = {"limit": 2}
+            if category:
+                params["category"] = category
+            while True:
+                response = await client.get("/api/v1/products", params=params)
+                expected = await database.list_products_json(**params)
+
+                assert response.status_code == 200
+                assert response.json() == json.loads(expected)
+                if response.json()["next_cursor"] is None:
+                    break
+                params["cursor"] = response.json()["next_cursor"]
+
+    @pytest.mark.asyncio
+    async def test_sorted_by_name(self, client, products):
+        """Listing should be ordered by name."""
+        response = await client.get("/api/v1/products")
+
+        assert [p["name"] for p in response.json()["items"]] == [
+            "Chair", "Desk", "Keyboard", "Lamp", "Monitor", "Mouse",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_writes_are_visible_immediately(self, client, products):
+        """create_product, update_stock and bulk_restock should invalidate the view."""
+        await client.get("/api/v1/products")
+        desk = next(p for p in products if p["name"] == "Desk")
+
+        await client.post("/api/v1/products", json={
+            "name": "Bookshelf", "price": "50.00", "stock": 1, "category": "furniture",
+        })
+        await client.put(f"/api/v1/inventory/{desk['id']}", json={"stock": 3})
+        await client.post("/api/v1/inventory/restock", json={
+            "items": [{"product_id": desk["id"], "quantity": 4}],
+        })
+        response = await client.get("/api/v1/products", params={"category": "furniture"})
+
+        assert [(p["name"], p["stock"]) for p in response.json()["items"]] == [
+            ("Bookshelf", 1), ("Chair", 20), ("Desk", 7),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_stock_takes_are_visible_without_rebuild(self, test_session, products):
+        """Stock changes that do not bump the catalog version should still be listed."""
+        repository = CountingRepository(test_session)
+        service = ProductService(repository, listing=ProductListing(version_ttl=60))
+        desk = next(p for p in products if p["name"] == "Desk")
+
+        await service.list_products_json(category="furniture")
+        await service.take_stock(desk["id"], 15)
+        page = json.loads(await service.list_products_json(category="furniture"))
+
+        assert [(p["name"], p["stock"], p["is_low_stock"]) for p in page["items"]] == [
+            ("Chair", 20, False), ("Desk", 5, True),
+        ]
+        assert repository.builds == 1
+
+    @pytest.mark.asyncio
+    async def test_reads_within_ttl_skip_version_check(self, test_session, products):
+        """Repeated reads should reuse the view without checking the version."""
+        repository = CountingRepository(test_session)
+        service = ProductService(repository, listing=ProductListing(version_ttl=60))
+
+        for _ in range(5):
+            await service.list_products_json(limit=2)
+
+        assert (repository.version_reads, repository.builds) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_oversize_catalog_falls_back_to_database(self, test_session, products):
+        """Catalogs over max_items should be listed from the database."""
+        listing = ProductListing(max_items=3)
+        service = ProductService(ProductRepository(test_session), listing=listing)
+
+        content = await service.list_products_json(limit=2)
+
+        assert await listing.view(service.repository) is None
+        page = json.loads(content)
+        assert [p["name"] for p in page["items"]] == ["Chair", "Desk"]
+        assert page["total"] == 6
+
+
+class TestProductPagination:
+    """Tests for keyset pagination of GET /api/v1/products."""
+
+    @pytest.mark.asyncio
+    async def test_cursor_walks_duplicate_names(self, client):
+        """Products sharing a name should be paged by id without gaps or repeats."""
+        ids = []
+        for _ in range(5):
+            response = await client.post("/api/v1/products", json={
+                "name": "Same", "price": "1.00", "stock": 1, "category": "dup",
+            })
+            ids.append(response.json()["id"])
+
+        seen = []
+        params = {"category": "dup", "limit": 2}
+        while True:
+            page = (await client.get("/api/v1/products", params=params)).json()
+            assert page["total"] == 5
+            seen.extend(p["id"] for p in page["items"])
+            if page["next_cursor"] is None:
+                break
+            params["cursor"] = page["next_cursor"]
+
+        assert seen == ids
+
+    @pytest.mark.asyncio
+    async def test_invalid_cursor_returns_400(self, client):
+        """Should return 400 for a malformed cursor."""
+        response = await client.get("/api/v1/products", params={"cursor": "bogus"})
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("where", ["category = 'tools' AND", ""])
+    async def test_query_uses_listing_index(self, test_session, where):
+        """Listing pages should seek an index instead of sorting the table."""
+        rows = await test_session.execute(text(
+            f"EXPLAIN QUERY PLAN SELECT * FROM products WHERE {where} "
+            "(name, id) > ('M', 1) ORDER BY name, id LIMIT 21"
+        ))
+        plan = " ".join(row[-1] for row in rows)
+
+        assert "idx_product_" in plan
+        assert "TEMP B-TREE" not in plan
@@ -0,0 +1,138 @@
+"""
+Tests for Product Search and Autocomplete
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.database import Base
+from app.core.product_autocomplete import ProductNameIndex
+from app.models import Product, match_query
+
+
+@pytest_asyncio.fixture
+async def catalog(test_session) -> list[Product]:
+    """Products whose names and descriptions overlap on 'wireless'."""
+    products = [
+        Product(name="Wireless Mouse", description="Ergonomic", price_cents=2000),
+        Product(name="USB Cable", description="Works with any wireless dock",
+                price_cents=500),
+        Product(name="Wired Keyboard", description=None, price_cents=3000),
+        Product(name="wireless mouse", description="Travel size", price_cents=1500),
+    ]
+    test_session.add_all(products)
+    await test_session.commit()
+    return products
+
+
+class TestProductSearch:
+    """Tests for GET /api/v1/products/search."""
+
+    @pytest.mark.asyncio
+    async def test_name_matches_rank_first(self, client, catalog):
+        """A name hit should outrank a description-only hit."""
+        response = await client.get("/api/v1/products/search", params={"q": "wireless"})
+
+        assert response.status_code == 200
+        names = [p["name"] for p in response.json()]
+        assert names[-1] == "USB Cable"
+        assert sorted(names[:2]) == ["Wireless Mouse", "wireless mouse"]
+
+    @pytest.mark.asyncio
+    async def test_last_word_is_a_prefix(self, client, catalog):
+        """Every word should match, the last one as a prefix."""
+        response = await client.get("/api/v1/products/search", params={"q": "mouse trav"})
+
+        assert [p["description"] for p in response.json()] == ["Travel size"]
+
+    @pytest.mark.asyncio
+    async def test_fts_syntax_is_not_interpreted(self, client, catalog):
+        """Quotes and operators in the query should not raise."""
+        for q in ('"unbalanced', "NOT AND OR", "***", "name:wired"):
+            response = await client.get("/api/v1/products/search", params={"q": q})
+            assert response.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_index_follows_updates_and_deletes(self, client, test_session, catalog):
+        """Renamed and deleted products should be reindexed by the triggers."""
+        keyboard, cable = catalog[2], catalog[1]
+        keyboard.name = "Mechanical Keyboard"
+        await test_session.delete(cable)
+        await test_session.commit()
+
+        renamed = await client.get("/api/v1/products/search", params={"q": "mechanical"})
+        deleted = await client.get("/api/v1/products/search", params={"q": "dock"})
+
+        assert [p["id"] for p in renamed.json()] == [keyboard.id]
+        assert deleted.json() == []
+
+    @pytest.mark.asyncio
+    async def test_existing_products_are_indexed(self):
+        """Creating the index on a database with products should backfill it."""
+        engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+        async with engine.begin() as conn:
+            await conn.run_sync(Product.__table__.create)
+            await conn.execute(text(
+                "INSERT INTO products (name, price_cents, stock, stock_applied_id, stock_shards, "
+                "created_at) VALUES ('Legacy Lamp', 1, 0, 0, 0, CURRENT_TIMESTAMP)"
+            ))
+            await conn.run_sync(Base.metadata.create_all)
+            rows = await conn.execute(text(
+                "SELECT rowid FROM products_fts WHERE products_fts MATCH 'lamp'"
+            ))
+            assert rows.scalars().all() == [1]
+        await engine.dispose()
+
+    def test_match_query(self):
+        """Free text should become quoted terms with a trailing prefix."""
+        assert match_query('wire "mou') == '"wire" "mou"*'
+        assert match_query("  --  ") is None
+
+
+class TestAutocomplete:
+    """Tests for GET /api/v1/products/autocomplete."""
+
+    @pytest.mark.asyncio
+    async def test_prefix_is_case_insensitive(self, client, catalog):
+        """Suggestions should match the prefix regardless of case."""
+        response = await client.get("/api/v1/products/autocomplete", params={"prefix": "WIR"})
+
+        assert response.json() == ["Wired Keyboard", "Wireless Mouse", "wireless mouse"]
+
+    @pytest.mark.asyncio
+    async def test_created_products_are_suggested(self, client, catalog):
+        """Products created after the index was built should be suggested."""
+        await client.get("/api/v1/products/autocomplete", params={"prefix": "w"})
+        await client.post("/api/v1/products", json={"name": "Wrist Rest", "price": "9.00"})
+
+        response = await client.get("/api/v1/products/autocomplete", params={"prefix": "wr"})
+
+        assert response.json() == ["Wrist Rest"]
+
+    def test_limit(self):
+        """Lookups should collapse repeated names and stop after `limit`."""
+        index = ProductNameIndex()
+        for i, name in enumerate(["ab", "abc", "abc", "abd", "b"]):
+            index.add(i, name)
+
+        assert index.complete("ab", limit=2) == ["ab", "abc"]
+        assert index.complete("b") == ["b"]
+        assert index.complete("z") == []
+
+    def test_add_many_matches_single_adds(self):
+        """A batch with inserts, renames and repeats should equal adding one by one."""
+        batch = [(3, "delta"), (1, "Alpha"), (2, "beta"), (1, "alpha two"), (4, "Beta")]
+        single, merged = ProductNameIndex(), ProductNameIndex()
+        for index in (single, merged):
+            index.add(1, "alpha")
+            index.add(5, "echo")
+        for product_id, name in batch:
+            single.add(product_id, name)
+        merged.add_many(batch)
+
+        assert merged.complete("", 100) == single.complete("", 100)
+        assert len(merged) == len(single) == 5
+        assert merged.complete("a") == ["alpha two"]
+        assert merged.complete("b") == ["Beta", "beta"]
@@ -0,0 +1,162 @@
+"""
+Tests for Sales Rollups and Reports API
+"""
+
+import pytest
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from sqlalchemy import select
+
+from app.models import OrderStatus, SalesDailyProduct, SalesDailyStatus
+from app.schemas import OrderCreate, OrderItemCreate, OrderUpdate
+from app.repositories.order_repository import OrderRepository
+from app.services.order_service import OrderService
+
+
+class TickingClock(datetime):
+    """datetime whose now() starts just before midnight and advances 1 ms per call."""
+
+    start = datetime(2024, 1, 1, 23, 59, 59, 999000, tzinfo=UTC)
+    calls = 0
+
+    @classmethod
+    def now(cls, tz=None):
+        cls.calls += 1
+        return cls.start + timedelta(milliseconds=cls.calls - 1)
+
+
+async def _create_order(service: OrderService, *items: tuple[int, int]):
+    data = OrderCreate(
+        user_id=1,
+        items=[OrderItemCreate(product_id=p, quantity=q) for p, q in items],
+    )
+    return await service.create_order(data)
+
+
+class TestSalesRollups:
+    """Tests for incremental rollup maintenance in OrderService."""
+
+    @pytest.mark.asyncio
+    async def test_create_order_updates_rollups(self, test_session, customers):
+        """Creating orders should add to the day x status and day x product rows."""
+        service = OrderService(OrderRepository(test_session))
+
+        await _create_order(service, (1, 1), (2, 2))  # 1299.99 + 2 × 49.99
+        await _create_order(service, (2, 1))          # 49.99
+
+        status_row = (await test_session.execute(select(SalesDailyStatus))).scalar_one()
+        assert status_row.status == OrderStatus.PENDING.value
+        assert status_row.order_count == 2
+        assert status_row.units == 4
+        assert status_row.revenue_cents == 144996
+
+        product_rows = {
+            row.product_id: row
+            for row in (await test_session.execute(select(SalesDailyProduct))).scalars()
+        }
+        assert product_rows[2].order_count == 2
+        assert product_rows[2].units == 3
+        assert product_rows[2].revenue_cents == 14997
+
+    @pytest.mark.asyncio
+    async def test_status_change_moves_rollup(self, test_session, customers):
+        """A status transition should move the order between status buckets."""
+        service = OrderService(OrderRepository(test_session))
+        order = await _create_order(service, (1, 1))
+
+        await service.update_order(order.id, OrderUpdate(status=OrderStatus.CONFIRMED))
+
+        rows = {
+            row.status: row
+            for row in (await test_session.execute(select(SalesDailyStatus))).scalars()
+        }
+        assert rows[OrderStatus.PENDING.value].order_count == 0
+        assert rows[OrderStatus.CONFIRMED.value].order_count == 1
+        assert rows[OrderStatus.CONFIRMED.value].revenue_cents == 129999
+
+    @pytest.mark.asyncio
+    async def test_cancel_removes_product_sales(self, test_session, customers):
+        """Cancelling should remove the order from product rollups."""
+        service = OrderService(OrderRepository(test_session))
+        order = await _create_order(service, (3, 2))
+
+        await service.cancel_order(order.id)
+
+        row = (await test_session.execute(select(SalesDailyProduct))).scalar_one()
+        assert row.units == 0
+        assert row.order_count == 0
+
+    @pytest.mark.asyncio
+    async def test_rollup_day_is_the_stored_day(self, test_session, customers, monkeypatch):
+        """An order created across midnight should be counted on its stored day."""
+        monkeypatch.setattr("app.services.order_service.datetime", TickingClock)
+        monkeypatch.setattr("app.models.order.datetime", TickingClock)
+        monkeypatch.setattr(TickingClock, "calls", 0)
+        service = OrderService(OrderRepository(test_session))
+
+        order = await _create_order(service, (1, 1))
+        await service.cancel_order(order.id)
+
+        assert order.created_at.date() == date(2024, 1, 1)
+        rows = (await test_session.execute(select(SalesDailyStatus))).scalars().all()
+        assert {row.day for row in rows} == {date(2024, 1, 1)}
+        assert {row.status: row.order_count for row in rows} == {
+            OrderStatus.PENDING.value: 0,
+            OrderStatus.CANCELLED.value: 1,
+        }
+
+
+class TestSalesReportAPI:
+    """Tests for GET /api/v1/reports/sales."""
+
+    @pytest.mark.asyncio
+    async def test_sales_report(self, client, customers):
+        """Should aggregate rollups per period and exclude cancelled orders."""
+        for quantity in (1, 2):
+            response = await client.post("/api/v1/orders", json={
+                "user_id": 1,
+                "items": [{"product_id": 2, "quantity": quantity}],
+            })
+            assert response.status_code == 201
+        await client.post(f"/api/v1/orders/{response.json()['id']}/cancel")
+
+        today = datetime.now(UTC).date()
+        response = await client.get("/api/v1/reports/sales", params={
+            "from": (today - timedelta(days=365)).isoformat(),
+            "to": today.isoformat(),
+            "granularity": "month",
+        })
+
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data["periods"]) == 1
+        period = data["periods"][0]
+        assert period["period_start"] == today.replace(day=1).isoformat()
+        assert period["order_count"] == 1
+        assert Decimal(period["revenue"]) == Decimal("49.99")
+        assert data["top_products"][0]["units"] == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_range_returns_400(self, client):
+        """Should return 400 when 'from' is after 'to'."""
+        response = await client.get("/api/v1/reports/sales", params={
+            "from": "2025-02-01",
+            "to": "2025-01-01",
+        })
+
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_rebuild_matches_incremental(self, client, multiple_orders):
+        """Rebuild should backfill rollups from existing orders."""
+        response = await client.post("/api/v1/reports/sales/rebuild")
+
+        assert response.status_code == 200
+        assert response.json()["status_rows"] == 2
+
+        today = datetime.now(UTC).date().isoformat()
+        response = await client.get("/api/v1/reports/sales", params={"from": today, "to": today})
+        period = response.json()["periods"][0]
+        assert period["order_count"] == 5
+        assert Decimal(period["revenue"]) == Decimal("1000.00")
@@ -0,0 +1,27 @@
+"""
+Unit Tests for Server Worker Sizing
+"""
+
+from app.serve import worker_count
+
+
+class TestWorkerCount:
+    """Tests for CPU and backend aware worker sizing."""
+
+    def test_explicit_concurrency_wins(self):
+        """WEB_CONCURRENCY should override autotuning."""
+        assert worker_count(8, "sqlite+aiosqlite:///./orders.db", requested=3) == 3
+
+    def test_sqlite_memory_uses_one_worker(self):
+        """In-memory SQLite cannot be shared between processes."""
+        assert worker_count(8, "sqlite+aiosqlite:///:memory:", requested=None) == 1
+
+    def test_sqlite_file_uses_one_worker_per_cpu(self):
+        """File SQLite should not oversubscribe the single writer."""
+        assert worker_count(4, "sqlite+aiosqlite:///./orders.db", requested=None) == 4
+
+    def test_server_database_and_cap(self):
+        """Server databases use 2 x CPUs + 1, capped by max_workers."""
+        url = "postgresql+asyncpg://db/orders"
+        assert worker_count(2, url, requested=None) == 5
+        assert worker_count(32, url, requested=None, max_workers=16) == 16
@@ -0,0 +1,225 @@
+"""
+Tests for Checkout Stock Holds
+"""
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import func, select, update
+
+from app.models import Order, ProductStockShard, StockHold
+from app.repositories.hold_repository import StockHoldRepository
+from app.services.hold_service import HoldExpiryQueue, HoldService
+
+
+@pytest_asyncio.fixture
+async def product_id(client) -> int:
+    """A product with 10 units."""
+    response = await client.post("/api/v1/products", json={
+        "name": "Console", "price": "499.00", "stock": 10,
+    })
+    return response.json()["id"]
+
+
+@pytest_asyncio.fixture
+async def service(test_session) -> HoldService:
+    return HoldService(StockHoldRepository(test_session), queue=HoldExpiryQueue())
+
+
+async def hold(client, product_id: int, quantity: int, **extra):
+    return await client.post("/api/v1/inventory/holds", json={
+        "product_id": product_id, "quantity": quantity, **extra,
+    })
+
+
+async def stock(client, product_id: int) -> int:
+    response = await client.get(f"/api/v1/inventory/{product_id}/history")
+    return sum(m["delta"] for m in response.json()["items"])
+
+
+async def order(client, product_id: int, hold_ids: list[int], quantity: int = 1):
+    return await client.post("/api/v1/orders", json={
+        "user_id": 1,
+        "items": [{"product_id": product_id, "quantity": quantity}],
+        "hold_ids": hold_ids,
+    })
+
+
+def later(seconds: int = 3600) -> datetime:
+    return datetime.now(UTC) + timedelta(seconds=seconds)
+
+
+class TestStockHolds:
+    """Tests for POST/DELETE /api/v1/inventory/holds."""
+
+    @pytest.mark.asyncio
+    async def test_hold_takes_stock(self, client, product_id):
+        """A hold should take its units out of stock until it ends."""
+        response = await hold(client, product_id, 4, ttl_seconds=60)
+
+        assert response.status_code == 201
+        assert response.json()["status"] == "active"
+        assert await stock(client, product_id) == 6
+
+    @pytest.mark.asyncio
+    async def test_cannot_hold_more_than_stock(self, client, product_id):
+        """Holding more than is available should 409 without creating a hold."""
+        await hold(client, product_id, 8)
+
+        response = await hold(client, product_id, 3)
+
+        assert response.status_code == 409
+        assert await stock(client, product_id) == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_product_returns_404(self, client):
+        """Should return 404 for a missing product."""
+        response = await hold(client, 99999, 1)
+
+        assert response.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_release_returns_stock_once(self, client, product_id):
+        """Releasing should give the stock back; a second release should 404."""
+        hold_id = (await hold(client, product_id, 4)).json()["id"]
+
+        first = await client.delete(f"/api/v1/inventory/holds/{hold_id}")
+        second = await client.delete(f"/api/v1/inventory/holds/{hold_id}")
+
+        assert first.json()["status"] == "released"
+        assert second.status_code == 404
+        assert await stock(client, product_id) == 10
+
+
+class TestHoldConsumption:
+    """Tests for consuming holds in POST /api/v1/orders."""
+
+    @pytest.mark.asyncio
+    async def test_order_consumes_hold(self, client, customers, product_id):
+        """An order should consume its hold, keeping the stock out."""
+        hold_id = (await hold(client, product_id, 1)).json()["id"]
+
+        response = await order(client, product_id, [hold_id])
+        reused = await order(client, product_id, [hold_id])
+
+        assert response.status_code == 201
+        assert reused.status_code == 409
+        assert await stock(client, product_id) == 9
+
+    @pytest.mark.asyncio
+    async def test_rejected_hold_rolls_back_order(
+        self, client, test_session, customers, product_id
+    ):
+        """A hold for another product should reject the whole order."""
+        other = await client.post("/api/v1/products", json={
+            "name": "Controller", "price": "59.00", "stock": 5,
+        })
+        other_hold = (await hold(client, other.json()["id"], 1)).json()["id"]
+
+        response = await order(client, product_id, [other_hold])
+
+        assert response.status_code == 409
+        assert str(other_hold) in response.json()["detail"]
+        assert await test_session.scalar(select(func.count(Order.id))) == 0
+        released = await client.delete(f"/api/v1/inventory/holds/{other_hold}")
+        assert released.status_code == 200
+
+    @pytest.mark.asyncio
+    async def test_order_larger_than_hold_is_rejected(
+        self, client, test_session, customers, product_id
+    ):
+        """A hold should not cover more units than were held."""
+        hold_id = (await hold(client, product_id, 1)).json()["id"]
+
+        response = await order(client, product_id, [hold_id], quantity=50)
+
+        assert response.status_code == 409
+        assert await test_session.scalar(select(func.count(Order.id))) == 0
+        assert await stock(client, product_id) == 9
+        released = await client.delete(f"/api/v1/inventory/holds/{hold_id}")
+        assert released.status_code == 200
+        assert await stock(client, product_id) == 10
+
+    @pytest.mark.asyncio
+    async def test_order_smaller_than_hold_is_rejected(self, client, customers, product_id):
+        """Held units the order does not use should not be consumed."""
+        hold_id = (await hold(client, product_id, 5)).json()["id"]
+
+        response = await order(client, product_id, [hold_id], quantity=1)
+
+        assert response.status_code == 409
+        assert "cover 5 units" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_holds_add_up_to_the_ordered_quantity(self, client, customers, product_id):
+        """Several holds for one product should together match its quantity."""
+        hold_ids = [(await hold(client, product_id, n)).json()["id"] for n in (2, 3)]
+
+        response = await order(client, product_id, hold_ids, quantity=5)
+
+        assert response.status_code == 201
+        assert await stock(client, product_id) == 5
+
+
+class TestHoldExpiry:
+    """Tests for the expiry sweep and its heap."""
+
+    @pytest.mark.asyncio
+    async def test_expire_due_in_batches(self, client, service, product_id):
+        """Due holds should expire oldest first in batches and return stock."""
+        for ttl in (60, 30, 90, 45, 120):
+            await service.create_hold(product_id, 1, ttl_seconds=ttl)
+        assert await stock(client, product_id) == 5
+
+        counts = [await service.expire_due(2, now=later(100)) for _ in range(3)]
+
+        assert counts == [2, 2, 0]
+        assert await stock(client, product_id) == 9
+        assert len(service.queue.pop_due(now=later(200).timestamp())) == 5
+
+    @pytest.mark.asyncio
+    async def test_expired_hold_cannot_be_consumed(self, client, customers, service, product_id):
+        """An order should not consume a hold past its expiry."""
+        expired = await service.create_hold(product_id, 1)
+        await service.repository.session.execute(
+            update(StockHold)
+            .where(StockHold.id == expired.id)
+            .values(expires_at=datetime.now(UTC) - timedelta(seconds=1))
+        )
+        await service.repository.commit()
+
+        response = await order(client, product_id, [expired.id])
+
+        assert response.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_sharded_stock_returns_to_shards(
+        self, client, test_session, service, product_id
+    ):
+        """Expiring a hold on a sharded product should refill its shards."""
+        await client.put(f"/api/v1/inventory/{product_id}/shards", json={"shards": 2})
+        await service.create_hold(product_id, 3)
+
+        assert await service.expire_due(now=later(10_000)) == 1
+        shards = await test_session.scalar(
+            select(func.sum(ProductStockShard.stock))
+            .where(ProductStockShard.product_id == product_id)
+        )
+        assert shards == 10
+
+    @pytest.mark.asyncio
+    async def test_wait_wakes_for_earlier_hold(self):
+        """Pushing an earlier expiry should shorten the sweeper's sleep."""
+        queue = HoldExpiryQueue()
+        started = time.monotonic()
+        waiter = asyncio.create_task(queue.wait(5))
+        await asyncio.sleep(0.01)
+
+        queue.push(datetime.now(UTC) + timedelta(milliseconds=50), 1)
+        await asyncio.wait_for(waiter, 1)
+
+        assert time.monotonic() - started < 1
+        assert queue.pop_due() == [1]
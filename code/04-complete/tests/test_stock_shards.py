@@ -0,0 +1,115 @@
+"""
+Tests for Sharded Stock Counters
+"""
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+
+from app.core.exceptions import InsufficientStockError
+from app.models import Product, ProductStockShard
+from app.repositories.product_repository import ProductRepository
+from app.services.product_service import ProductService
+
+
+@pytest_asyncio.fixture
+async def service(test_session) -> ProductService:
+    return ProductService(ProductRepository(test_session))
+
+
+@pytest_asyncio.fixture
+async def hot_product(client) -> int:
+    """A product with 10 units split over 4 shards (3, 3, 2, 2)."""
+    response = await client.post("/api/v1/products", json={
+        "name": "Flash Deal", "price": "1.00", "stock": 10,
+    })
+    product_id = response.json()["id"]
+    response = await client.put(f"/api/v1/inventory/{product_id}/shards", json={"shards": 4})
+    assert response.status_code == 200
+    assert response.json()["stock"] == 10
+    return product_id
+
+
+async def shard_stocks(session, product_id: int) -> list[int]:
+    result = await session.execute(
+        select(ProductStockShard.stock)
+        .where(ProductStockShard.product_id == product_id)
+        .order_by(ProductStockShard.shard)
+    )
+    return list(result.scalars().all())
+
+
+async def ledger_stock(client, product_id: int) -> int:
+    response = await client.get(f"/api/v1/inventory/{product_id}/history")
+    return sum(m["delta"] for m in response.json()["items"])
+
+
+class TestStockShards:
+    """Tests for decrements against sharded and single-row stock."""
+
+    @pytest.mark.asyncio
+    async def test_sharding_splits_stock_evenly(self, test_session, hot_product):
+        """Shards should start from the current stock, split evenly."""
+        assert await shard_stocks(test_session, hot_product) == [3, 3, 2, 2]
+
+    @pytest.mark.asyncio
+    async def test_take_decrements_one_shard(self, client, test_session, service, hot_product):
+        """A small take should come from a single shard and be in the ledger."""
+        await service.take_stock(hot_product, 2)
+
+        stocks = await shard_stocks(test_session, hot_product)
+        assert sum(stocks) == 8
+        assert sorted(stocks) in ([0, 2, 3, 3], [1, 2, 2, 3])
+        product = await test_session.get(Product, hot_product, populate_existing=True)
+        assert product.stock == 8
+        assert await ledger_stock(client, hot_product) == 8
+
+    @pytest.mark.asyncio
+    async def test_take_gathers_across_shards(self, test_session, service, hot_product):
+        """A take larger than any shard should be gathered from several."""
+        await service.take_stock(hot_product, 9)
+
+        assert sum(await shard_stocks(test_session, hot_product)) == 1
+
+    @pytest.mark.asyncio
+    async def test_shortage_raises_and_changes_nothing(
+        self, client, test_session, service, hot_product
+    ):
+        """Taking more than the total should raise and leave every shard alone."""
+        with pytest.raises(InsufficientStockError):
+            await service.take_stock(hot_product, 11)
+
+        assert await shard_stocks(test_session, hot_product) == [3, 3, 2, 2]
+        assert await ledger_stock(client, hot_product) == 10
+
+    @pytest.mark.asyncio
+    async def test_single_row_take_is_conditional(self, client, service):
+        """Unsharded products should decrement through a conditional ledger append."""
+        response = await client.post("/api/v1/products", json={
+            "name": "Regular", "price": "1.00", "stock": 3,
+        })
+        product_id = response.json()["id"]
+
+        await service.take_stock(product_id, 3)
+        with pytest.raises(InsufficientStockError):
+            await service.take_stock(product_id, 1)
+
+        assert await ledger_stock(client, product_id) == 0
+
+    @pytest.mark.asyncio
+    async def test_writes_keep_shards_and_ledger_in_step(
+        self, client, test_session, hot_product
+    ):
+        """Restock and set should update the shards, and unsharding keeps stock."""
+        await client.post("/api/v1/inventory/restock", json={
+            "items": [{"product_id": hot_product, "quantity": 6}],
+        })
+        assert sum(await shard_stocks(test_session, hot_product)) == 16
+
+        await client.put(f"/api/v1/inventory/{hot_product}", json={"stock": 7})
+        assert await shard_stocks(test_session, hot_product) == [2, 2, 2, 1]
+        assert await ledger_stock(client, hot_product) == 7
+
+        response = await client.put(f"/api/v1/inventory/{hot_product}/shards", json={"shards": 0})
+        assert response.json()["stock"] == 7
+        assert await shard_stocks(test_session, hot_product) == []
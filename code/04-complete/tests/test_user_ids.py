@@ -0,0 +1,94 @@
+"""
+Tests for User Existence Checks and the User ID Set
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.core.user_ids import UserIdSet, known_users
+from app.repositories.order_repository import OrderRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas import OrderCreate, OrderItemCreate, UserCreate
+from app.services.order_service import OrderService
+from app.services.user_service import UserService
+
+
+def count_statements(session) -> list[str]:
+    """Record every SQL statement the session's engine runs."""
+    statements: list[str] = []
+    event.listen(
+        session.bind.sync_engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    return statements
+
+
+class TestUserExistence:
+    """Tests for UserRepository.has_user / has_users."""
+
+    @pytest.mark.asyncio
+    async def test_has_user_is_one_exists_query(self, test_session, customers, sample_order):
+        """has_user should not load the user or its orders."""
+        repository = UserRepository(test_session)
+        statements = count_statements(test_session)
+
+        assert await repository.has_user(1)
+        assert not await repository.has_user(99)
+
+        assert len(statements) == 2
+        assert all("EXISTS" in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_has_users(self, test_session, customers):
+        """has_users should return the ids that exist."""
+        repository = UserRepository(test_session)
+
+        assert await repository.has_users([2, 1, 5]) == {1, 2}
+        assert await repository.has_users([]) == set()
+
+
+class TestUserIdSet:
+    """Tests for the in-process user id bitmap."""
+
+    def test_membership(self):
+        """Added ids should be members; others, zero and negatives should not."""
+        ids = UserIdSet()
+        for user_id in (1, 8, 9, 1000):
+            ids.add(user_id)
+
+        assert [i for i in range(-1, 1002) if i in ids] == [1, 8, 9, 1000]
+
+    @pytest.mark.asyncio
+    async def test_order_confirms_known_user_without_query(self, test_session):
+        """Users created here should be confirmed from the set; unknown ids queried."""
+        user = await UserService(UserRepository(test_session)).create_user(
+            UserCreate(email="cy@example.com", name="Cy")
+        )
+        service = OrderService(OrderRepository(test_session))
+        statements = count_statements(test_session)
+
+        await service.create_order(OrderCreate(
+            user_id=user.id, items=[OrderItemCreate(product_id=1, quantity=1)]
+        ))
+
+        assert user.id in known_users
+        assert not any("FROM users" in statement for statement in statements)
+
+    @pytest.mark.asyncio
+    async def test_users_from_other_workers_are_confirmed(self, test_session, customers):
+        """An id missing from the set should be checked once, then remembered."""
+        repository = UserRepository(test_session)
+
+        assert await known_users.existing(repository, [1, 3]) == {1}
+        assert 1 in known_users and 3 not in known_users
+
+    @pytest.mark.asyncio
+    async def test_unknown_user_is_rejected(self, client):
+        """Orders for a user that does not exist should be rejected."""
+        response = await client.post("/api/v1/orders", json={
+            "user_id": 42,
+            "items": [{"product_id": 1, "quantity": 1}],
+        })
+
+        assert response.status_code == 400
+        assert "42" in response.json()["detail"]